@@ -1,16 +1,32 @@
-from flask import Flask, jsonify
+from flask import Blueprint, Flask, jsonify, request, g
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import argparse
+import copy
 import json
 import ccxt
 import logging
+import math
+import threading
+import time
+import dca_live_state
+import dca_timeseries
+import dca_trades
+import dca_profiling
+import dca_sim_exchange
+import dca_cassette
+import dca_projection
+import os
 
-app = Flask(__name__)
+# Τα endpoints καταχωρούνται στο blueprint και η εφαρμογή δημιουργείται από το create_app()
+dashboard = Blueprint("dashboard", __name__)
 
 
 
-# Config files
-ORDERS_FILE = "/opt/python/dca-bot-bitcoin/orders.json"
-CONFIG_FILE = "/opt/python/dca-bot-bitcoin/config.json"
+# Config files (το DCA_DATA_DIR επιτρέπει απομονωμένα runs, π.χ. replay)
+DATA_DIR = os.environ.get("DCA_DATA_DIR", "/opt/python/dca-bot-bitcoin")
+ORDERS_FILE = os.path.join(DATA_DIR, "orders.json")
+CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
 
 
 def load_pair_and_exchange():
@@ -44,27 +60,175 @@ def load_pair_and_exchange():
 PAIR, EXCHANGE_NAME = load_pair_and_exchange()
 
 
+def load_config_section(section):
+    """Load an optional section of the JSON configuration file (empty dict if it is missing)."""
+    with open(CONFIG_FILE, "r") as file:
+        return json.load(file).get(section) or {}
+
+
+# Profiling των requests (PROFILING section, DCA_PROFILE_REQUESTS ή SIGUSR1)
+dca_profiling.configure_from(load_config_section("PROFILING"), "DCA_PROFILE_REQUESTS")
+
+# Ρυθμίσεις του server (DASHBOARD section)
+DASHBOARD = {
+    "HOST": "0.0.0.0",
+    "PORT": 5014,
+    "WORKERS": 2,             # Διεργασίες (gunicorn)
+    "THREADS": 8,             # Threads ανά διεργασία
+    "TIMEOUT": 30,            # Δευτερόλεπτα μέχρι να αντικατασταθεί ένας κολλημένος worker
+    "EXCHANGE_TIMEOUT": 5,    # Δευτερόλεπτα αναμονής για το exchange πριν απαντηθεί 504
+    "TICKER_TTL": 1.0,        # Δευτερόλεπτα που η τιμή του ticker μοιράζεται μεταξύ requests
+    "POOL_SIZE": 10,          # Μέγιστες HTTP συνδέσεις του exchange client ανά worker
+    "MAX_PROJECTION_PATHS": 20000,  # Όρια ενός /DCA/projection request, ώστε να μην καταλαμβάνει όλο το process pool
+    "MAX_PROJECTION_DAYS": 90,
+    "LIVE_PRICE_MAX_AGE": 5,  # Δευτερόλεπτα που η τιμή του snapshot του bot προτιμάται από το exchange
+}
+DASHBOARD.update(load_config_section("DASHBOARD"))
+
+# Παράμετροι του ladder και της προβολής κεφαλαίου (TRADE_CONFIG και PROJECTION sections)
+TRADE_CONFIG = load_config_section("TRADE_CONFIG")
+PROJECTION = dict(dca_projection.DEFAULTS)
+PROJECTION.update(load_config_section("PROJECTION"))
+
+
+
+class ExchangeTimeout(Exception):
+    """The exchange did not answer within DASHBOARD.EXCHANGE_TIMEOUT."""
+
+
+# Κοινοί πόροι ανά worker: δημιουργούνται στο πρώτο request (και ξανά μετά από fork)
+_resources = {"pid": None, "exchange": None, "executor": None}
+_resources_lock = threading.Lock()
+
+# Τελευταία τιμή του ticker και το fetch που είναι σε εξέλιξη
+_ticker = {"price": None, "fetched_at": 0.0, "future": None}
+_ticker_lock = threading.Lock()
+
 
 def initialize_exchange():
-    with open("/opt/python/dca-bot-bitcoin/config.json", "r") as f:
+    # Μέσα από την κασέτα του DCA_RECORD / DCA_REPLAY, αν υπάρχει
+    return dca_cassette.attach(EXCHANGE_NAME, connect_exchange)
+
+
+def connect_exchange():
+    with open(CONFIG_FILE, "r") as f:
         keys = json.load(f)
-    return getattr(ccxt, EXCHANGE_NAME)({
+    if EXCHANGE_NAME == "sim":
+        # Τοπικός simulator (ίδιες ρυθμίσεις με το bot, αλλά ανεξάρτητη κατάσταση)
+        return dca_sim_exchange.SimExchange({"ID": EXCHANGE_NAME, "SYMBOL": PAIR, **(keys.get("SIMULATOR") or {})})
+    exchange = getattr(ccxt, EXCHANGE_NAME)({
         "apiKey": keys["API_KEY"],
         "secret": keys["API_SECRET"],
-        "enableRateLimit": True
+        "enableRateLimit": True,
+        "timeout": int(DASHBOARD["EXCHANGE_TIMEOUT"] * 1000),
     })
 
-exchange = initialize_exchange()
+    # Keep-alive connection pool για όλα τα threads του worker
+    session = getattr(exchange, "session", None)
+    if session is not None:
+        from requests.adapters import HTTPAdapter
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=DASHBOARD["POOL_SIZE"])
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+    return exchange
+
+
+def get_resources():
+    """Ο exchange client και ο executor του worker, δημιουργούνται lazily και μία φορά ανά διεργασία."""
+    with _resources_lock:
+        if _resources["pid"] != os.getpid():
+            _resources["exchange"] = initialize_exchange()
+            _resources["executor"] = ThreadPoolExecutor(max_workers=DASHBOARD["POOL_SIZE"], thread_name_prefix="dca-exchange")
+            _resources["pid"] = os.getpid()
+            with _ticker_lock:
+                _ticker.update(price=None, fetched_at=0.0, future=None)
+            dca_projection.warm_pool(PROJECTION["WORKERS"])
+        return _resources
+
+
+def _fetch_ticker_price():
+    price = float(get_resources()["exchange"].fetch_ticker(PAIR)['last'])
+    with _ticker_lock:
+        _ticker.update(price=price, fetched_at=time.time())
+    return price
+
+
+def fetch_current_price():
+    """
+    Τρέχουσα τιμή του PAIR. Μέσα στο TICKER_TTL τα requests μοιράζονται την τελευταία τιμή και ταυτόχρονα requests
+    περιμένουν το ίδιο fetch, ώστε ένα αργό fetch_ticker να μην πολλαπλασιάζεται.
+    :raises ExchangeTimeout: Αν το exchange δεν απαντήσει μέσα στο EXCHANGE_TIMEOUT
+    """
+    executor = get_resources()["executor"]
+    with _ticker_lock:
+        if _ticker["price"] is not None and time.time() - _ticker["fetched_at"] < DASHBOARD["TICKER_TTL"]:
+            return _ticker["price"]
+        future = _ticker["future"]
+        if future is None or future.done():
+            future = _ticker["future"] = executor.submit(_fetch_ticker_price)
+
+    return wait_for_exchange(future, f"the {PAIR} ticker")
+
+
+def fetch_free_balances():
+    """
+    Ελεύθερα υπόλοιπα του PAIR.
+    :return: Tuple (base, quote)
+    :raises ExchangeTimeout: Αν το exchange δεν απαντήσει μέσα στο EXCHANGE_TIMEOUT
+    """
+    resources = get_resources()
+    balance = wait_for_exchange(resources["executor"].submit(resources["exchange"].fetch_balance), "the balance")
+    base_currency, quote_currency = PAIR.split('/')
+    return float(balance[base_currency]['free']), float(balance[quote_currency]['free'])
+
+
+def wait_for_exchange(future, what):
+    try:
+        return future.result(timeout=DASHBOARD["EXCHANGE_TIMEOUT"])
+    except FutureTimeout:
+        raise ExchangeTimeout(f"{EXCHANGE_NAME} did not return {what} within {DASHBOARD['EXCHANGE_TIMEOUT']}s.")
+
+
+# Cache του orders.json: ξαναδιαβάζεται μόνο όταν αλλάξει το αρχείο
+_orders_cache = {"mtime": None, "orders": {}}
+_orders_lock = threading.Lock()
+
 
 def load_orders():
     try:
-        with open(ORDERS_FILE, 'r') as f:
-            return json.load(f)
+        mtime = os.path.getmtime(ORDERS_FILE)
     except FileNotFoundError:
         return {}
-
-
-def calculate_metrics(order, current_price):
+    with _orders_lock:
+        if _orders_cache["mtime"] != mtime:
+            with open(ORDERS_FILE, 'r') as f:
+                _orders_cache["orders"] = json.load(f)
+            _orders_cache["mtime"] = mtime
+        return copy.deepcopy(_orders_cache["orders"])  # Οι handlers μπορούν να αλλάξουν το αντίγραφο
+
+
+def live_snapshot():
+    """
+    Τιμή και sell thresholds από το snapshot που δημοσιεύει το bot, ώστε να μην υπολογίζονται ξανά εδώ.
+    :return: Tuple (τιμή ή None αν το snapshot είναι παλαιότερο από LIVE_PRICE_MAX_AGE, dict τιμή θέσης -> sell threshold)
+    """
+    state = dca_live_state.read_live_state()
+    if state is None:
+        return None, {}
+    thresholds = {buy_price: sell_threshold for buy_price, _, sell_threshold in state["lots"]}
+    fresh = time.time() - state["updated_at"] <= DASHBOARD["LIVE_PRICE_MAX_AGE"]
+    return (state["current_price"] if fresh else None), thresholds
+
+
+def current_price_and_thresholds():
+    """Τιμή από το snapshot του bot (ή από το exchange αν δεν είναι πρόσφατο) και τα sell thresholds του."""
+    current_price, thresholds = live_snapshot()
+    if current_price is None:
+        current_price = fetch_current_price()
+    return current_price, thresholds
+
+
+def calculate_metrics(order, current_price, sell_threshold=None):
     if 'price' not in order:
         raise KeyError("'price' key is missing from the order.")
     if not order.get('datetime'):
@@ -89,7 +253,9 @@ def calculate_metrics(order, current_price):
     else:
         days_open = -1  # Ενδείκτης ότι κάτι πήγε στραβά
 
-    sell_threshold = float(order['price']) * (1 + 2 / 100)  # PERCENTAGE_RISE = 2%
+    # Το threshold του bot (live snapshot) ή, για θέσεις που δεν έχει δημοσιεύσει ακόμα, το PERCENTAGE_RISE του config
+    if sell_threshold is None:
+        sell_threshold = float(order['price']) * (1 + float(TRADE_CONFIG["PERCENTAGE_RISE"]) / 100)
     distance_to_sell = sell_threshold - current_price
 
     return {
@@ -110,15 +276,36 @@ def format_order_id(order_id):
 
 
 
+def start_request_profile():
+    g.profile_session = dca_profiling.start()
+
+
+def stop_request_profile(exc):
+    dca_profiling.stop(g.pop('profile_session', None), f"request{request.path}")
+
+
+def exchange_timeout(error):
+    logging.warning(f"{request.path}: {error}")
+    return jsonify({"error": str(error)}), 504
+
+
+def exchange_error(error):
+    logging.error(f"{request.path}: exchange error: {error}")
+    return jsonify({"error": f"Exchange error: {error}"}), 502
+
+
+
+
+
 # Favicon Endpoint
-@app.route('/favicon.ico')
+@dashboard.route('/favicon.ico')
 def favicon():
     return "", 204
 
-@app.route('/DCA/current_price', methods=['GET'])
+@dashboard.route('/DCA/current_price', methods=['GET'])
 def current_price():
     # Λήψη της τρέχουσας τιμής
-    current_price = float(exchange.fetch_ticker(PAIR)['last'])
+    current_price = fetch_current_price()
     
     # Φόρτωση του META από το αρχείο JSON
     orders_data = load_orders()
@@ -140,13 +327,13 @@ def current_price():
 
 
 
-@app.route('/DCA/existing_orders', methods=['GET'])
+@dashboard.route('/DCA/existing_orders', methods=['GET'])
 def existing_orders():
     # Φόρτωση μόνο των ORDERS από το αρχείο
     orders_data = load_orders()
     orders = orders_data.get("ORDERS", {})  # Παίρνουμε μόνο το αντικείμενο ORDERS
 
-    current_price = float(exchange.fetch_ticker(PAIR)['last'])
+    current_price, thresholds = current_price_and_thresholds()
     order_details = []
 
     for price, order in orders.items():
@@ -155,7 +342,7 @@ def existing_orders():
             logging.error(f"Order missing required keys: {order}")
             continue  # Αγνόηση παραγγελίας χωρίς τα απαραίτητα κλειδιά
 
-        metrics = calculate_metrics(order, current_price)
+        metrics = calculate_metrics(order, current_price, thresholds.get(float(price)))
 
         # Μετατροπή της ημερομηνίας
         try:
@@ -167,6 +354,7 @@ def existing_orders():
 
         order_details.append({
             "order_id": format_order_id(order['id']),
+            "venue": order.get('venue', EXCHANGE_NAME),
             "amount": order['amount'],
             "bought_at": order['price'],
             "sell_at": metrics['sell_threshold'],
@@ -184,17 +372,17 @@ def existing_orders():
 
 
 
-@app.route('/DCA/sell_threshold_eval', methods=['GET'])
+@dashboard.route('/DCA/sell_threshold_eval', methods=['GET'])
 def sell_threshold_eval():
     # Φόρτωση μόνο των ORDERS από το αρχείο
     orders_data = load_orders()
     orders = orders_data.get("ORDERS", {})  # Παίρνουμε μόνο το αντικείμενο ORDERS
 
-    current_price = float(exchange.fetch_ticker(PAIR)['last'])
+    current_price, thresholds = current_price_and_thresholds()
     evaluations = []
 
     for price, order in orders.items():
-        metrics = calculate_metrics(order, current_price)
+        metrics = calculate_metrics(order, current_price, thresholds.get(float(price)))
         status = "Selling" if current_price >= metrics['sell_threshold'] else "Not selling"
         evaluations.append({
             "order_id": format_order_id(order['id']),
@@ -205,11 +393,239 @@ def sell_threshold_eval():
 
     return jsonify(evaluations)
 
+
+
+
+def query_arg(name, cast, default=None):
+    """
+    Παράμετρος του query string με μετατροπή τύπου. Σε αντίθεση με το request.args.get(type=...), μια μη έγκυρη
+    τιμή δεν αντικαθίσταται σιωπηλά από το default.
+    :raises ValueError: Αν η τιμή δεν μετατρέπεται στον τύπο `cast` (ή είναι nan/inf για float)
+    """
+    value = request.args.get(name)
+    if value is None or value == "":
+        return default
+    try:
+        result = cast(value)
+    except ValueError:
+        raise ValueError(f"Invalid value '{value}' for '{name}': expected {cast.__name__}.") from None
+    if isinstance(result, float) and not math.isfinite(result):
+        raise ValueError(f"Invalid value '{value}' for '{name}': expected a finite number.")
+    return result
+
+
+
+
+@dashboard.route('/DCA/timeseries', methods=['GET'])
+def timeseries():
+    # Παράμετροι: start/end σε epoch ms, points (πλήθος σημείων), method ("lttb" ή "minmax")
+    try:
+        start = query_arg('start', int)
+        end = query_arg('end', int)
+        points = min(max(query_arg('points', int, default=500), 3), 10000)
+        method = request.args.get('method', default='lttb')
+        if method not in ('lttb', 'minmax'):
+            raise ValueError(f"Unknown downsampling method '{method}'. Use 'lttb' or 'minmax'.")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    records = dca_timeseries.select_range(dca_timeseries.load_records(), start, end)
+    sampled = dca_timeseries.downsample(records, points, method=method)
+
+    return jsonify({
+        "pair": PAIR,
+        "total": len(records),
+        "points": len(sampled),
+        "method": method,
+        "data": {field: sampled[field].tolist() for field in dca_timeseries.FIELDS},
+    })
+
+
+
+
+# Cache των rollups: ξαναδιαβάζονται μόνο όταν αλλάξει το αρχείο
+_trade_stats_cache = {"mtime": None, "stats": None}
+
+
+def load_trade_stats():
+    try:
+        mtime = os.path.getmtime(dca_trades.TRADE_STATS_FILE)
+    except FileNotFoundError:
+        return dca_trades.empty_stats()
+    if _trade_stats_cache["mtime"] != mtime:
+        _trade_stats_cache["stats"] = dca_trades.load_stats()
+        _trade_stats_cache["mtime"] = mtime
+    return _trade_stats_cache["stats"]
+
+
+
+
+@dashboard.route('/DCA/analytics/summary', methods=['GET'])
+def analytics_summary():
+    return jsonify(dca_trades.summarize(load_trade_stats()))
+
+
+
+
+@dashboard.route('/DCA/projection', methods=['GET'])
+def projection():
+    # Προβολή του ladder μέχρι το MAX_ORDERS και Monte Carlo για την εξάντληση του κεφαλαίου
+    try:
+        paths = min(max(query_arg('paths', int, default=PROJECTION["PATHS"]), 100), DASHBOARD["MAX_PROJECTION_PATHS"])
+        horizon_days = min(max(query_arg('horizon_days', float, default=PROJECTION["HORIZON_DAYS"]), 0.1),
+                           DASHBOARD["MAX_PROJECTION_DAYS"])
+        volatility = query_arg('volatility', float, default=PROJECTION["VOLATILITY"])
+        if volatility is not None and volatility <= 0:
+            raise ValueError(f"Invalid value '{volatility}' for 'volatility': expected a positive number.")
+        drift = query_arg('drift', float, default=PROJECTION["DRIFT"])
+        seed = query_arg('seed', int, default=PROJECTION["SEED"])
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    current_price = fetch_current_price()
+    free_base, free_quote = fetch_free_balances()
+    ladder = dca_projection.project_ladder(
+        load_orders().get("ORDERS", {}), current_price, free_quote, free_base,
+        float(TRADE_CONFIG["PERCENTAGE_DROP"]), float(TRADE_CONFIG["PERCENTAGE_RISE"]),
+        float(TRADE_CONFIG["TRADE_AMOUNT"]), int(TRADE_CONFIG["MAX_ORDERS"]),
+        fee=PROJECTION["FEE"], fee_buffer=PROJECTION["FEE_BUFFER"],
+        rebalance=dca_projection.rebalance_enabled(PROJECTION, TRADE_CONFIG),
+    )
+    if volatility is None:
+        volatility = dca_projection.recent_volatility() or PROJECTION["DEFAULT_VOLATILITY"]
+    simulation = dca_projection.monte_carlo(
+        ladder, current_price, horizon_days, PROJECTION["STEP_MINUTES"], paths, volatility, drift,
+        PROJECTION["WORKERS"], seed,
+    )
+
+    return jsonify({"pair": PAIR, "current_price": current_price, "ladder": ladder, "monte_carlo": simulation})
+
+
+
+
+@dashboard.route('/DCA/analytics/profit/<period>', methods=['GET'])
+def analytics_profit(period):
+    # Κέρδος ανά ημέρα/εβδομάδα/μήνα (τα πιο πρόσφατα `limit` διαστήματα)
+    if period not in dca_trades.PERIODS:
+        return jsonify({"error": f"Unknown period '{period}'. Use one of: {', '.join(dca_trades.PERIODS)}."}), 400
+    try:
+        limit = min(max(query_arg('limit', int, default=30), 1), 1000)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    buckets = load_trade_stats()[dca_trades.PERIODS[period]]
+    keys = sorted(buckets)[-limit:]
+
+    return jsonify([{
+        "period": key,
+        "profit": round(buckets[key]["PROFIT"], 4),
+        "trades": buckets[key]["COUNT"],
+    } for key in keys])
+
+
+
+
+@dashboard.route('/DCA/live_state', methods=['GET'])
+def live_state():
+    # Ανάγνωση του snapshot που δημοσιεύει το bot (χωρίς κλήση στο exchange και χωρίς JSON parsing)
+    state = dca_live_state.read_live_state()
+    if state is None:
+        return jsonify({"error": "The bot has not published any live state yet."}), 503
+
+    current_price = state["current_price"]
+    lots = [{
+        "bought_at": buy_price,
+        "amount": amount,
+        "sell_at": sell_threshold,
+        "distance": sell_threshold - current_price if current_price is not None else None,
+    } for buy_price, amount, sell_threshold in state["lots"]]
+
+    return jsonify({
+        "pair": PAIR,
+        "current_price": current_price,
+        "next_buy_price": state["next_buy_price"],
+        "lots": lots,
+        "iteration_seconds": round(state["iteration_seconds"], 3),
+        "health": state["health"],
+        "updated_at": datetime.utcfromtimestamp(state["updated_at"]).strftime("%d/%m/%Y %H:%M:%S"),
+        "age_seconds": round(time.time() - state["updated_at"], 1),
+    })
+
     
     
     
     
 
+def create_app():
+    """
+    Application factory. Οι πόροι που μοιράζονται τα requests (exchange client, executor, caches) δημιουργούνται
+    lazily στο πρώτο request κάθε worker, ώστε το import να μην ανοίγει συνδέσεις πριν από το fork.
+    """
+    app = Flask(__name__)
+    app.register_blueprint(dashboard)
+    app.before_request(start_request_profile)
+    app.teardown_request(stop_request_profile)
+    app.register_error_handler(ExchangeTimeout, exchange_timeout)
+    app.register_error_handler(ccxt.BaseError, exchange_error)
+    return app
+
+
+# WSGI entry point (π.χ. gunicorn "dca-app-excel:app")
+app = create_app()
+
+
+
+def serve(app, host, port, workers=1, threads=8, timeout=30):
+    """
+    Εκτέλεση του dashboard σε production server: gunicorn με `workers` διεργασίες των `threads` threads, ή (αν το
+    gunicorn δεν είναι εγκατεστημένο) ο threaded server του werkzeug σε μία διεργασία.
+    :param timeout: Δευτερόλεπτα μέχρι το gunicorn να αντικαταστήσει έναν worker που δεν απαντά
+    :return: True αν χρησιμοποιήθηκε το gunicorn
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+
+    if BaseApplication is None:
+        logging.warning("gunicorn is not installed: serving with the threaded werkzeug server in a single process.")
+        # SIGUSR1: profiling για τα επόμενα requests (στο gunicorn το USR1 ανοίγει ξανά τα log αρχεία)
+        dca_profiling.install_signal_handler()
+        from werkzeug.serving import run_simple
+        run_simple(host, port, app, threaded=True)
+        return False
+
+    class DashboardServer(BaseApplication):
+        def load_config(self):
+            self.cfg.set("bind", f"{host}:{port}")
+            self.cfg.set("workers", workers)
+            self.cfg.set("threads", threads)
+            self.cfg.set("worker_class", "gthread")
+            self.cfg.set("timeout", timeout)
+
+        def load(self):
+            return app
+
+    DashboardServer().run()
+    return True
+
+
+
+
+
 if __name__ == "__main__":
-    # Προσθήκη HTTPS εάν χρειάζεται
-    app.run(debug=True, host='0.0.0.0', port=5014, ssl_context=None)  # Προσθέστε SSL αν χρειάζεται
+    parser = argparse.ArgumentParser(description="DCA dashboard")
+    parser.add_argument("--host", default=DASHBOARD["HOST"])
+    parser.add_argument("--port", type=int, default=DASHBOARD["PORT"])
+    parser.add_argument("--workers", type=int, default=DASHBOARD["WORKERS"], help="Worker processes (gunicorn).")
+    parser.add_argument("--threads", type=int, default=DASHBOARD["THREADS"], help="Threads per worker.")
+    parser.add_argument("--timeout", type=int, default=DASHBOARD["TIMEOUT"], help="Seconds before a stuck worker is replaced.")
+    parser.add_argument("--dev", action="store_true", help="Flask development server with the debugger and auto-reload.")
+    args = parser.parse_args()
+
+    if args.dev:
+        dca_profiling.install_signal_handler()
+        # Προσθήκη HTTPS εάν χρειάζεται
+        app.run(debug=True, host=args.host, port=args.port, ssl_context=None)  # Προσθέστε SSL αν χρειάζεται
+    else:
+        serve(app, args.host, args.port, args.workers, args.threads, args.timeout)
@@ -1,25 +1,46 @@
+import argparse
 import ccxt
 import pandas as pd
 import time
 import logging
+import copy
 import json
+import os
 from datetime import datetime, timedelta
 import pushover
-
+import dca_live_state
+import dca_timeseries
+import dca_trades
+import dca_profiling
+import dca_support
+import dca_venues
+import dca_sim_exchange
+import dca_ringbuffer
+import dca_recovery
+import dca_cassette
+import multiprocessing
+import signal
+from concurrent.futures import ThreadPoolExecutor
+
+
+# Φάκελος δεδομένων (το DCA_DATA_DIR επιτρέπει απομονωμένα runs, π.χ. replay)
+DATA_DIR = os.environ.get("DCA_DATA_DIR", "/opt/python/dca-bot-bitcoin")
 
 # Configure logging to both file and console
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(message)s",
     handlers=[
-        logging.FileHandler("/opt/python/dca-bot-bitcoin/dca_bot.log"),
+        logging.FileHandler(os.path.join(DATA_DIR, "dca_bot.log")),
         logging.StreamHandler(),
     ],
 )
 
 # Διαδρομές αρχείων 
-ORDERS_FILE = "/opt/python/dca-bot-bitcoin/orders.json"
-CONFIG_FILE = "/opt/python/dca-bot-bitcoin/config.json"
+ORDERS_FILE = os.path.join(DATA_DIR, "orders.json")
+CONFIG_FILE = os.path.join(DATA_DIR, "config.json")
+CANDLES_FILE = os.path.join(DATA_DIR, "candles.pkl")
+SUPPORT_FILE = os.path.join(DATA_DIR, "support_levels.json")
 
 # Παράμετροι Αποστολής E-mail
 ENABLE_EMAIL_NOTIFICATIONS = True
@@ -97,6 +118,73 @@ def load_keys():
 
 
 
+def load_config_section(section):
+    """Load an optional section of the JSON configuration file (empty dict if it is missing)."""
+    try:
+        with open(CONFIG_FILE, "r") as file:
+            return json.load(file).get(section) or {}
+    except FileNotFoundError:
+        raise FileNotFoundError(f"The specified JSON file '{CONFIG_FILE}' was not found.")
+    except json.JSONDecodeError:
+        raise ValueError(f"The JSON file '{CONFIG_FILE}' is not properly formatted.")
+
+
+# Rebalance πριν από κάθε αγορά (TRADE_CONFIG.CHECK_BALANCE, το διαβάζουν και το dashboard και το dca-projection.py)
+ENABLE_CHECK_BALANCE = bool(load_config_section("TRADE_CONFIG").get("CHECK_BALANCE", ENABLE_CHECK_BALANCE))
+
+# Τρόπος εκτέλεσης: "market" (poll & market order) ή "limit" (resting limit-order ladder)
+EXECUTION_MODE = str(load_config_section("TRADE_CONFIG").get("EXECUTION_MODE", "market")).lower()
+if EXECUTION_MODE not in ("market", "limit"):
+    raise ValueError(f"Invalid EXECUTION_MODE '{EXECUTION_MODE}' in the JSON file. Use 'market' or 'limit'.")
+
+# Multi-timeframe signal engine για την αρχική αγορά (SIGNALS section)
+SIGNALS = {
+    "ENABLED": False,
+    "BASE_TIMEFRAME": "1m",
+    "ENTRY_TIMEFRAME": "1h",
+    "CONFIRM_TIMEFRAMES": ["4h", "1d"],
+    "CONFIRM_RSI_MAX": 70,
+    "CONFIRM_TREND": False,
+    "HISTORY_DAYS": 30,
+}
+SIGNALS.update(load_config_section("SIGNALS"))
+
+# Επίπεδα υποστήριξης/αντίστασης (SUPPORT section)
+SUPPORT = {
+    "WINDOW": 5,
+    "PIVOT_WIDTH": 1,
+    "CLUSTER_PCT": 0.0,
+    "MIN_TOUCHES": 1,
+    "MAX_LEVELS": 200,
+    "ATR_PERIOD": 14,
+    "TOLERANCE_MODE": "absolute",
+    "TOLERANCE": 50,
+}
+SUPPORT.update(load_config_section("SUPPORT"))
+
+# Επιλογή venue για τα market orders ανάμεσα σε πολλά exchanges (VENUES section)
+VENUES = {
+    "ENABLED": False,
+    "EXCHANGES": {},
+    "LATENCY_BUDGET": 1.0,
+    "DEPTH": 20,
+}
+VENUES.update(load_config_section("VENUES"))
+
+# Ανάκαμψη μετά από crash: συμφωνία του ledger με τα fills του exchange (RECOVERY section)
+RECOVERY = {
+    "ENABLED": True,
+    "GRACE_SECONDS": 60,
+    "INTENT_TIMEOUT": 300,
+    "PAGE_SIZE": 500,
+}
+RECOVERY.update(load_config_section("RECOVERY"))
+
+# Profiling των iterations (PROFILING section, DCA_PROFILE_ITERATIONS ή SIGUSR1 σε daemon mode)
+dca_profiling.configure_from(load_config_section("PROFILING"), "DCA_PROFILE_ITERATIONS")
+
+
+
 
 # Notifications
 def send_push_notification(message, log_to_file=True):
@@ -123,9 +211,33 @@ def send_push_notification(message, log_to_file=True):
         if log_to_file:
             logging.error(f"Error sending push notification: {e}")
 
-# Initialize exchange
+# Background thread για persistence/ειδοποιήσεις (ενεργό μόνο στο split runtime)
+_io_executor = {"executor": None}
+
+# Τα simulated exchanges κρατούν την κατάστασή τους μεταξύ iterations
+_sim_exchanges = {}
+
+
+def create_sim_exchange(name, settings):
+    """Επιστρέφει (και κρατά στη μνήμη) τον τοπικό simulator για το όνομα `name`."""
+    if name not in _sim_exchanges:
+        _sim_exchanges[name] = dca_sim_exchange.SimExchange({"ID": name, "SYMBOL": PAIR, **settings})
+    return _sim_exchanges[name]
+
+
+# Initialize exchange (μέσα από την κασέτα του DCA_RECORD / DCA_REPLAY, αν υπάρχει)
 def initialize_exchange():
+    return dca_cassette.attach(EXCHANGE_NAME, connect_exchange)
+
+
+def connect_exchange():
     try:
+        # Τοπικός simulator αντί για πραγματικό exchange
+        if EXCHANGE_NAME == "sim":
+            exchange = create_sim_exchange(EXCHANGE_NAME, load_config_section("SIMULATOR"))
+            logging.info(f"Connected to local simulated exchange - Markets loaded: {len(exchange.markets)}")
+            return exchange
+
         # Φόρτωση των απαραίτητων API κλειδιών
         keys = load_keys()
         api_key, api_secret = keys[0], keys[1]
@@ -170,7 +282,11 @@ def load_or_initialize_orders():
                 orders_data["ORDERS"] = {}
             if "META" not in orders_data:
                 orders_data["META"] = {"PROFIT": 0.0, "SALES": 0}
-            
+            if "LADDER" not in orders_data:
+                orders_data["LADDER"] = {"BUY": None, "SELLS": {}}
+            if "RECOVERY" not in orders_data:
+                orders_data["RECOVERY"] = {"SINCE": {}}
+
             return orders_data
     except (FileNotFoundError, ValueError):
         logging.warning("Orders file not found or invalid. Initializing new data.")
@@ -179,13 +295,20 @@ def load_or_initialize_orders():
             "META": {
                 "PROFIT": 0.0,
                 "SALES": 0
+            },
+            "LADDER": {
+                "BUY": None,
+                "SELLS": {}
+            },
+            "RECOVERY": {
+                "SINCE": {}
             }
         }
 
 
 
 # Save orders
-def save_orders(orders, save_meta=True, save_orders=True):
+def save_orders(orders, save_meta=True, save_orders=True, save_ladder=False, save_recovery=False):
     try:
         # Φορτώνουμε το τρέχον περιεχόμενο του αρχείου
         try:
@@ -199,10 +322,13 @@ def save_orders(orders, save_meta=True, save_orders=True):
             existing_data["ORDERS"] = orders.get("ORDERS", {})
         if save_meta:
             existing_data["META"] = orders.get("META", {"PROFIT": 0.0, "SALES": 0})
+        if save_ladder:
+            existing_data["LADDER"] = orders.get("LADDER", {"BUY": None, "SELLS": {}})
+        if save_recovery:
+            existing_data["RECOVERY"] = orders.get("RECOVERY", {"SINCE": {}})
 
-        # Αποθηκεύουμε τα δεδομένα πίσω στο αρχείο
-        with open(ORDERS_FILE, 'w') as f:
-            json.dump(existing_data, f, indent=4)
+        # Αποθηκεύουμε τα δεδομένα πίσω στο αρχείο (ατομικά, ώστε ένα crash να μην το αφήσει μισό)
+        dca_recovery.write_json_atomic(ORDERS_FILE, existing_data)
     except Exception as e:
         logging.error(f"Failed to save orders: {e}")
 
@@ -426,17 +552,78 @@ def price_dropped_percent(current_price, recent_high):
 
 
 
-def find_support_levels(data, window=5):
+# Cache στη μνήμη της κατάστασης των επιπέδων ανά timeframe
+_support_store = {"data": None}
+
+
+
+
+def load_support_store():
+    """Φόρτωση της κατάστασης των επιπέδων υποστήριξης/αντίστασης ανά timeframe."""
+    if _support_store["data"] is None:
+        try:
+            with open(SUPPORT_FILE, 'r') as f:
+                _support_store["data"] = json.load(f)
+        except (FileNotFoundError, ValueError):
+            _support_store["data"] = {}
+    return _support_store["data"]
+
+
+
+
+def save_support_store():
+    """Ατομική αποθήκευση της κατάστασης των επιπέδων."""
+    try:
+        tmp_file = SUPPORT_FILE + ".tmp"
+        with open(tmp_file, 'w') as f:
+            json.dump(_support_store["data"], f)
+        os.replace(tmp_file, SUPPORT_FILE)
+    except Exception as e:
+        logging.error(f"Failed to save support levels: {e}")
+
+
+
+
+def find_support_levels(df, timeframe='1h'):
     """
-    Εντοπισμός επιπέδων υποστήριξης βασισμένος σε τοπικά ελάχιστα.
-    :param data: Series με τιμές (π.χ. low)
-    :param window: Μέγεθος παραθύρου για τοπικά ελάχιστα
-    :return: Λίστα με επίπεδα υποστήριξης
+    Εντοπισμός επιπέδων υποστήριξης βασισμένος σε τοπικά ελάχιστα (pivot lows).
+    Τα pivots ενημερώνονται σταδιακά μόνο με τα νέα κλειστά κεριά και ομαδοποιούνται σε επίπεδα με πλήθος touches.
+    :param df: DataFrame με στήλες high/low/close και timestamp (στήλη ή index)
+    :param timeframe: Το timeframe των κεριών (ξεχωριστή κατάσταση ανά timeframe)
+    :return: Ταξινομημένη λίστα με επίπεδα υποστήριξης
     """
-    support_levels = data[(data.shift(1) > data) & (data.shift(-1) > data)].rolling(window).min().dropna().tolist()
-    
-    
-    return sorted(set(support_levels))
+    store = load_support_store()
+    state = store.get(timeframe)
+    parameters = (SUPPORT["WINDOW"], SUPPORT["ATR_PERIOD"], SUPPORT["PIVOT_WIDTH"], SUPPORT["CLUSTER_PCT"])
+    if state is None or not dca_support.is_current(state, *parameters):
+        state = store[timeframe] = dca_support.new_state(*parameters)
+
+    timestamps = pd.Series(df['timestamp'] if 'timestamp' in df.columns else df.index)
+    timestamps_ms = ((timestamps - pd.Timestamp(0)) // pd.Timedelta(milliseconds=1)).tolist()
+
+    # Το τελευταίο κερί είναι ακόμα ανοιχτό
+    closed = zip(timestamps_ms[:-1], df['high'].tolist()[:-1], df['low'].tolist()[:-1], df['close'].tolist()[:-1])
+    processed = dca_support.update(state, closed, max_levels=SUPPORT["MAX_LEVELS"])
+    if processed:
+        save_support_store()
+
+    support_levels = dca_support.level_prices(state["SUPPORTS"], SUPPORT["MIN_TOUCHES"])
+    logging.info(
+        f"[SUPPORT {timeframe}] {processed} new candle(s), {len(support_levels)} support level(s), "
+        f"{len(state['RESISTANCES'])} resistance level(s), ATR: {state['ATR'] or 0:.4f}"
+    )
+    return support_levels
+
+
+
+
+def support_tolerance(current_price, timeframe='1h'):
+    """
+    Ανοχή για τον έλεγχο εγγύτητας σε support, σύμφωνα με το SUPPORT.TOLERANCE_MODE
+    ("absolute", "percent" της τιμής ή πολλαπλάσιο του "atr").
+    """
+    state = load_support_store().get(timeframe) or {}
+    return dca_support.tolerance(SUPPORT["TOLERANCE_MODE"], SUPPORT["TOLERANCE"], current_price, state.get("ATR"))
 
 
 
@@ -445,17 +632,17 @@ def near_support_level(current_price, support_levels, tolerance=50):
     """
     Ελέγχει αν η τρέχουσα τιμή είναι κοντά σε επίπεδο υποστήριξης.
     :param current_price: Τρέχουσα τιμή
-    :param support_levels: Λίστα από επίπεδα υποστήριξης
+    :param support_levels: Ταξινομημένη λίστα από επίπεδα υποστήριξης
     :param tolerance: Ανοχή (σε απόλυτη τιμή)
     :return: True αν η τιμή είναι κοντά σε κάποιο επίπεδο υποστήριξης
     """
-    for support in support_levels:
-        if abs(current_price - support) <= tolerance:
-            logging.info(
-                f"Current price {current_price:.2f} is near support level {support:.2f} within tolerance {tolerance}."
-            )
-            return True
-    logging.info(f"Current price {current_price:.2f} is not near any support level within tolerance {tolerance}.")
+    support = dca_support.nearest_level(support_levels, current_price)
+    if support is not None and abs(current_price - support) <= tolerance:
+        logging.info(
+            f"Current price {current_price:.2f} is near support level {support:.2f} within tolerance {tolerance:.2f}."
+        )
+        return True
+    logging.info(f"Current price {current_price:.2f} is not near any support level within tolerance {tolerance:.2f}.")
     return False
 
 
@@ -472,6 +659,883 @@ def wait_for_next_signal(interval=120):
 
 
 
+# Ο συνδυασμός των aggregations για OHLCV resampling
+OHLCV_AGG = {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+
+# Cache στη μνήμη (διατηρείται μεταξύ iterations σε daemon mode)
+_candle_cache = {"base": None, "resampled": {}}
+
+# Ring buffer 1m κεριών της market-data διεργασίας (μόνο στο split runtime)
+_ring_candles = {"buffer": None, "cursor": 0, "rows": {}}
+
+
+
+
+def take_ring_candles(since):
+    """
+    Τα 1m κεριά από το `since` και μετά, όπως τα έγραψε η market-data διεργασία στο ring buffer.
+    :return: Λίστα κεριών ή None αν το ring buffer δεν καλύπτει όλο το διάστημα (οπότε γίνεται fetch)
+    """
+    ring = _ring_candles["buffer"]
+    if ring is None:
+        return None
+
+    records, _ring_candles["cursor"] = ring.read_since(_ring_candles["cursor"])
+    rows = _ring_candles["rows"]
+    for _, values in records:
+        rows[values[0]] = list(values)  # Το ίδιο κερί ξαναγράφεται όσο είναι ανοιχτό
+    for timestamp in sorted(rows)[:-ring.capacity]:
+        del rows[timestamp]
+
+    if not rows or min(rows) > since:
+        return None
+    return [rows[timestamp] for timestamp in sorted(rows) if timestamp >= since]
+
+
+
+
+def timeframe_to_rule(timeframe):
+    """
+    Μετατροπή ccxt timeframe (π.χ. '1m', '4h', '1d') σε pandas offset.
+    """
+    amount, unit = timeframe[:-1], timeframe[-1]
+    if unit not in ("m", "h", "d") or not amount.isdigit():
+        raise ValueError(f"Unsupported timeframe '{timeframe}'. Use minutes, hours or days (e.g. '1m', '4h', '1d').")
+    # Οι ημέρες εκφράζονται σε ώρες ώστε τα buckets να ευθυγραμμίζονται στο epoch (όπως στο exchange)
+    if unit == "d":
+        return f"{int(amount) * 24}h"
+    return f"{int(amount)}{'min' if unit == 'm' else 'h'}"
+
+
+
+
+def update_base_candles(exchange, symbol, timeframe, history_days):
+    """
+    Ενημέρωση της βασικής ροής κεριών (π.χ. 1m) με μόνο τα νέα κεριά από το τελευταίο αποθηκευμένο.
+    Σε cold start γίνεται σελιδοποίηση μέχρι να καλυφθούν `history_days` ημέρες.
+    :return: Tuple (DataFrame με index το timestamp ή None αν δεν υπάρχει κανένα κερί, timestamp του πρώτου κεριού που άλλαξε)
+    """
+    base = _candle_cache["base"]
+    if base is None:
+        try:
+            base = pd.read_pickle(CANDLES_FILE)
+        except (FileNotFoundError, ValueError, EOFError):
+            base = None
+
+    now_ms = int(time.time() * 1000)
+    step_ms = pd.Timedelta(timeframe_to_rule(timeframe)).value // 1_000_000
+    if base is not None and not base.empty:
+        # Ξανά το τελευταίο κερί, γιατί μπορεί να ήταν ακόμα ανοιχτό
+        since = int(base.index[-1].value // 1_000_000)
+    else:
+        since = now_ms - history_days * 86_400_000
+
+    # Στο split runtime τα νέα 1m κεριά έρχονται ήδη από τη market-data διεργασία
+    ring_batch = take_ring_candles(since) if timeframe == "1m" else None
+    batches = ring_batch or []
+    while ring_batch is None:
+        batch = exchange.fetch_ohlcv(symbol, timeframe, since=since, limit=1000)
+        if not batch:
+            break
+        batches.extend(batch)
+        last_ms = batch[-1][0]
+        if last_ms + step_ms > now_ms or last_ms < since:
+            break
+        since = last_ms + 1
+
+    if batches:
+        new = pd.DataFrame(batches, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+        new['timestamp'] = pd.to_datetime(new['timestamp'], unit='ms')
+        new = new.set_index('timestamp')
+        first_changed = new.index[0]
+
+        base = new if base is None else pd.concat([base[base.index < first_changed], new])
+        base = base[~base.index.duplicated(keep='last')].sort_index()
+    else:
+        first_changed = None
+
+    if base is None or base.empty:
+        # Cold start χωρίς κεριά από το exchange: τίποτα για αποθήκευση, ξαναδοκιμάζεται στο επόμενο run
+        logging.warning(f"Base candle stream {symbol} {timeframe}: no candles returned and none cached.")
+        return None, None
+
+    # Διατήρηση μόνο του απαραίτητου ιστορικού
+    cutoff = pd.Timestamp(now_ms - history_days * 86_400_000, unit='ms')
+    base = base[base.index >= cutoff]
+
+    _candle_cache["base"] = base
+    base.to_pickle(CANDLES_FILE)
+
+    logging.info(f"Base candle stream {symbol} {timeframe}: {len(batches)} new/updated candle(s), {len(base)} cached.")
+    return base, first_changed
+
+
+
+
+def resample_incremental(base, timeframe, first_changed):
+    """
+    Παραγωγή κεριών μεγαλύτερου timeframe από τη βασική ροή.
+    Ξαναϋπολογίζονται μόνο τα buckets από το πρώτο κερί που άλλαξε και μετά.
+    :param base: Η βασική ροή κεριών
+    :param timeframe: Το timeframe-στόχος (π.χ. '4h')
+    :param first_changed: Timestamp του πρώτου νέου/ενημερωμένου βασικού κεριού (None = τίποτα νέο)
+    :return: DataFrame με τα κεριά του timeframe
+    """
+    rule = timeframe_to_rule(timeframe)
+    previous = _candle_cache["resampled"].get(timeframe)
+
+    if previous is None or previous.empty:
+        resampled = base.resample(rule, origin='epoch').agg(OHLCV_AGG).dropna()
+    elif first_changed is None:
+        resampled = previous
+    else:
+        bucket_start = first_changed.floor(rule)
+        tail = base[base.index >= bucket_start].resample(rule, origin='epoch').agg(OHLCV_AGG).dropna()
+        resampled = pd.concat([previous[previous.index < bucket_start], tail])
+
+    resampled = resampled[resampled.index >= base.index[0].floor(rule)]
+    _candle_cache["resampled"][timeframe] = resampled
+    return resampled
+
+
+
+
+def evaluate_timeframe(df, current_price, timeframe):
+    """
+    Υπολογισμός των δεικτών (EMA, RSI, recent high, support) για ένα timeframe.
+    :return: Dictionary με τις τιμές των δεικτών και των ελέγχων
+    """
+    close = df['close']
+    recent_high = close.rolling(window=20).max().iloc[-1]
+    price_drop, meets_threshold = price_dropped_percent(current_price, recent_high)
+    support_levels = find_support_levels(df, timeframe=timeframe)
+
+    evaluation = {
+        "timeframe": timeframe,
+        "ema_fast": ema(close, period=9).iloc[-1],
+        "ema_slow": ema(close, period=21).iloc[-1],
+        "rsi": rsi(close, period=14).iloc[-1],
+        "recent_high": recent_high,
+        "price_drop": price_drop,
+        "meets_threshold": meets_threshold,
+        "near_support": near_support_level(current_price, support_levels, tolerance=support_tolerance(current_price, timeframe)),
+    }
+    logging.info(
+        f"[SIGNAL {timeframe}] EMA fast/slow: {evaluation['ema_fast']:.4f}/{evaluation['ema_slow']:.4f}, "
+        f"RSI: {evaluation['rsi']:.2f}, Recent high: {recent_high:.4f}, Price drop: {price_drop:.2f}%, "
+        f"Near support: {evaluation['near_support']}"
+    )
+    return evaluation
+
+
+
+
+def evaluate_entry_signal(exchange, current_price):
+    """
+    Συνδυασμένο σήμα αρχικής αγοράς από μία βασική ροή κεριών (ένα API call ανά run).
+    Το ENTRY_TIMEFRAME πρέπει να πληροί τον υπάρχοντα έλεγχο (πτώση από το πρόσφατο υψηλό και κοντά σε support)
+    και κάθε CONFIRM_TIMEFRAME να μην είναι overbought (RSI <= CONFIRM_RSI_MAX) και, προαιρετικά, σε ανοδική τάση (EMA fast >= slow).
+    :param current_price: Η τιμή του ticker, για την περίπτωση που δεν υπάρχουν ακόμα κεριά
+    :return: Tuple (σήμα αγοράς, τρέχουσα τιμή)
+    """
+    base, first_changed = update_base_candles(exchange, PAIR, SIGNALS["BASE_TIMEFRAME"], SIGNALS["HISTORY_DAYS"])
+    if base is None:
+        logging.info("No candle history yet. No entry signal this run.")
+        return False, current_price
+    current_price = base['close'].iloc[-1]
+
+    entry_tf = SIGNALS["ENTRY_TIMEFRAME"]
+    entry = evaluate_timeframe(resample_incremental(base, entry_tf, first_changed), current_price, entry_tf)
+    signal = entry["meets_threshold"] and entry["near_support"]
+
+    for timeframe in SIGNALS["CONFIRM_TIMEFRAMES"]:
+        confirmation = evaluate_timeframe(resample_incremental(base, timeframe, first_changed), current_price, timeframe)
+        confirmed = confirmation["rsi"] <= SIGNALS["CONFIRM_RSI_MAX"]
+        if SIGNALS["CONFIRM_TREND"]:
+            confirmed = confirmed and confirmation["ema_fast"] >= confirmation["ema_slow"]
+        if pd.isna(confirmation["rsi"]):
+            logging.warning(f"[SIGNAL {timeframe}] Not enough history for confirmation. Increase SIGNALS.HISTORY_DAYS.")
+        if not confirmed:
+            logging.info(f"[SIGNAL {timeframe}] Confirmation failed.")
+        signal = signal and confirmed
+
+    logging.info(f"Combined entry signal: {signal} (entry {entry_tf}, confirmations {SIGNALS['CONFIRM_TIMEFRAMES']}).")
+    return signal, current_price
+
+
+
+
+def publish_state(orders, current_price, iteration_seconds, health):
+    """
+    Δημοσίευση της κατάστασης του bot (τιμή, επόμενο επίπεδο αγοράς, thresholds ανά θέση, χρόνος iteration, υγεία)
+    στο κοινόχρηστο snapshot που διαβάζει το dashboard.
+    """
+    try:
+        lots = [
+            (float(price), float(order['amount']), float(price) * (1 + PERCENTAGE_RISE / 100))
+            for price, order in orders.get("ORDERS", {}).items()
+        ]
+        next_buy_price = min(lot[0] for lot in lots) * (1 - PERCENTAGE_DROP / 100) if lots else None
+        dca_live_state.publish_live_state(current_price, next_buy_price, lots, iteration_seconds, health)
+    except Exception as e:
+        logging.error(f"Failed to publish live state: {e}")
+
+
+
+
+def record_tick(orders, current_price):
+    """
+    Καταγραφή τιμής, ανοιχτής ποσότητας, μέσου κόστους και realized/unrealized PnL στο time-series store.
+    """
+    try:
+        open_qty = sum(float(order['amount']) for order in orders["ORDERS"].values())
+        total_cost = sum(float(order['amount']) * float(order['price']) for order in orders["ORDERS"].values())
+        avg_cost = total_cost / open_qty if open_qty > 0 else 0.0
+        unrealized_pnl = open_qty * current_price - total_cost
+
+        dca_timeseries.append_record(int(time.time() * 1000), current_price, open_qty, avg_cost,
+                                     orders["META"]["PROFIT"], unrealized_pnl)
+    except Exception as e:
+        logging.error(f"Failed to record time-series tick: {e}")
+
+
+
+
+# Τα επιπλέον venues (εκτός του EXCHANGE_NAME) δημιουργούνται μία φορά
+_venues = {}
+
+
+def initialize_venues(exchange):
+    """
+    Δημιουργία των venues του VENUES.EXCHANGES.
+    Για το EXCHANGE_NAME χρησιμοποιείται το ήδη συνδεδεμένο exchange, ενώ ονόματα "sim*" δίνουν τοπικό simulator.
+    :return: Dictionary όνομα -> exchange instance
+    """
+    venues = {}
+    for name, settings in VENUES["EXCHANGES"].items():
+        if name == EXCHANGE_NAME:
+            venues[name] = exchange
+        elif name.startswith("sim"):
+            venues[name] = dca_cassette.attach(name, lambda: create_sim_exchange(name, settings.get("SIMULATOR", {})))
+        else:
+            if name not in _venues:
+                _venues[name] = dca_cassette.attach(name, lambda: connect_venue(name, settings))
+            venues[name] = _venues[name]
+    return venues
+
+
+def connect_venue(name, settings):
+    venue = getattr(ccxt, name)({
+        "apiKey": settings.get("API_KEY"),
+        "secret": settings.get("API_SECRET"),
+        "enableRateLimit": True,
+    })
+    venue.load_markets()
+    return venue
+
+
+
+
+def place_market_order(exchange, side, amount, lot=None):
+    """
+    Εκτέλεση market order. Με ενεργό το VENUES, η παραγγελία πηγαίνει στο venue με την καλύτερη effective τιμή
+    (μετά τα fees) που έχει επαρκές υπόλοιπο, αλλιώς στο EXCHANGE_NAME.
+    Πριν σταλεί καταγράφεται μια πρόθεση (write-ahead) με clientOrderId, την οποία ο caller αφαιρεί με
+    dca_recovery.clear_intent() αφού αποθηκεύσει το ledger.
+    :param exchange: Το κύριο exchange instance
+    :param side: "buy" ή "sell"
+    :param amount: Ποσότητα σε CRYPTO_SYMBOL
+    :param lot: Το κλειδί της θέσης στο ORDERS που πουλιέται (για πωλήσεις)
+    :return: Tuple (order, όνομα venue). Το order περιέχει πάντα το clientOrderId.
+    """
+    venue_name, venue = EXCHANGE_NAME, exchange
+
+    if VENUES["ENABLED"]:
+        venues = initialize_venues(exchange)
+        fees = {name: settings.get("FEE", 0.001) for name, settings in VENUES["EXCHANGES"].items()}
+        quotes = dca_venues.fetch_quotes(venues, PAIR, side, amount, fees, VENUES["LATENCY_BUDGET"], VENUES["DEPTH"])
+        for quote in sorted(quotes, key=lambda q: q["venue"]):
+            logging.info(
+                f"[VENUES] {quote['venue']}: effective {side} price {quote['price']}, free {CRYPTO_SYMBOL}: {quote['free_base']:.6f}, "
+                f"free {CRYPTO_CURRENCY}: {quote['free_quote']:.2f}, latency {quote['latency'] * 1000:.0f} ms"
+            )
+
+        best = dca_venues.select_venue(quotes, side, amount)
+        if best is None:
+            raise ccxt.InsufficientFunds(f"No venue can {side} {amount} {CRYPTO_SYMBOL} ({len(quotes)}/{len(venues)} venues quoted).")
+        venue_name, venue = best["venue"], venues[best["venue"]]
+        logging.info(f"[VENUES] Routing {side} of {amount} {CRYPTO_SYMBOL} to {venue_name} at effective price {best['price']:.4f}.")
+
+    client_id = dca_recovery.new_client_order_id(side)
+    dca_recovery.write_intent({"CLIENT_ID": client_id, "SIDE": side, "AMOUNT": amount, "VENUE": venue_name, "LOT": lot,
+                               "TIMESTAMP": int(datetime.utcnow().timestamp() * 1000)})
+    try:
+        if side == "buy":
+            order = venue.create_market_buy_order(PAIR, amount, {"clientOrderId": client_id})
+        else:
+            order = venue.create_market_sell_order(PAIR, amount, {"clientOrderId": client_id})
+    except (ccxt.InvalidOrder, ccxt.InsufficientFunds):
+        dca_recovery.clear_intent(client_id)  # Απορρίφθηκε: η παραγγελία σίγουρα δεν εκτελέστηκε
+        raise
+
+    order["clientOrderId"] = order.get("clientOrderId") or client_id
+    return order, venue_name
+
+
+
+
+def build_order_record(order, price, amount, venue=None):
+    """
+    Δημιουργία εγγραφής θέσης (lot) για το ORDERS από την απάντηση του exchange.
+    :param order: Η παραγγελία όπως επιστράφηκε από το ccxt
+    :param price: Τιμή αγοράς της θέσης
+    :param amount: Ποσότητα της θέσης
+    :param venue: Το exchange στο οποίο βρίσκεται η θέση (default: EXCHANGE_NAME)
+    :return: Dictionary με τα στοιχεία της θέσης
+    """
+    # Χρόνος εκτέλεσης (για limit orders το timestamp είναι ο χρόνος δημιουργίας της παραγγελίας)
+    timestamp = order.get("lastTradeTimestamp") or order.get("timestamp") or int(datetime.utcnow().timestamp() * 1000)
+    if order.get("datetime") and timestamp == order.get("timestamp"):
+        order_datetime = order['datetime']
+    else:
+        order_datetime = datetime.utcfromtimestamp(timestamp / 1000).isoformat(timespec="milliseconds") + "Z"
+
+    return {
+        "id": order['id'],
+        "venue": venue or EXCHANGE_NAME,
+        "symbol": PAIR,
+        "price": price,
+        "side": "buy",
+        "status": "open",
+        "amount": amount,
+        "remaining": amount,
+        "datetime": order_datetime,
+        "timestamp": timestamp,
+        "client_id": order.get("clientOrderId"),
+    }
+
+
+
+
+def record_closed_trade(order_id, buy_price, sell_price, amount, buy_timestamp, sell_timestamp):
+    """Καταγραφή της κλειστής συναλλαγής στο ιστορικό (τα σφάλματα καταγράφονται χωρίς να σταματούν το bot)."""
+    try:
+        dca_trades.record_closed_trade(order_id, buy_price, sell_price, amount, buy_timestamp, sell_timestamp)
+    except Exception as e:
+        logging.error(f"Failed to record closed trade for order ID {order_id}: {e}")
+
+
+
+
+def record_sale(orders, price, order, sell_price, sell_order=None, amount=None):
+    """
+    Καταγραφή πώλησης μιας θέσης: υπολογισμός κέρδους, ενημέρωση του META, καταγραφή στο ιστορικό συναλλαγών
+    και αφαίρεση από το ORDERS.
+    :param orders: Τα δεδομένα του orders.json
+    :param price: Το κλειδί της θέσης στο ORDERS
+    :param order: Η θέση που πουλήθηκε
+    :param sell_price: Η τιμή πώλησης
+    :param sell_order: Η παραγγελία πώλησης όπως επιστράφηκε από το ccxt (για τον χρόνο πώλησης)
+    :param amount: Η ποσότητα που πουλήθηκε, αν είναι μέρος της θέσης (π.χ. ακυρωμένο limit sell με μερική
+                   εκτέλεση). Η θέση τότε μένει στο ORDERS με την υπόλοιπη ποσότητα
+    :return: Το κέρδος της πώλησης
+    """
+    buy_price = float(order['price'])  # Η τιμή αγοράς της θέσης
+    lot_amount = float(order['amount'])
+    amount = lot_amount if amount is None else min(float(amount), lot_amount)  # Το ποσό του crypto που πουλιέται
+
+    total_cost = buy_price * amount   # Συνολικό κόστος αγοράς
+    total_income = sell_price * amount  # Συνολικό εισόδημα από την πώληση
+    profit = total_income - total_cost  # Κέρδος
+
+    # Ενημέρωση του META
+    orders["META"]["PROFIT"] += profit  # Προσθήκη στο συνολικό κέρδος
+    orders["META"]["SALES"] += 1        # Αύξηση του αριθμού πωλήσεων
+
+    # Καταγραφή του κέρδους
+    logging.info(f"Profit for order ID {order['id']}: {profit:.4f} {CRYPTO_CURRENCY}. Total Profit: {orders['META']['PROFIT']:.4f}. Total Sales: {orders['META']['SALES']}.")
+    dispatch(
+        send_push_notification,
+        f"Sale executed for order ID {order['id']}. Sold {amount} {PAIR} at {sell_price:.4f}. "
+        f"Profit: {profit:.4f} {CRYPTO_CURRENCY}. Total Profit: {orders['META']['PROFIT']:.4f}. Total Sales: {orders['META']['SALES']}."
+    )
+
+    # Καταγραφή στο ιστορικό συναλλαγών και ενημέρωση των rollups
+    now = int(datetime.utcnow().timestamp() * 1000)
+    sell_order = sell_order or {}
+    sell_timestamp = sell_order.get('lastTradeTimestamp') or sell_order.get('timestamp') or now  # Χρόνος εκτέλεσης
+    dispatch(record_closed_trade, order['id'], buy_price, sell_price, amount,
+             order.get('timestamp') or sell_timestamp, sell_timestamp)
+
+    # Αφαίρεση της παραγγελίας (ή μείωση της ποσότητάς της μετά από μερική πώληση)
+    if amount < lot_amount - 1e-12:
+        order['amount'] = lot_amount - amount
+        order['remaining'] = order['amount']
+        logging.info(f"Order ID {order['id']} partially sold: {order['amount']} {CRYPTO_SYMBOL} remain open.")
+    else:
+        del orders["ORDERS"][price]
+
+    # Αποθήκευση του ORDERS και του META ξεχωριστά
+    dispatch(save_orders, {"ORDERS": copy.deepcopy(orders["ORDERS"])}, save_meta=False)  # Αποθήκευση των παραγγελιών
+    dispatch(save_orders, {"META": dict(orders["META"])}, save_orders=False)   # Αποθήκευση του META
+
+    return profit
+
+
+
+
+def dispatch(func, *args, **kwargs):
+    """
+    Εκτέλεση εργασίας persistence/ειδοποίησης. Στο split runtime γίνεται ασύγχρονα σε background thread
+    (με σειρά FIFO), ώστε να μην καθυστερεί η εκτέλεση των παραγγελιών.
+    """
+    if _io_executor["executor"] is None:
+        return func(*args, **kwargs)
+    _io_executor["executor"].submit(_run_logged, func, *args, **kwargs)
+
+
+def _run_logged(func, *args, **kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception as e:
+        logging.error(f"Background task {func.__name__} failed: {e}")
+
+
+def flush_dispatch():
+    """Αναμονή μέχρι να ολοκληρωθούν όλες οι εκκρεμείς ασύγχρονες εργασίες."""
+    if _io_executor["executor"] is not None:
+        _io_executor["executor"].submit(lambda: None).result()
+
+
+
+
+def buy_more_if_dropped(exchange, orders, current_price, verbose=True):
+    """
+    Αγορά νέας θέσης αν η τιμή έπεσε PERCENTAGE_DROP% κάτω από τη χαμηλότερη θέση.
+    :param verbose: Αν είναι False δεν καταγράφεται η προειδοποίηση μέγιστων παραγγελιών (για κάθε tick)
+    :return: False αν απέτυχε η παραγγελία στο exchange, αλλιώς True
+    """
+    try:
+        # Έλεγχος μέγιστων παραγγελιών
+        if len(orders["ORDERS"]) >= MAX_ORDERS:
+            if verbose:
+                logging.warning(f"Maximum order limit reached ({MAX_ORDERS}). No more orders will be placed.")
+
+        elif current_price <= min(map(float, orders["ORDERS"].keys())) * (1 - PERCENTAGE_DROP / 100):
+            # Buy Crypto
+            order, venue = place_market_order(exchange, "buy", TRADE_AMOUNT)
+
+            lowest_order_price = min(map(float, orders["ORDERS"].keys()))
+            logging.info(
+                f"Bought {TRADE_AMOUNT} {CRYPTO_SYMBOL} at {current_price:.4f} {CRYPTO_CURRENCY}. "
+                f"Current price {current_price:.4f} {CRYPTO_CURRENCY} dropped by more than {PERCENTAGE_DROP}% "
+                f"from the lowest order price {lowest_order_price:.4f}."
+            )
+
+            # Ενημέρωση χρήστη για αγορά με Push msg
+            dispatch(
+                send_push_notification,
+                f"Bought {TRADE_AMOUNT} {CRYPTO_SYMBOL} at {current_price:.4f} {CRYPTO_CURRENCY}. "
+                f"Reason: Current price {current_price:.4f} {CRYPTO_CURRENCY} dropped by more than {PERCENTAGE_DROP}% "
+                f"from the lowest order price {lowest_order_price:.4f}."
+            )
+
+            logging.info(
+                f"Total Orders: {len(orders['ORDERS']) + 1}. Current Portfolio Strategy: Adding to position to reduce cost average."
+            )
+
+            # Καταγραφή της παραγγελίας
+            order_data = build_order_record(order, current_price, TRADE_AMOUNT, venue)
+
+            # Ενημέρωση και αποθήκευση του ORDERS
+            orders["ORDERS"][str(current_price)] = order_data
+            dispatch(save_orders, {"ORDERS": copy.deepcopy(orders["ORDERS"])}, save_meta=False)
+            dispatch(dca_recovery.clear_intent, order["clientOrderId"])
+
+    except ccxt.BaseError as api_error:
+        logging.error(f"Error placing buy order: {api_error}")
+        return False
+
+    return True
+
+
+
+
+def evaluate_sells(exchange, orders, current_price, verbose=True):
+    """
+    Πώληση κάθε θέσης της οποίας το sell threshold έχει επιτευχθεί.
+    :param verbose: Αν είναι False δεν καταγράφονται οι θέσεις που δεν πωλούνται (για κάθε tick)
+    """
+    for price, order in list(orders["ORDERS"].items()):  # Copy to avoid modifying during iteration
+        sell_threshold = float(price) * (1 + PERCENTAGE_RISE / 100)
+
+        if current_price >= sell_threshold:
+            # Sell BTC
+            sell_order, venue = place_market_order(exchange, "sell", order['amount'], lot=price)
+            logging.info(f"Order ID: {order['id']} | Sell Threshold: {sell_threshold:.4f} | Current Price: {current_price:.4f} -> Selling on {venue}!")
+
+            # Υπολογισμός κέρδους, ενημέρωση META και αφαίρεση της παραγγελίας
+            record_sale(orders, price, order, current_price, sell_order)
+            dispatch(dca_recovery.clear_intent, sell_order["clientOrderId"])
+
+        elif verbose:
+            logging.info(f"Order ID: {order['id']} | Sell Threshold: {sell_threshold:.4f} | Current Price: {current_price:.4f} -> Not selling.")
+
+
+
+
+def fetch_fills(venue, since):
+    """
+    Όλα τα trades του ζεύγους από το `since` και μετά, σε σελίδες των RECOVERY.PAGE_SIZE.
+    :param venue: ccxt exchange instance
+    :param since: Timestamp (ms)
+    :return: Λίστα trades (χωρίς διπλότυπα)
+    """
+    trades, seen = [], set()
+    while True:
+        batch = venue.fetch_my_trades(PAIR, since=since, limit=RECOVERY["PAGE_SIZE"])
+        new = [trade for trade in batch if trade["id"] not in seen]
+        trades.extend(new)
+        seen.update(trade["id"] for trade in new)
+        if len(batch) < RECOVERY["PAGE_SIZE"] or not new:
+            return trades
+        since = max(trade["timestamp"] for trade in batch)
+
+
+
+
+def apply_repair(orders, intents, venue_name, repair):
+    """
+    Εφαρμογή μιας επιδιόρθωσης του dca_recovery.plan_repairs() στο ledger.
+    :param orders: Τα δεδομένα του orders.json
+    :param intents: Οι εκκρεμείς προθέσεις (ενημερώνεται)
+    :param venue_name: Το venue της επιδιόρθωσης
+    :param repair: Η επιδιόρθωση
+    """
+    action, fill = repair["ACTION"], repair.get("FILL")
+    lots = orders["ORDERS"]
+
+    if action == "add_lot":
+        order = {"id": fill["id"], "datetime": fill["datetime"], "timestamp": fill["timestamp"],
+                 "clientOrderId": repair["INTENT"]["CLIENT_ID"]}
+        lot = build_order_record(order, fill["price"], fill["amount"], venue_name)
+        lot["fee"] = {"cost": fill["fee"], "currency": fill["fee_currency"]}
+        lots[dca_recovery.lot_key(lots, fill["price"])] = lot
+        logging.warning(f"[RECOVERY] Missing lot restored: buy {fill['id']} of {fill['amount']} {CRYPTO_SYMBOL} at {fill['price']:.4f} on {venue_name}.")
+        send_push_notification(f"Recovery: restored missing lot {fill['id']} ({fill['amount']} {CRYPTO_SYMBOL} at {fill['price']:.4f}).")
+
+    elif action == "close_lot":
+        lot = lots.get(repair["LOT"])
+        if lot is not None:
+            logging.warning(f"[RECOVERY] Lot {lot['id']} was sold by order {fill['id']} at {fill['price']:.4f} on {venue_name}. Recording the sale.")
+            record_sale(orders, repair["LOT"], lot, fill["price"], {"timestamp": fill["timestamp"]})
+
+    elif action == "remove_lot":
+        lot = lots.pop(repair["LOT"])
+        logging.warning(f"[RECOVERY] Phantom lot removed: order {lot['id']} at {lot['price']} has no fill on {venue_name}.")
+        send_push_notification(f"Recovery: removed lot {lot['id']} at {lot['price']} that has no fill on {venue_name}.")
+
+    elif action == "reprice_lot":
+        lot = lots.pop(repair["LOT"], None)
+        if lot is None:
+            return  # Πουλήθηκε στο ίδιο reconciliation
+        if abs(float(lot["price"]) - fill["price"]) > 1e-9:
+            logging.info(f"[RECOVERY] Lot {lot['id']}: recorded price {lot['price']} -> actual fill price {fill['price']:.4f}.")
+        lot.update({"id": fill["id"], "price": fill["price"], "amount": fill["amount"], "remaining": fill["amount"],
+                    "fee": {"cost": fill["fee"], "currency": fill["fee_currency"]}})
+        key = dca_recovery.lot_key(lots, fill["price"])
+        lots[key] = lot
+        sells = orders["LADDER"]["SELLS"]
+        if repair["LOT"] in sells and key != repair["LOT"]:
+            sells[key] = sells.pop(repair["LOT"])
+
+    if repair.get("INTENT") and action != "reprice_lot":
+        intents.pop(repair["INTENT"]["CLIENT_ID"], None)
+        dispatch(dca_recovery.clear_intent, repair["INTENT"]["CLIENT_ID"])
+
+
+
+
+def recover_ledger(exchange, orders):
+    """
+    Συμφωνία του ledger με τα fills κάθε venue μετά από το αποθηκευμένο cursor: επαναφορά θέσεων που λείπουν,
+    αφαίρεση phantom θέσεων, καταγραφή πωλήσεων που δεν αποθηκεύτηκαν και πραγματικές τιμές/fees εκτέλεσης.
+    :param exchange: Το κύριο exchange instance
+    :param orders: Τα δεδομένα του orders.json
+    """
+    cursors = orders["RECOVERY"]["SINCE"]
+    intents = dca_recovery.load_intents()
+    venues = initialize_venues(exchange) if VENUES["ENABLED"] else {EXCHANGE_NAME: exchange}
+    grace_ms, timeout_ms = RECOVERY["GRACE_SECONDS"] * 1000, RECOVERY["INTENT_TIMEOUT"] * 1000
+    now = int(datetime.utcnow().timestamp() * 1000)
+
+    fetch_since = {}
+    for name in venues:
+        if cursors.get(name) is not None:
+            fetch_since[name] = cursors[name]
+            continue
+        # Πρώτο run: από την παλαιότερη θέση ή πρόθεση του venue
+        starts = [lot.get("timestamp") or 0 for lot in orders["ORDERS"].values() if (lot.get("venue") or EXCHANGE_NAME) == name]
+        starts += [intent["TIMESTAMP"] - 5000 for intent in intents.values() if intent.get("VENUE") == name]
+        if starts:
+            fetch_since[name] = min(starts)
+        else:
+            cursors[name] = now - grace_ms
+
+    # Τα trades όλων των venues ζητούνται ταυτόχρονα
+    with ThreadPoolExecutor(max_workers=max(len(fetch_since), 1)) as executor:
+        futures = {name: executor.submit(fetch_fills, venues[name], since) for name, since in fetch_since.items()}
+
+    for name, future in futures.items():
+        since = cursors.get(name)
+        fills = dca_recovery.aggregate_fills(future.result())
+        repairs = dca_recovery.plan_repairs(orders["ORDERS"], intents, fills, name, since, now,
+                                            grace_ms, timeout_ms, default_venue=EXCHANGE_NAME)
+        for repair in sorted(repairs, key=lambda r: r["ACTION"] != "close_lot"):
+            apply_repair(orders, intents, name, repair)
+
+        cursors[name] = dca_recovery.next_cursor(fills, intents, name, fetch_since[name], now, grace_ms)
+        changes = sum(repair["ACTION"] != "reprice_lot" for repair in repairs)
+        logging.info(f"[RECOVERY] {name}: {len(fills)} fill(s) since {fetch_since[name]}, {changes} repair(s), {len(repairs) - changes} price update(s).")
+
+    flush_dispatch()
+    save_orders(orders, save_ladder=True, save_recovery=True)
+
+
+
+
+def fetch_ladder_orders(exchange, tracked_ids):
+    """
+    Η κατάσταση των resting παραγγελιών του ladder: μία κλήση fetch_open_orders και fetch_order μόνο για όσες
+    δεν είναι πλέον ανοιχτές, ώστε το κόστος να είναι ανάλογο των νέων εκτελέσεων και όχι του ιστορικού.
+    :param exchange: ccxt exchange instance
+    :param tracked_ids: Τα ids των παραγγελιών που παρακολουθούμε
+    :return: Λίστα με τις παραγγελίες που δεν είναι πλέον ανοιχτές
+    """
+    open_ids = {str(order['id']) for order in exchange.fetch_open_orders(PAIR)}
+    fetched = []
+    for order_id in tracked_ids:
+        if str(order_id) in open_ids:
+            continue
+        try:
+            fetched.append(exchange.fetch_order(order_id, PAIR))
+        except ccxt.OrderNotFound:
+            logging.warning(f"[LADDER] Resting order {order_id} is neither open nor found on the exchange.")
+    return fetched
+
+
+
+
+def save_ladder(ladder):
+    """Αποθήκευση του LADDER μετά από κάθε αλλαγή, ώστε καμία resting παραγγελία να μη μείνει χωρίς καταγραφή."""
+    ladder.pop("SINCE", None)  # Cursor παλαιότερων εκδόσεων
+    save_orders({"LADDER": ladder}, save_meta=False, save_orders=False, save_ladder=True)
+
+
+
+
+def book_limit_buy(orders, exchange_order, amount, reason):
+    """
+    Καταγραφή μιας (πλήρως ή μερικώς) εκτελεσμένης limit αγοράς ως νέα θέση στο ORDERS.
+    Το κλειδί είναι μοναδικό, ώστε μια αγορά στο επίπεδο μιας υπάρχουσας θέσης να μην την αντικαθιστά.
+    """
+    fill_price = float(exchange_order.get('average') or exchange_order['price'])
+    key = dca_recovery.lot_key(orders["ORDERS"], fill_price)
+    orders["ORDERS"][key] = build_order_record(exchange_order, fill_price, amount)
+
+    logging.info(f"[LADDER] Limit buy filled: {amount} {CRYPTO_SYMBOL} at {fill_price:.4f} {CRYPTO_CURRENCY}.")
+    send_push_notification(f"Bought {amount} {CRYPTO_SYMBOL} at {fill_price:.4f} {CRYPTO_CURRENCY}. Reason: {reason}")
+    save_orders({"ORDERS": orders["ORDERS"]}, save_meta=False)
+
+
+
+
+def reconcile_limit_fills(exchange, orders):
+    """
+    Συμφωνία των resting limit orders του ladder με το exchange.
+    Οι εκτελεσμένες αγορές γίνονται νέες θέσεις στο ORDERS και οι εκτελεσμένες πωλήσεις κλείνουν τη θέση τους.
+    Ζητούνται μόνο οι ανοιχτές παραγγελίες και όσες από τις δικές μας έκλεισαν, ώστε το κόστος να είναι ανάλογο της νέας δραστηριότητας.
+    :param exchange: ccxt exchange instance
+    :param orders: Τα δεδομένα του orders.json
+    """
+    ladder = orders["LADDER"]
+
+    tracked = {}
+    if ladder.get("BUY"):
+        tracked[ladder["BUY"]["id"]] = ("buy", None)
+    for price, sell in ladder["SELLS"].items():
+        tracked[sell["id"]] = ("sell", price)
+
+    if not tracked:
+        logging.info("[LADDER] No resting orders to reconcile.")
+        return
+
+    fetched = fetch_ladder_orders(exchange, list(tracked))
+    logging.info(f"[LADDER] Reconciling {len(tracked)} resting order(s) against {len(fetched)} fetched order(s).")
+
+    for exchange_order in fetched:
+        if exchange_order['id'] not in tracked:
+            continue
+
+        side, price = tracked[exchange_order['id']]
+        status = exchange_order.get('status')
+        filled = float(exchange_order.get('filled') or 0)
+
+        if status not in ('closed', 'canceled', 'expired', 'rejected'):
+            continue  # Ακόμα σε αναμονή (ή μερικώς εκτελεσμένη)
+
+        if status != 'closed' and filled <= 0:
+            # Ακυρώθηκε χωρίς εκτέλεση: θα ξαναστηθεί στο επόμενο arm
+            logging.warning(f"[LADDER] {side.upper()} order {exchange_order['id']} is {status} without fills. It will be re-armed.")
+            if side == "buy":
+                ladder["BUY"] = None
+            else:
+                ladder["SELLS"].pop(price, None)
+            continue
+
+        fill_price = float(exchange_order.get('average') or exchange_order['price'])
+
+        if side == "buy":
+            amount = filled if filled > 0 else float(exchange_order['amount'])
+            book_limit_buy(orders, exchange_order, amount, "Limit buy of the ladder filled.")
+            ladder["BUY"] = None
+        else:
+            ladder["SELLS"].pop(price, None)
+            order = orders["ORDERS"].get(price)
+            if order is None:
+                logging.warning(f"[LADDER] Limit sell {exchange_order['id']} filled but lot {price} is no longer in ORDERS.")
+                continue
+
+            if status == 'closed':
+                logging.info(f"[LADDER] Limit sell filled for order ID {order['id']} at {fill_price:.4f} {CRYPTO_CURRENCY}.")
+                record_sale(orders, price, order, fill_price, exchange_order)
+            else:
+                # Ακυρώθηκε μετά από μερική εκτέλεση: καταγράφεται μόνο το μέρος που πουλήθηκε
+                logging.warning(f"[LADDER] Limit sell {exchange_order['id']} is {status} after a partial fill of {filled} {CRYPTO_SYMBOL}.")
+                record_sale(orders, price, order, fill_price, exchange_order, amount=filled)
+
+    save_ladder(ladder)
+
+
+
+
+def next_ladder_price(exchange, lots):
+    """Η τιμή της επόμενης αγοράς του ladder (PERCENTAGE_DROP κάτω από τη χαμηλότερη θέση), στην ακρίβεια του exchange."""
+    lowest_order_price = min(map(float, lots.keys()))
+    return float(exchange.price_to_precision(PAIR, lowest_order_price * (1 - PERCENTAGE_DROP / 100)))
+
+
+
+
+def cancel_ladder_order(exchange, resting, label):
+    """
+    Ακύρωση μιας resting παραγγελίας του ladder.
+    :return: True αν ακυρώθηκε, False αν δεν βρέθηκε (πιθανόν εκτελέστηκε στο μεταξύ)
+    """
+    try:
+        exchange.cancel_order(resting["id"], PAIR)
+        logging.info(f"[LADDER] Cancelled {label} order {resting['id']} at {resting['price']}.")
+        return True
+    except ccxt.OrderNotFound:
+        logging.warning(f"[LADDER] {label} order {resting['id']} not found on cancel. It will be reconciled on the next run.")
+        return False
+
+
+
+
+def cancel_ladder_buy(exchange, orders):
+    """
+    Ακύρωση της resting αγοράς του ladder. Μια μερική εκτέλεση πριν από την ακύρωση καταγράφεται ως θέση.
+    :return: True αν η αγορά ακυρώθηκε και έφυγε από το LADDER, False αν παραμένει για το επόμενο reconcile
+    """
+    ladder = orders["LADDER"]
+    buy = ladder["BUY"]
+    if not cancel_ladder_order(exchange, buy, "BUY"):
+        return False
+
+    try:
+        cancelled = exchange.fetch_order(buy["id"], PAIR)
+    except ccxt.BaseError as e:
+        # Παραμένει στο LADDER: το reconcile του επόμενου run θα καταγράψει τυχόν εκτέλεση
+        logging.warning(f"[LADDER] Could not fetch the cancelled BUY order {buy['id']}: {e}")
+        return False
+
+    filled = float(cancelled.get('filled') or 0)
+    if filled > 0:
+        logging.warning(f"[LADDER] BUY order {buy['id']} was cancelled after a partial fill of {filled} {CRYPTO_SYMBOL}.")
+        book_limit_buy(orders, cancelled, filled, "Limit buy of the ladder partially filled before it was moved.")
+
+    ladder["BUY"] = None
+    save_ladder(ladder)
+    return True
+
+
+
+
+def arm_limit_ladder(exchange, orders):
+    """
+    Τοποθέτηση/ενημέρωση των resting limit orders: μία limit αγορά στο επόμενο επίπεδο του ladder
+    και μία limit πώληση ανά θέση στο sell threshold της.
+    Το LADDER αποθηκεύεται μετά από κάθε τοποθέτηση ή ακύρωση και μια αποτυχημένη παραγγελία δεν εμποδίζει τις υπόλοιπες.
+    :param exchange: ccxt exchange instance
+    :param orders: Τα δεδομένα του orders.json
+    """
+    ladder = orders["LADDER"]
+    lots = orders["ORDERS"]
+    now = int(datetime.utcnow().timestamp() * 1000)
+
+    # Πωλήσεις για θέσεις που δεν υπάρχουν πλέον στο ORDERS
+    for price in list(ladder["SELLS"].keys()):
+        if price not in lots and cancel_ladder_order(exchange, ladder["SELLS"][price], "SELL"):
+            del ladder["SELLS"][price]
+            save_ladder(ladder)
+
+    # Ακύρωση της αγοράς αν δεν χρειάζεται πλέον ή αν το επίπεδο άλλαξε (νέα αγορά ή πώληση), πριν από τις
+    # πωλήσεις, ώστε μια μερική εκτέλεσή της να πάρει κι αυτή limit πώληση
+    buy = ladder.get("BUY")
+    if buy and (not lots or len(lots) >= MAX_ORDERS or buy["price"] != next_ladder_price(exchange, lots)):
+        cancel_ladder_buy(exchange, orders)
+
+    # Μία limit πώληση ανά θέση
+    for price, order in lots.items():
+        if price in ladder["SELLS"]:
+            continue
+        sell_threshold = float(exchange.price_to_precision(PAIR, float(price) * (1 + PERCENTAGE_RISE / 100)))
+        amount = float(exchange.amount_to_precision(PAIR, order['amount']))
+        try:
+            sell_order = exchange.create_limit_sell_order(PAIR, amount, sell_threshold)
+        except ccxt.BaseError as e:
+            logging.error(f"[LADDER] Failed to place the resting SELL for order ID {order['id']}: {e}")
+            continue
+        ladder["SELLS"][price] = {"id": sell_order['id'], "price": sell_threshold, "amount": amount,
+                                  "timestamp": sell_order.get('timestamp') or now}
+        save_ladder(ladder)
+        logging.info(f"[LADDER] Resting SELL {amount} {CRYPTO_SYMBOL} at {sell_threshold:.4f} for order ID {order['id']}.")
+
+    # Limit αγορά στο επόμενο επίπεδο
+    if not lots or len(lots) >= MAX_ORDERS:
+        if lots:
+            logging.warning(f"Maximum order limit reached ({MAX_ORDERS}). No resting buy will be placed.")
+    else:
+        next_buy_price = next_ladder_price(exchange, lots)
+
+        if not ladder.get("BUY"):
+            try:
+                buy_order = exchange.create_limit_buy_order(PAIR, TRADE_AMOUNT, next_buy_price)
+            except ccxt.BaseError as e:
+                # Π.χ. InsufficientFunds: οι πωλήσεις παραμένουν, η αγορά θα ξαναδοκιμαστεί στο επόμενο run
+                logging.error(f"[LADDER] Failed to place the resting BUY at {next_buy_price:.4f} {CRYPTO_CURRENCY}: {e}")
+            else:
+                ladder["BUY"] = {"id": buy_order['id'], "price": next_buy_price, "amount": TRADE_AMOUNT,
+                                 "timestamp": buy_order.get('timestamp') or now}
+                save_ladder(ladder)
+                logging.info(f"[LADDER] Resting BUY {TRADE_AMOUNT} {CRYPTO_SYMBOL} at {next_buy_price:.4f} {CRYPTO_CURRENCY}.")
+
+    save_ladder(ladder)
+
+
+
+
 
 
 # Main trading function
@@ -484,8 +1548,7 @@ def run_dca_bot():
     
     iteration_start = time.time()    
     
-    # Initialize Exchange and load orders
-    exchange = initialize_exchange()
+    # Load orders
     orders = load_or_initialize_orders()
     meta = orders["META"]
        
@@ -502,22 +1565,35 @@ def run_dca_bot():
     logging.info(f"Total Profit Earned: {profit:.2f} {CRYPTO_CURRENCY}.")
     logging.info(f"Total Sales Completed: {sales} transactions.")   
     
-    
-    # Fetch the initial price
-    last_price = float(exchange.fetch_ticker(PAIR)['last'])
-    logging.debug(f"Starting price: {last_price}")    
-
-    
+    current_price = None
+    health = dca_live_state.HEALTH_ERROR
     
     try:
+        # Initialize Exchange (μέσα στο try, ώστε ένα σφάλμα δικτύου να δημοσιεύει health "error")
+        exchange = initialize_exchange()
+
+        # Fetch the initial price
+        last_price = float(exchange.fetch_ticker(PAIR)['last'])
+        logging.debug(f"Starting price: {last_price}")    
+        current_price = last_price
               
         # Fetch the current price
         current_price = float(exchange.fetch_ticker(PAIR)['last'])
         logging.info(f"Current price: {current_price} {CRYPTO_CURRENCY}")
-        
-        
-        # Κλήση rebalance πριν το αρχικό buy
-        if ENABLE_CHECK_BALANCE:
+
+
+        # Συμφωνία του ledger με τα fills του exchange (ανάκαμψη από crash μεταξύ παραγγελίας και αποθήκευσης)
+        if RECOVERY["ENABLED"]:
+            recover_ledger(exchange, orders)
+
+
+        # Limit mode: συμφωνία των fills των resting orders πριν από οτιδήποτε άλλο
+        if EXECUTION_MODE == "limit":
+            reconcile_limit_fills(exchange, orders)
+
+
+        # Κλήση rebalance πριν το αρχικό buy (σε limit mode μόνο αν δεν υπάρχει ήδη resting αγορά που δεσμεύει κεφάλαιο)
+        if ENABLE_CHECK_BALANCE and not (EXECUTION_MODE == "limit" and orders["LADDER"].get("BUY")):
             balance_currencies(exchange, PAIR, target_balance=TARGET_BALANCE)           
         
 
@@ -559,31 +1635,37 @@ def run_dca_bot():
                 # Executing buy logic...
                 logging.info(f"Executing buy logic for for {PAIR}...")
                 
-                # Fetch historical data and calculate indicators
-                df = fetch_ohlcv(exchange, symbol=PAIR, timeframe='1h', limit=100)
-                df['ema_fast'] = ema(df['close'], period=9)
-                df['ema_slow'] = ema(df['close'], period=21)
-                df['rsi'] = rsi(df['close'], period=14)
-                support_levels = find_support_levels(df['low'], window=5)
-
-                # Current price and conditions
-                current_price = df['close'].iloc[-1]
-                recent_high = df['close'].rolling(window=20).max().iloc[-1]
-
-                # Check price drop and threshold
-                price_drop, meets_threshold = price_dropped_percent(current_price, recent_high)
-
-                # Logging key metrics
-                logging.info(
-                    f"Current price: {current_price:.4f}, Recent high: {recent_high:.4f}, "
-                    f"Price drop: {price_drop:.4f}%, Threshold: {PERCENTAGE_DROP:.2f}%."
-                )
-                logging.info(f"Identified support levels: {support_levels}")
+                if SIGNALS["ENABLED"]:
+                    # Multi-timeframe σήμα από μία βασική ροή κεριών
+                    buy_signal, current_price = evaluate_entry_signal(exchange, current_price)
+                else:
+                    # Fetch historical data and calculate indicators
+                    df = fetch_ohlcv(exchange, symbol=PAIR, timeframe='1h', limit=100)
+                    df['ema_fast'] = ema(df['close'], period=9)
+                    df['ema_slow'] = ema(df['close'], period=21)
+                    df['rsi'] = rsi(df['close'], period=14)
+                    support_levels = find_support_levels(df, timeframe='1h')
+
+                    # Current price and conditions
+                    current_price = df['close'].iloc[-1]
+                    recent_high = df['close'].rolling(window=20).max().iloc[-1]
+
+                    # Check price drop and threshold
+                    price_drop, meets_threshold = price_dropped_percent(current_price, recent_high)
+
+                    # Logging key metrics
+                    logging.info(
+                        f"Current price: {current_price:.4f}, Recent high: {recent_high:.4f}, "
+                        f"Price drop: {price_drop:.4f}%, Threshold: {PERCENTAGE_DROP:.2f}%."
+                    )
+                    logging.info(f"Identified support levels: {support_levels}")
+
+                    buy_signal = meets_threshold and near_support_level(current_price, support_levels, tolerance=support_tolerance(current_price, '1h'))
 
                 # Check conditions for initial buy
-                if meets_threshold and near_support_level(current_price, support_levels, tolerance=50):
+                if buy_signal:
                     # Execute market buy
-                    order = exchange.create_market_buy_order(PAIR, TRADE_AMOUNT)
+                    order, venue = place_market_order(exchange, "buy", TRADE_AMOUNT)
 
                     logging.info(
                         f"Bought {TRADE_AMOUNT} {CRYPTO_SYMBOL} at {current_price:.4f} {CRYPTO_CURRENCY}. "
@@ -596,23 +1678,14 @@ def run_dca_bot():
                     )
 
                     # Record the order
-                    order_data = {
-                        "id": order['id'],
-                        "symbol": PAIR,
-                        "price": current_price,
-                        "side": "buy",
-                        "status": "open",
-                        "amount": TRADE_AMOUNT,
-                        "remaining": TRADE_AMOUNT,
-                        "datetime": order['datetime'] if order.get("datetime") else datetime.utcnow().isoformat() + "Z",
-                        "timestamp": order['timestamp'] if order.get("timestamp") else int(datetime.utcnow().timestamp() * 1000)
-                    }
+                    order_data = build_order_record(order, current_price, TRADE_AMOUNT, venue)
 
                     # Ενημέρωση και αποθήκευση του ORDERS
                     if "ORDERS" not in orders:
                         orders["ORDERS"] = {}
                     orders["ORDERS"][str(current_price)] = order_data
                     save_orders({"ORDERS": orders["ORDERS"]}, save_meta=False)
+                    dca_recovery.clear_intent(order["clientOrderId"])
 
                 else:
                     logging.info(
@@ -626,108 +1699,36 @@ def run_dca_bot():
 
 
                 
-        # Buy more if price drops below percentage_drop
-        if "ORDERS" in orders and orders["ORDERS"]:           
+        # Limit mode: το ladder ζει στο exchange, το loop απλώς το ξαναστήνει
+        if EXECUTION_MODE == "limit":
             try:
-                # Έλεγχος μέγιστων παραγγελιών
-                if len(orders["ORDERS"]) >= MAX_ORDERS:
-                    logging.warning(f"Maximum order limit reached ({MAX_ORDERS}). No more orders will be placed.")
-                    
-                
-                elif current_price <= min(map(float, orders["ORDERS"].keys())) * (1 - PERCENTAGE_DROP / 100):                
-                    # Buy Crypto
-                    order = exchange.create_market_buy_order(PAIR, TRADE_AMOUNT)
-                    
-                    lowest_order_price = min(map(float, orders["ORDERS"].keys()))
-                    logging.info(
-                        f"Bought {TRADE_AMOUNT} {CRYPTO_SYMBOL} at {current_price:.4f} {CRYPTO_CURRENCY}. "
-                        f"Current price {current_price:.4f} {CRYPTO_CURRENCY} dropped by more than {PERCENTAGE_DROP}% "
-                        f"from the lowest order price {lowest_order_price:.4f}."
-                    )
-
-                    # Ενημέρωση χρήστη για αγορά με Push msg
-                    send_push_notification(
-                        f"Bought {TRADE_AMOUNT} {CRYPTO_SYMBOL} at {current_price:.4f} {CRYPTO_CURRENCY}. "
-                        f"Reason: Current price {current_price:.4f} {CRYPTO_CURRENCY} dropped by more than {PERCENTAGE_DROP}% "
-                        f"from the lowest order price {lowest_order_price:.4f}."
-                    )
-
-                    logging.info(
-                        f"Total Orders: {len(orders['ORDERS']) + 1}. Current Portfolio Strategy: Adding to position to reduce cost average."
-                    )
+                arm_limit_ladder(exchange, orders)
+            except ccxt.BaseError as api_error:
+                logging.error(f"Error arming limit ladder: {api_error}")
+                send_push_notification(f"ALERT: Error arming limit ladder: {api_error}")
 
-                    # Καταγραφή της παραγγελίας
-                    order_data = {
-                        "id": order['id'],
-                        "symbol": PAIR,
-                        "price": current_price,
-                        "side": "buy",
-                        "status": "open",
-                        "amount": TRADE_AMOUNT,
-                        "remaining": TRADE_AMOUNT,
-                        "datetime": order['datetime'] if order.get("datetime") else datetime.utcnow().isoformat() + "Z",
-                        "timestamp": order['timestamp'] if order.get("timestamp") else int(datetime.utcnow().timestamp() * 1000)
-                    }
 
-                    # Ενημέρωση και αποθήκευση του ORDERS
-                    orders["ORDERS"][str(current_price)] = order_data
-                    save_orders({"ORDERS": orders["ORDERS"]}, save_meta=False)
-
-            except ccxt.BaseError as api_error:
-                logging.error(f"Error placing buy order: {api_error}")
+        # Buy more if price drops below percentage_drop
+        if EXECUTION_MODE == "market" and "ORDERS" in orders and orders["ORDERS"]:
+            if not buy_more_if_dropped(exchange, orders, current_price):
                 startBot = False
                 return
-                  
-                
 
-        
+
         # Sell evaluation
-        if "ORDERS" in orders and orders["ORDERS"]:
+        if EXECUTION_MODE == "market" and "ORDERS" in orders and orders["ORDERS"]:
             print()
             logging.info(f"{'=' * 20} Sell Threshold Evaluation in {CRYPTO_CURRENCY} {'=' * 20}")
-            for price, order in list(orders["ORDERS"].items()):  # Copy to avoid modifying during iteration
-                sell_threshold = float(price) * (1 + PERCENTAGE_RISE / 100)
-
-                if current_price >= sell_threshold:
-                    # Sell BTC
-                    sell_order = exchange.create_market_sell_order(PAIR, order['amount'])
-                    logging.info(f"Order ID: {order['id']} | Sell Threshold: {sell_threshold:.4f} | Current Price: {current_price:.4f} -> Selling!")
-
-                    # Υπολογισμός κέρδους
-                    buy_price = float(order['price'])  # Η τιμή αγοράς της θέσης
-                    amount = float(order['amount'])   # Το ποσό του crypto που πουλιέται
-                    sell_price = current_price        # Η τρέχουσα τιμή πώλησης
-
-                    total_cost = buy_price * amount   # Συνολικό κόστος αγοράς
-                    total_income = sell_price * amount  # Συνολικό εισόδημα από την πώληση
-                    profit = total_income - total_cost  # Κέρδος
-
-                    # Ενημέρωση του META
-                    orders["META"]["PROFIT"] += profit  # Προσθήκη στο συνολικό κέρδος
-                    orders["META"]["SALES"] += 1        # Αύξηση του αριθμού πωλήσεων
+            evaluate_sells(exchange, orders, current_price)
 
-                    # Καταγραφή του κέρδους
-                    logging.info(f"Profit for order ID {order['id']}: {profit:.4f} {CRYPTO_CURRENCY}. Total Profit: {orders['META']['PROFIT']:.4f}. Total Sales: {orders['META']['SALES']}.")
-                    send_push_notification(
-                        f"Sale executed for order ID {order['id']}. Sold {amount} {PAIR} at {sell_price:.4f}. "
-                        f"Profit: {profit:.4f} {CRYPTO_CURRENCY}. Total Profit: {orders['META']['PROFIT']:.4f}. Total Sales: {orders['META']['SALES']}."
-                    )
-
-                    # Αφαίρεση της παραγγελίας
-                    del orders["ORDERS"][price]
 
-                    # Αποθήκευση του ORDERS και του META ξεχωριστά
-                    save_orders({"ORDERS": orders["ORDERS"]}, save_meta=False)  # Αποθήκευση των παραγγελιών
-                    save_orders({"META": orders["META"]}, save_orders=False)   # Αποθήκευση του META
+        # Καταγραφή του iteration στο time-series store
+        record_tick(orders, current_price)
 
-                else:
-                    logging.info(f"Order ID: {order['id']} | Sell Threshold: {sell_threshold:.4f} | Current Price: {current_price:.4f} -> Not selling.")
-
-                
-                         
         # Μετά την ολοκλήρωση του iteration
         iteration_end = time.time()
         logging.info(f"Loop iteration completed in {iteration_end - iteration_start:.2f} seconds.")
+        health = dca_live_state.HEALTH_OK
 
 
 
@@ -737,6 +1738,167 @@ def run_dca_bot():
     except Exception as e:
         logging.error(f"An error occurred: {e}")
         send_push_notification(f"ALERT: Bot is stopped. An error occurred: {e}")
+    finally:
+        # Δημοσίευση της κατάστασης για το dashboard (και σε περίπτωση σφάλματος)
+        publish_state(orders, current_price, time.time() - iteration_start, health)
+
+
+
+
+def market_data_loop(tick_name, candle_name, tick_interval, stop_event):
+    """
+    Market-data διεργασία: γράφει ticks (και 1m κεριά) στα shared-memory ring buffers.
+    :param tick_name: Όνομα του ring buffer των ticks
+    :param candle_name: Όνομα του ring buffer των κεριών
+    :param tick_interval: Δευτερόλεπτα μεταξύ των ticks
+    :param stop_event: multiprocessing.Event για τερματισμό
+    """
+    # Το Ctrl-C το χειρίζεται η execution διεργασία, που σταματά αυτήν μέσω του stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    ticks = dca_ringbuffer.RingBuffer(dca_ringbuffer.TICK, name=tick_name)
+    candles = dca_ringbuffer.RingBuffer(dca_ringbuffer.CANDLE, name=candle_name)
+    exchange = None
+    last_candle_fetch = 0
+
+    try:
+        while not stop_event.is_set():
+            started = time.time()
+            try:
+                if exchange is None:
+                    exchange = initialize_exchange()
+                ticker = exchange.fetch_ticker(PAIR)
+                last = float(ticker['last'])
+                ticks.append(ticker.get('timestamp') or int(started * 1000), last,
+                             float(ticker.get('bid') or last), float(ticker.get('ask') or last))
+
+                if started - last_candle_fetch >= 30:
+                    for candle in exchange.fetch_ohlcv(PAIR, '1m', limit=3):
+                        candles.append(int(candle[0]), *(float(value or 0) for value in candle[1:6]))
+                    last_candle_fetch = started
+            except ccxt.BaseError as e:
+                logging.warning(f"[MARKET DATA] {e}")
+
+            stop_event.wait(max(tick_interval - (time.time() - started), 0))
+    finally:
+        ticks.close()
+        candles.close()
+
+
+
+
+def run_split_runtime(interval=120, tick_interval=1.0):
+    """
+    Split runtime: μια market-data διεργασία γράφει ticks και κεριά σε shared-memory ring buffers και αυτή η
+    διεργασία (execution) αξιολογεί το ladder και τα sell thresholds σε κάθε νέο tick. Η αποθήκευση και οι
+    ειδοποιήσεις γίνονται ασύγχρονα, ενώ το πλήρες iteration (rebalance, αρχική αγορά, αναφορά) τρέχει κάθε `interval`.
+    """
+    if EXECUTION_MODE != "market":
+        raise ValueError("The split runtime evaluates thresholds on every tick and requires EXECUTION_MODE 'market'.")
+    if dca_cassette.active() is not None:
+        raise ValueError("Cassette record/replay is not supported by the split runtime. Use --daemon instead.")
+
+    ticks = dca_ringbuffer.RingBuffer(dca_ringbuffer.TICK, create=True)
+    candles = dca_ringbuffer.RingBuffer(dca_ringbuffer.CANDLE, create=True)
+    _ring_candles["buffer"] = candles
+
+    stop_event = multiprocessing.Event()
+    feeder = multiprocessing.Process(target=market_data_loop, name="dca-market-data",
+                                     args=(ticks.name, candles.name, tick_interval, stop_event), daemon=True)
+    feeder.start()
+    _io_executor["executor"] = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dca-io")
+    logging.info(f"Split runtime started: market-data process PID {feeder.pid}, tick interval {tick_interval}s.")
+
+    exchange = None
+    orders = None
+    next_iteration = 0
+    last_index = None
+    paused = False  # Μετά από αποτυχία, καμία παραγγελία από τη γρήγορη διαδρομή μέχρι το επόμενο πλήρες iteration
+
+    try:
+        while True:
+            if not feeder.is_alive():
+                raise RuntimeError("The market-data process has exited.")
+
+            # Πλήρες iteration (αργή διαδρομή). Ένα σφάλμα εδώ δεν τερματίζει το runtime, ξαναδοκιμάζεται στο επόμενο interval
+            if time.time() >= next_iteration:
+                try:
+                    flush_dispatch()
+                    dca_profiling.profile_call("iteration", run_dca_bot)
+                    flush_dispatch()
+                    orders = load_or_initialize_orders()
+                    paused = False
+                except Exception as e:
+                    logging.error(f"An error occurred during the full iteration: {e}")
+                finally:
+                    next_iteration = time.time() + interval
+
+            latest = ticks.latest()
+            if orders is None or latest is None or latest[0] == last_index:
+                time.sleep(min(tick_interval / 4, 0.25))
+                continue
+
+            # Γρήγορη διαδρομή: ladder και sell thresholds στο τελευταίο tick
+            tick_started = time.time()
+            last_index, (timestamp, current_price, bid, ask) = latest
+            try:
+                if exchange is None:
+                    exchange = initialize_exchange()
+                if orders["ORDERS"] and not paused:
+                    if buy_more_if_dropped(exchange, orders, current_price, verbose=False):
+                        evaluate_sells(exchange, orders, current_price, verbose=False)
+                    else:
+                        # Π.χ. ανεπαρκές υπόλοιπο: όχι νέα παραγγελία (και intent) σε κάθε tick
+                        paused = True
+                        logging.warning("Buy failed on the fast path. Tick orders are paused until the next full iteration.")
+                publish_state(orders, current_price, time.time() - tick_started,
+                              dca_live_state.HEALTH_ERROR if paused else dca_live_state.HEALTH_OK)
+            except Exception as e:
+                paused = True
+                logging.error(f"An error occurred while evaluating tick at {current_price}: {e}. "
+                              f"Tick orders are paused until the next full iteration.")
+                dispatch(send_push_notification, f"ALERT: Error while evaluating tick: {e}")
+                publish_state(orders, current_price, time.time() - tick_started, dca_live_state.HEALTH_ERROR)
+                time.sleep(tick_interval)
+
+    except KeyboardInterrupt:
+        logging.info("Bot operation was interrupted by user.")
+    finally:
+        stop_event.set()
+        feeder.join(timeout=5)
+        _io_executor["executor"].shutdown(wait=True)
+        _io_executor["executor"] = None
+        _ring_candles["buffer"] = None
+        ticks.close()
+        candles.close()
+
+
+
 
 if __name__ == "__main__":
-    run_dca_bot()
+    parser = argparse.ArgumentParser(description=f"{PAIR} DCA Trading bot")
+    parser.add_argument("--daemon", action="store_true", help="Run continuously instead of a single iteration.")
+    parser.add_argument("--interval", type=int, default=120, help="Seconds between iterations in daemon mode (default: 120).")
+    parser.add_argument("--split", action="store_true",
+                        help="Run separate market-data and execution processes linked by a shared-memory ring buffer.")
+    parser.add_argument("--tick-interval", type=float, default=1.0, help="Seconds between ticks in split mode (default: 1).")
+    args = parser.parse_args()
+
+    # SIGUSR1: profiling για τα επόμενα iterations
+    dca_profiling.install_signal_handler()
+
+    if args.split:
+        run_split_runtime(interval=args.interval, tick_interval=args.tick_interval)
+    elif args.daemon:
+        try:
+            while True:
+                # Ένα σφάλμα σε ένα iteration δεν τερματίζει τον daemon
+                try:
+                    dca_profiling.profile_call("iteration", run_dca_bot)
+                except Exception as e:
+                    logging.error(f"An error occurred during the iteration: {e}")
+                wait_for_next_signal(args.interval)
+        except KeyboardInterrupt:
+            logging.info("Bot operation was interrupted by user.")
+    else:
+        dca_profiling.profile_call("iteration", run_dca_bot)
@@ -0,0 +1,127 @@
+"""
+Load test for the dashboard: concurrent keep-alive clients against a running server, with the throughput and
+the latency percentiles of every endpoint.
+
+    python dca-app-excel.py --workers 4 --threads 8
+    python dca-loadtest.py --concurrency 32 --duration 20
+    python dca-loadtest.py --url http://127.0.0.1:5014 --endpoint /DCA/current_price --json
+
+For reproducible numbers serve the dashboard from a cassette (python dca-replay.py dashboard <cassette> --serve PORT).
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+import dca_cassette
+
+
+DEFAULT_ENDPOINTS = (
+    "/DCA/current_price",
+    "/DCA/existing_orders",
+    "/DCA/sell_threshold_eval",
+    "/DCA/timeseries",
+    "/DCA/analytics/summary",
+    "/DCA/analytics/profit/daily",
+    "/DCA/live_state",
+    "/DCA/projection",
+)
+
+
+
+def client_loop(url, endpoint, deadline, timeout, results):
+    """
+    Requests σε ένα endpoint μέσα από μία keep-alive σύνδεση μέχρι το `deadline`.
+    :param results: Λίστα όπου προστίθενται tuples (διάρκεια σε δευτερόλεπτα, HTTP status ή όνομα εξαίρεσης)
+    """
+    parts = urlsplit(url)
+    connection_class = http.client.HTTPSConnection if parts.scheme == "https" else http.client.HTTPConnection
+    connection = None
+    while time.time() < deadline:
+        if connection is None:
+            connection = connection_class(parts.hostname, parts.port, timeout=timeout)
+        started = time.time()
+        try:
+            connection.request("GET", endpoint)
+            response = connection.getresponse()
+            response.read()
+            status = response.status
+            if response.will_close:
+                connection.close()
+                connection = None
+        except (OSError, http.client.HTTPException) as e:
+            status = type(e).__name__
+            connection.close()
+            connection = None
+        results.append((time.time() - started, status))
+    if connection is not None:
+        connection.close()
+
+
+
+def endpoint_report(results, elapsed):
+    durations = sorted(duration for duration, status in results)
+    statuses = {}
+    for _, status in results:
+        statuses[str(status)] = statuses.get(str(status), 0) + 1
+    return {
+        "requests": len(durations),
+        "rps": round(len(durations) / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": round(dca_cassette.percentile(durations, 0.5) * 1000, 2) if durations else None,
+        "p99_ms": round(dca_cassette.percentile(durations, 0.99) * 1000, 2) if durations else None,
+        "max_ms": round(durations[-1] * 1000, 2) if durations else None,
+        "errors": sum(count for status, count in statuses.items() if not status.startswith("2")),
+        "statuses": statuses,
+    }
+
+
+
+def run_load_test(url, endpoints, concurrency, duration, timeout):
+    """
+    Φόρτος σε όλα τα endpoints ταυτόχρονα (κάθε endpoint με `concurrency` clients), ώστε ένα αργό endpoint να
+    φαίνεται και στις καθυστερήσεις των υπολοίπων.
+    :return: Dictionary endpoint -> αναφορά (requests, rps, p50/p99/max ms, errors, statuses)
+    """
+    deadline = time.time() + duration
+    results = {endpoint: [] for endpoint in endpoints}
+    threads = [
+        threading.Thread(target=client_loop, args=(url, endpoint, deadline, timeout, results[endpoint]), daemon=True)
+        for endpoint in endpoints for _ in range(concurrency)
+    ]
+    started = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - started
+    return {endpoint: endpoint_report(results[endpoint], elapsed) for endpoint in endpoints}
+
+
+
+def print_table(report):
+    print(f"{'endpoint':<32} {'requests':>9} {'rps':>8} {'p50 ms':>9} {'p99 ms':>9} {'max ms':>9} {'errors':>7}")
+    for endpoint, row in report.items():
+        print(f"{endpoint:<32} {row['requests']:>9} {row['rps'] or 0:>8} {row['p50_ms'] or 0:>9} "
+              f"{row['p99_ms'] or 0:>9} {row['max_ms'] or 0:>9} {row['errors']:>7}")
+
+
+
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test for the DCA dashboard")
+    parser.add_argument("--url", default="http://127.0.0.1:5014", help="Dashboard base URL (default: http://127.0.0.1:5014).")
+    parser.add_argument("--endpoint", action="append", help="Endpoint to load (repeatable, default: all /DCA/* GET endpoints).")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients per endpoint (default: 8).")
+    parser.add_argument("--duration", type=float, default=10, help="Seconds of load (default: 10).")
+    parser.add_argument("--timeout", type=float, default=30, help="Client timeout per request in seconds (default: 30).")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON.")
+    args = parser.parse_args()
+
+    report = run_load_test(args.url.rstrip("/"), args.endpoint or DEFAULT_ENDPOINTS, args.concurrency, args.duration, args.timeout)
+    if args.json:
+        print(json.dumps({"url": args.url, "concurrency": args.concurrency, "duration": args.duration, "endpoints": report}, indent=4))
+    else:
+        print_table(report)
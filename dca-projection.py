@@ -0,0 +1,96 @@
+"""
+Capital projection for the buy ladder of the DCA bot.
+
+    python dca-projection.py ladder
+    python dca-projection.py montecarlo --paths 10000 --horizon-days 30
+    python dca-projection.py montecarlo --price 60000 --quote 1500 --base 0.05 --volatility 0.04
+
+The lots come from orders.json and the ladder parameters from TRADE_CONFIG. The current price and the free
+balances are fetched from the exchange unless given with --price, --quote and --base. Monte Carlo settings
+default to the PROJECTION section of config.json (see dca_projection.py).
+"""
+import argparse
+import importlib.util
+import json
+import os
+import time
+
+import dca_projection
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_script(filename, module_name):
+    """Φόρτωση ενός από τα scripts του repo (τα ονόματά τους δεν είναι έγκυρα module names)."""
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(BASE_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def project(args):
+    """Προβολή του ladder (και Monte Carlo για την εντολή montecarlo) με τις ρυθμίσεις του bot."""
+    bot = load_script("dca-bot.py", "dca_bot")
+    settings = dict(dca_projection.DEFAULTS)
+    settings.update(bot.load_config_section("PROJECTION"))
+
+    # Τιμή και υπόλοιπα από το exchange, εκτός αν δόθηκαν
+    exchange = None
+    if args.price is None or args.quote is None or args.base is None:
+        exchange = bot.initialize_exchange()
+    current_price = args.price if args.price is not None else float(exchange.fetch_ticker(bot.PAIR)['last'])
+    if args.quote is None or args.base is None:
+        balance = exchange.fetch_balance()
+        free_base, free_quote = float(balance[bot.CRYPTO_SYMBOL]['free']), float(balance[bot.CRYPTO_CURRENCY]['free'])
+    free_base = args.base if args.base is not None else free_base
+    free_quote = args.quote if args.quote is not None else free_quote
+
+    started = time.time()
+    ladder = dca_projection.project_ladder(
+        bot.load_or_initialize_orders()["ORDERS"], current_price, free_quote, free_base,
+        bot.PERCENTAGE_DROP, bot.PERCENTAGE_RISE, bot.TRADE_AMOUNT, bot.MAX_ORDERS,
+        fee=settings["FEE"], fee_buffer=settings["FEE_BUFFER"],
+        rebalance=dca_projection.rebalance_enabled(settings, {"CHECK_BALANCE": bot.ENABLE_CHECK_BALANCE}),
+    )
+    report = {"pair": bot.PAIR, "current_price": current_price, "ladder": ladder,
+              "elapsed_ms": round((time.time() - started) * 1000, 2)}
+
+    if args.command == "montecarlo":
+        volatility = args.volatility if args.volatility is not None else settings["VOLATILITY"]
+        if volatility is None:
+            volatility = dca_projection.recent_volatility() or settings["DEFAULT_VOLATILITY"]
+        report["monte_carlo"] = dca_projection.monte_carlo(
+            ladder, current_price,
+            horizon_days=args.horizon_days or settings["HORIZON_DAYS"],
+            step_minutes=args.step_minutes or settings["STEP_MINUTES"],
+            paths=args.paths or settings["PATHS"],
+            volatility=volatility,
+            drift=args.drift if args.drift is not None else settings["DRIFT"],
+            workers=args.workers if args.workers is not None else settings["WORKERS"],
+            seed=args.seed if args.seed is not None else settings["SEED"],
+        )
+
+    print(json.dumps(report, indent=4))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Capital projection for the DCA buy ladder")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("ladder", "Project the remaining ladder, its required capital and break-even prices."),
+                            ("montecarlo", "Estimate the probability of running out of funds within a horizon.")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("--price", type=float, help="Current price (default: fetched from the exchange).")
+        command.add_argument("--quote", type=float, help="Free quote balance (default: fetched from the exchange).")
+        command.add_argument("--base", type=float, help="Free base balance, open lots included (default: fetched from the exchange).")
+        if name == "montecarlo":
+            command.add_argument("--paths", type=int, help="Simulated price paths (default: PROJECTION.PATHS).")
+            command.add_argument("--horizon-days", type=float, help="Horizon in days (default: PROJECTION.HORIZON_DAYS).")
+            command.add_argument("--step-minutes", type=float, help="Minutes per simulated step (default: PROJECTION.STEP_MINUTES).")
+            command.add_argument("--volatility", type=float, help="Daily volatility of the log price (default: estimated from timeseries.bin).")
+            command.add_argument("--drift", type=float, help="Daily mean log return (default: PROJECTION.DRIFT).")
+            command.add_argument("--workers", type=int, help="Worker processes, 0 = one per CPU (default: PROJECTION.WORKERS).")
+            command.add_argument("--seed", type=int, help="Random seed for reproducible runs.")
+
+    project(parser.parse_args())
@@ -0,0 +1,243 @@
+"""
+Record/replay driver for reproducible performance runs of the DCA bot and the dashboard.
+
+    python dca-replay.py record-sim sim.cassette --iterations 200 --step 60
+    python dca-replay.py bot sim.cassette --speed 0
+    python dca-replay.py dashboard dashboard.cassette --requests 500
+    python dca-replay.py dashboard dashboard.cassette --speed 1 --serve 5014
+    python dca-replay.py info sim.cassette
+
+Live processes are recorded with DCA_RECORD=<cassette> (see dca_cassette.py). Every run uses its own data
+directory (a new temporary one unless --data-dir is given), so replays never touch the live orders.json, and
+starts from an empty ledger (or the --orders file), so the same cassette always produces the same run.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import dca_cassette
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+LIVE_CONFIG_FILE = "/opt/python/dca-bot-bitcoin/config.json"
+
+# Τιμές του config που δεν αποθηκεύονται στην κασέτα
+SECRET_KEYS = ("API_KEY", "API_SECRET", "SENDGRID_API_KEY", "PUSHOVER_TOKEN", "PUSHOVER_USER", "EMAIL_SENDER", "EMAIL_RECIPIENT")
+
+
+def redact_config(config):
+    """Αντίγραφο του config χωρίς κλειδιά API και στοιχεία ειδοποιήσεων (με placeholders, ώστε να φορτώνεται κανονικά)."""
+    config = json.loads(json.dumps(config))
+    for key in SECRET_KEYS:
+        config[key] = "replay"
+    for settings in (config.get("VENUES") or {}).get("EXCHANGES", {}).values():
+        settings.pop("API_KEY", None)
+        settings.pop("API_SECRET", None)
+    return config
+
+
+def prepare_data_dir(args, config):
+    """Δημιουργία του φακέλου δεδομένων του run με το config (και το αρχικό orders.json, αν δόθηκε)."""
+    data_dir = args.data_dir or tempfile.mkdtemp(prefix="dca-replay-")
+    os.makedirs(data_dir, exist_ok=True)
+    with open(os.path.join(data_dir, "config.json"), "w") as f:
+        json.dump(config, f, indent=4)
+    if getattr(args, "orders", None):
+        shutil.copy(args.orders, os.path.join(data_dir, "orders.json"))
+    os.environ["DCA_DATA_DIR"] = data_dir
+    return data_dir
+
+
+def replay_config(args):
+    """Το config του replay: το --config ή αυτό που αποθηκεύτηκε στην κασέτα κατά την καταγραφή."""
+    if args.config:
+        with open(args.config, "r") as f:
+            return redact_config(json.load(f))
+    config = dca_cassette.read_meta(args.cassette).get("config")
+    if config is None:
+        sys.exit(f"The cassette {args.cassette} has no recorded config. Pass the config of the recording with --config.")
+    return config
+
+
+def load_script(filename, module_name):
+    """Φόρτωση ενός από τα scripts του repo (τα ονόματά τους δεν είναι έγκυρα module names)."""
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(BASE_DIR, filename))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def timing_report(durations, elapsed):
+    durations = sorted(durations)
+    return {
+        "count": len(durations),
+        "per_second": round(len(durations) / elapsed, 2) if elapsed > 0 else None,
+        "mean_ms": round(sum(durations) / len(durations) * 1000, 2) if durations else None,
+        "p50_ms": round(dca_cassette.percentile(durations, 0.5) * 1000, 2) if durations else None,
+        "p99_ms": round(dca_cassette.percentile(durations, 0.99) * 1000, 2) if durations else None,
+        "max_ms": round(durations[-1] * 1000, 2) if durations else None,
+    }
+
+
+def record_sim(args):
+    """Καταγραφή του bot απέναντι στον τοπικό simulator, με εικονικό ρολόι που προχωρά `step` δευτερόλεπτα ανά iteration."""
+    with open(args.config or LIVE_CONFIG_FILE, "r") as f:
+        config = redact_config(json.load(f))
+    config["TRADE_CONFIG"]["EXCHANGE_NAME"] = "sim"
+    if args.seed is not None:
+        config.setdefault("SIMULATOR", {})["SEED"] = args.seed
+    venues = config.get("VENUES") or {}
+    if venues.get("ENABLED") and not all(name.startswith("sim") for name in venues.get("EXCHANGES", {})):
+        sys.exit("record-sim only supports simulated venues. Disable VENUES or use only 'sim*' venue names.")
+
+    data_dir = prepare_data_dir(args, config)
+    os.environ["DCA_RECORD"] = args.cassette
+    bot = load_script("dca-bot.py", "dca_bot")
+    bot.ENABLE_PUSH_NOTIFICATIONS = False
+    dca_cassette.active().annotate("config", config)
+
+    # Εικονικό ρολόι κοινό για όλους τους simulators
+    clock = {"now": time.time()}
+    simulators = {"sim": config.get("SIMULATOR") or {}}
+    for name, settings in venues.get("EXCHANGES", {}).items():
+        if name != "sim":
+            simulators[name] = settings.get("SIMULATOR", {})
+    for name, settings in simulators.items():
+        bot._sim_exchanges[name] = bot.dca_sim_exchange.SimExchange({"ID": name, "SYMBOL": bot.PAIR, **settings},
+                                                                    clock=lambda: clock["now"])
+
+    durations = []
+    started = time.time()
+    for _ in range(args.iterations):
+        iteration_start = time.time()
+        bot.run_dca_bot()
+        durations.append(time.time() - iteration_start)
+        clock["now"] += args.step
+    elapsed = time.time() - started
+    bot.flush_dispatch()
+    dca_cassette.active().close()
+
+    print(json.dumps({"cassette": args.cassette, "data_dir": data_dir, "iterations": timing_report(durations, elapsed)}, indent=4))
+
+
+def replay_bot(args):
+    """Αναπαραγωγή του bot από μια κασέτα και αναφορά χρόνων ανά iteration."""
+    data_dir = prepare_data_dir(args, replay_config(args))
+    os.environ["DCA_REPLAY"] = args.cassette
+    os.environ["DCA_REPLAY_SPEED"] = str(args.speed)
+    os.environ["DCA_REPLAY_LATENCY"] = "0" if args.no_latency else "1"
+    bot = load_script("dca-bot.py", "dca_bot")
+    bot.ENABLE_PUSH_NOTIFICATIONS = False
+    player = dca_cassette.active()
+
+    durations = []
+    started = time.time()
+    while not player.exhausted and (not args.iterations or len(durations) < args.iterations):
+        iteration_start = time.time()
+        try:
+            bot.run_dca_bot()
+        except dca_cassette.CassetteExhausted:
+            break
+        if not player.exhausted:
+            durations.append(time.time() - iteration_start)
+    elapsed = time.time() - started
+    bot.flush_dispatch()
+
+    orders = bot.load_or_initialize_orders()
+    print(json.dumps({
+        "cassette": args.cassette,
+        "data_dir": data_dir,
+        "speed": args.speed,
+        "latency": not args.no_latency,
+        "iterations": timing_report(durations, elapsed),
+        "unreplayed_calls": player.remaining(),
+        "open_lots": len(orders["ORDERS"]),
+        "profit": round(orders["META"]["PROFIT"], 4),
+        "sales": orders["META"]["SALES"],
+    }, indent=4))
+
+
+def replay_dashboard(args):
+    """Αναπαραγωγή του dashboard από μια κασέτα: σειριακά requests ανά endpoint ή server (--serve)."""
+    data_dir = prepare_data_dir(args, replay_config(args))
+    os.environ["DCA_REPLAY"] = args.cassette
+    os.environ["DCA_REPLAY_SPEED"] = str(args.speed)
+    os.environ["DCA_REPLAY_LATENCY"] = "0" if args.no_latency else "1"
+    os.environ["DCA_REPLAY_LOOP"] = "1"  # Τα requests είναι read-only: η κασέτα επαναλαμβάνεται όσο χρειάζεται
+    dashboard = load_script("dca-app-excel.py", "dca_app_excel")
+
+    if args.serve:
+        print(f"Serving the dashboard from {args.cassette} (data dir {data_dir}) on port {args.serve}.")
+        dashboard.serve(dashboard.app, "0.0.0.0", args.serve, workers=args.workers, threads=args.threads)
+        return
+
+    endpoints = args.endpoint or sorted(
+        rule.rule for rule in dashboard.app.url_map.iter_rules()
+        if rule.rule.startswith("/DCA/") and not rule.arguments and "GET" in rule.methods
+    )
+    client = dashboard.app.test_client()
+    report = {}
+    for endpoint in endpoints:
+        durations, statuses = [], {}
+        started = time.time()
+        for _ in range(args.requests):
+            request_start = time.time()
+            status = client.get(endpoint).status_code
+            durations.append(time.time() - request_start)
+            statuses[status] = statuses.get(status, 0) + 1
+        report[endpoint] = {**timing_report(durations, time.time() - started), "statuses": statuses}
+
+    print(json.dumps({"cassette": args.cassette, "data_dir": data_dir, "speed": args.speed,
+                      "latency": not args.no_latency, "endpoints": report}, indent=4))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record/replay driver for the DCA bot and dashboard")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record-sim", help="Record the bot running against the local simulated exchange.")
+    record.add_argument("cassette")
+    record.add_argument("--iterations", type=int, default=100, help="Bot iterations to record (default: 100).")
+    record.add_argument("--step", type=float, default=60, help="Simulated seconds between iterations (default: 60).")
+    record.add_argument("--seed", type=int, help="Overrides SIMULATOR.SEED.")
+    record.add_argument("--config", help=f"Config to start from (default: {LIVE_CONFIG_FILE}).")
+    record.add_argument("--data-dir", help="Data directory of the run (default: a new temporary directory).")
+    record.add_argument("--orders", help="Initial orders.json (default: empty ledger).")
+
+    for name, help_text in (("bot", "Replay the bot from a cassette."), ("dashboard", "Replay the dashboard from a cassette.")):
+        command = commands.add_parser(name, help=help_text)
+        command.add_argument("cassette")
+        command.add_argument("--speed", type=float, default=0,
+                             help="0 = skip the idle time between calls (default), 1 = recorded timings, 2 = twice as fast, ...")
+        command.add_argument("--no-latency", action="store_true",
+                             help="With --speed 0, answer calls instantly instead of after their recorded latency. "
+                                  "Latency-dependent decisions (venue latency budget) may then differ from the recording.")
+        command.add_argument("--config", help="Config of the recording (default: the one stored in the cassette).")
+        command.add_argument("--data-dir", help="Data directory of the run (default: a new temporary directory).")
+        command.add_argument("--orders", help="Initial orders.json (default: empty ledger).")
+        if name == "bot":
+            command.add_argument("--iterations", type=int, default=0, help="Stop after N iterations (default: until the cassette ends).")
+        else:
+            command.add_argument("--requests", type=int, default=100, help="Requests per endpoint (default: 100).")
+            command.add_argument("--endpoint", action="append", help="Endpoint to request (repeatable, default: all /DCA/* GET endpoints).")
+            command.add_argument("--serve", type=int, metavar="PORT", help="Serve the dashboard on PORT instead of measuring it.")
+            command.add_argument("--workers", type=int, default=1, help="Worker processes with --serve (default: 1).")
+            command.add_argument("--threads", type=int, default=8, help="Threads per worker with --serve (default: 8).")
+
+    info = commands.add_parser("info", help="Summarize the calls and latencies of a cassette.")
+    info.add_argument("cassette")
+
+    args = parser.parse_args()
+    if args.command == "record-sim":
+        record_sim(args)
+    elif args.command == "bot":
+        replay_bot(args)
+    elif args.command == "dashboard":
+        replay_dashboard(args)
+    else:
+        print(json.dumps(dca_cassette.summarize(args.cassette), indent=4))
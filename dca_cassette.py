@@ -0,0 +1,358 @@
+"""
+Record/replay of exchange traffic ("cassettes").
+
+In record mode every exchange call made through a wrapped exchange (tickers, balances, OHLCV, order books,
+orders and trades) is appended to a gzip-compressed JSON-lines cassette together with its start offset and
+latency. In replay mode the same calls are answered from the cassette without any network access, either
+with the recorded call latencies but without the idle time between calls, or paced at the recorded timings
+(optionally scaled), so latency and throughput can be compared on identical market conditions. Keeping
+the latencies keeps decisions that depend on them (e.g. the venue latency budget) identical; they can be
+dropped as well to measure the bot's own overhead. Calls are replayed in recorded order per venue and method; the
+arguments are kept for reference but not matched, because they contain timestamps and random client ids.
+
+The mode is selected with the environment variables DCA_RECORD=<path> or DCA_REPLAY=<path> (with
+DCA_REPLAY_SPEED, DCA_REPLAY_LATENCY and DCA_REPLAY_LOOP) and applies to every exchange created through attach().
+"""
+import atexit
+import gzip
+import json
+import math
+import os
+import threading
+import time
+
+try:
+    import ccxt
+except ImportError:  # Το replay δεν απαιτεί το ccxt
+    ccxt = None
+
+
+FORMAT_VERSION = 1
+
+# Οι κλήσεις του ccxt API που καταγράφονται
+RECORDED_METHODS = (
+    "load_markets", "fetch_ticker", "fetch_balance", "fetch_ohlcv", "fetch_order_book",
+    "create_market_buy_order", "create_market_sell_order", "create_limit_buy_order", "create_limit_sell_order",
+    "cancel_order", "fetch_order", "fetch_orders", "fetch_open_orders", "fetch_closed_orders", "fetch_canceled_orders", "fetch_my_trades",
+)
+
+TICK_SIZE = 4  # ccxt precisionMode όπου η ακρίβεια είναι βήμα (και όχι πλήθος δεκαδικών)
+
+_active = {"cassette": None}
+_active_lock = threading.Lock()
+
+
+class CassetteExhausted(Exception):
+    """The cassette has no more recorded calls for the requested venue and method."""
+
+
+def _jsonable(value):
+    return json.loads(json.dumps(value, default=str))
+
+
+def _market_summary(market):
+    return {key: value for key, value in (market or {}).items() if key != "info"}
+
+
+class Recorder:
+    """Writes the calls of one process to a cassette file."""
+
+    mode = "record"
+
+    def __init__(self, path):
+        self.path = path
+        self.started = time.time()
+        self.lock = threading.Lock()
+        self.venues = {}
+        self.file = gzip.open(path, "wt", encoding="utf-8")
+        self._write({"type": "header", "version": FORMAT_VERSION, "recorded_at": self.started})
+        atexit.register(self.close)
+
+    def _write(self, entry):
+        self.file.write(json.dumps(entry, separators=(",", ":"), default=str) + "\n")
+
+    def annotate(self, key, value):
+        """Αποθήκευση μεταδεδομένων στην κασέτα (π.χ. το config με το οποίο έγινε η καταγραφή)."""
+        with self.lock:
+            self._write({"type": "meta", "key": key, "value": value})
+
+    def attach(self, venue, exchange):
+        """Το `exchange` τυλιγμένο ώστε οι κλήσεις του να καταγράφονται για το `venue`."""
+        return RecordingExchange(self, venue, exchange)
+
+    def record_venue(self, venue, exchange, symbol=None):
+        """Καταγραφή των στατικών στοιχείων του venue (id, has, precision mode, market του symbol) μία φορά."""
+        with self.lock:
+            known = self.venues.setdefault(venue, set())
+            if None not in known:
+                known.add(None)
+                self._write({"type": "venue", "venue": venue, "id": getattr(exchange, "id", venue),
+                             "has": _jsonable(getattr(exchange, "has", {})),
+                             "precisionMode": getattr(exchange, "precisionMode", None)})
+            markets = getattr(exchange, "markets", None) or {}
+            if symbol and symbol not in known and symbol in markets:
+                known.add(symbol)
+                self._write({"type": "market", "venue": venue, "symbol": symbol, "market": _market_summary(markets[symbol])})
+
+    def record_call(self, venue, method, args, kwargs, started, latency, result=None, error=None):
+        entry = {"type": "call", "venue": venue, "method": method, "t": round(started - self.started, 6),
+                 "latency": round(latency, 6), "args": list(args), "kwargs": kwargs}
+        if error is not None:
+            entry["error"] = {"type": type(error).__name__, "message": str(error)}
+        else:
+            entry["result"] = result
+        with self.lock:
+            if self.file is not None:
+                self._write(entry)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+class RecordingExchange:
+    """Proxy that forwards every attribute to the real exchange and records the ccxt API calls."""
+
+    def __init__(self, recorder, venue, exchange):
+        self._recorder = recorder
+        self._venue = venue
+        self._exchange = exchange
+        recorder.record_venue(venue, exchange)
+
+    def __getattr__(self, name):
+        attribute = getattr(self._exchange, name)
+        if name not in RECORDED_METHODS:
+            return attribute
+
+        def recorded(*args, **kwargs):
+            started = time.time()
+            try:
+                result = attribute(*args, **kwargs)
+            except Exception as e:
+                self._recorder.record_call(self._venue, name, args, kwargs, started, time.time() - started, error=e)
+                raise
+            self._recorder.record_call(self._venue, name, args, kwargs, started, time.time() - started, result=result)
+            if args and isinstance(args[0], str) and "/" in args[0]:
+                self._recorder.record_venue(self._venue, self._exchange, args[0])
+            return result
+
+        return recorded
+
+
+class Player:
+    """Serves the calls of a cassette to ReplayExchange instances."""
+
+    mode = "replay"
+
+    def __init__(self, path, speed=0.0, loop=False, latency=True):
+        """
+        :param path: Το αρχείο της κασέτας
+        :param speed: 0 = χωρίς τον χρόνο αναμονής μεταξύ κλήσεων, 1 = στους χρόνους της καταγραφής, 2 = διπλάσια ταχύτητα κ.λπ.
+        :param loop: Επανάληψη της κασέτας από την αρχή όταν τελειώσουν οι κλήσεις (π.χ. για load tests)
+        :param latency: Με speed 0, κάθε κλήση διαρκεί όσο στην καταγραφή (False = άμεση απάντηση)
+        """
+        self.path = path
+        self.speed = float(speed)
+        self.loop = loop
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.venues = {}
+        self.calls = {}
+        self.meta = {}
+        self.first = None
+        self.duration = 0.0
+        self.started = None
+        self.exhausted = False
+
+        for entry in read_entries(path):
+            if entry["type"] == "venue":
+                self.venues[entry["venue"]] = {"id": entry["id"], "has": entry["has"],
+                                               "precisionMode": entry.get("precisionMode"), "markets": {}}
+            elif entry["type"] == "meta":
+                self.meta[entry["key"]] = entry["value"]
+            elif entry["type"] == "market":
+                self.venues.setdefault(entry["venue"], {"id": entry["venue"], "has": {}, "markets": {}})
+                self.venues[entry["venue"]]["markets"][entry["symbol"]] = entry["market"]
+            elif entry["type"] == "call":
+                self.calls.setdefault((entry["venue"], entry["method"]), []).append(entry)
+                self.first = entry["t"] if self.first is None else min(self.first, entry["t"])
+                self.duration = max(self.duration, entry["t"] + entry["latency"])
+        self.duration -= self.first or 0.0
+        self.positions = {key: 0 for key in self.calls}
+        self.exchanges = {}
+
+    def attach(self, venue, exchange=None):
+        """Το replay exchange του `venue` (ένα ανά venue, ώστε η θέση στην κασέτα να είναι κοινή)."""
+        with self.lock:
+            if venue not in self.exchanges:
+                if venue not in self.venues:
+                    raise CassetteExhausted(f"The cassette {self.path} has no recorded calls for venue '{venue}'.")
+                self.exchanges[venue] = ReplayExchange(self, venue)
+            return self.exchanges[venue]
+
+    def next_call(self, venue, method):
+        """
+        Η επόμενη καταγεγραμμένη κλήση του `method` για το `venue`.
+        :return: Tuple (entry, χρόνος σε δευτερόλεπτα από την αρχή του replay στον οποίο ολοκληρώνεται)
+        """
+        with self.lock:
+            key = (venue, method)
+            entries = self.calls.get(key)
+            if not entries:
+                self.exhausted = True
+                raise CassetteExhausted(f"The cassette {self.path} has no recorded {method} calls for venue '{venue}'.")
+            position = self.positions[key]
+            if position >= len(entries) and not self.loop:
+                self.exhausted = True
+                raise CassetteExhausted(f"All {len(entries)} recorded {method} calls for venue '{venue}' have been replayed.")
+            self.positions[key] = position + 1
+            if self.started is None:
+                self.started = time.time()
+
+        entry = entries[position % len(entries)]
+        offset = (position // len(entries)) * self.duration
+        return entry, offset + entry["t"] - self.first + entry["latency"]
+
+    def remaining(self):
+        """Πλήθος κλήσεων που δεν έχουν αναπαραχθεί ακόμα."""
+        with self.lock:
+            return sum(max(len(entries) - self.positions[key], 0) for key, entries in self.calls.items())
+
+    def close(self):
+        pass
+
+
+def _error_class(name):
+    if ccxt is not None and isinstance(getattr(ccxt, name, None), type):
+        return getattr(ccxt, name)
+    return RuntimeError
+
+
+class ReplayExchange:
+    """ccxt-compatible exchange whose API calls are answered from a cassette."""
+
+    def __init__(self, player, venue):
+        info = player.venues[venue]
+        self._player = player
+        self._venue = venue
+        self.id = info["id"]
+        self.has = info["has"]
+        self.precisionMode = info.get("precisionMode")
+        self.markets = info["markets"]
+
+    def __getattr__(self, name):
+        if name not in RECORDED_METHODS:
+            raise AttributeError(f"'{name}' is not available when replaying a cassette.")
+
+        def replayed(*args, **kwargs):
+            entry, due = self._player.next_call(self._venue, name)
+            if self._player.speed > 0:
+                delay = self._player.started + due / self._player.speed - time.time()
+                if delay > 0:
+                    time.sleep(delay)
+            elif self._player.latency:
+                time.sleep(entry["latency"])
+            if "error" in entry:
+                raise _error_class(entry["error"]["type"])(entry["error"]["message"])
+            return json.loads(json.dumps(entry["result"]))  # Αντίγραφο, ώστε ο caller να μπορεί να το αλλάξει
+
+        return replayed
+
+    def set_sandbox_mode(self, enabled):
+        pass
+
+    def _to_precision(self, symbol, value, field, rounding):
+        step = self.markets[symbol]["precision"].get(field)
+        if step is None:
+            return str(value)
+        if self.precisionMode == TICK_SIZE:
+            decimals = max(-int(math.floor(math.log10(step))), 0)
+            return f"{rounding(value / step) * step:.{decimals}f}"
+        decimals = int(step)
+        return f"{rounding(value * 10 ** decimals) / 10 ** decimals:.{decimals}f}"
+
+    def price_to_precision(self, symbol, price):
+        return self._to_precision(symbol, float(price), "price", round)
+
+    def amount_to_precision(self, symbol, amount):
+        return self._to_precision(symbol, float(amount), "amount", lambda x: math.floor(x + 1e-9))  # Truncate, όπως το ccxt
+
+
+def read_entries(path):
+    """Οι εγγραφές μιας κασέτας (μια ημιτελής τελευταία γραμμή, π.χ. μετά από crash, αγνοείται)."""
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return
+    except EOFError:
+        return
+
+
+def read_meta(path):
+    """Τα μεταδεδομένα (annotate) μιας κασέτας."""
+    return {entry["key"]: entry["value"] for entry in read_entries(path) if entry["type"] == "meta"}
+
+
+def percentile(values, fraction):
+    """Το ποσοστημόριο `fraction` (0-1) μιας ταξινομημένης λίστας (nearest rank)."""
+    return values[min(int(len(values) * fraction), len(values) - 1)] if values else None
+
+
+def summarize(path):
+    """
+    Σύνοψη μιας κασέτας: διάρκεια και, ανά venue και method, πλήθος κλήσεων, σφάλματα και latency (p50/p99).
+    """
+    calls = {}
+    duration = 0.0
+    for entry in read_entries(path):
+        if entry["type"] != "call":
+            continue
+        stats = calls.setdefault(f"{entry['venue']}.{entry['method']}", {"latencies": [], "errors": 0})
+        stats["latencies"].append(entry["latency"])
+        stats["errors"] += "error" in entry
+        duration = max(duration, entry["t"] + entry["latency"])
+
+    summary = {"duration": round(duration, 3), "calls": {}}
+    for name, stats in sorted(calls.items()):
+        latencies = sorted(stats["latencies"])
+        summary["calls"][name] = {
+            "count": len(latencies),
+            "errors": stats["errors"],
+            "p50_ms": round(percentile(latencies, 0.5) * 1000, 2),
+            "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        }
+    return summary
+
+
+def active():
+    """
+    Η κασέτα της διεργασίας σύμφωνα με το DCA_RECORD ή το DCA_REPLAY (DCA_REPLAY_SPEED, DCA_REPLAY_LATENCY, DCA_REPLAY_LOOP).
+    :return: Recorder, Player ή None
+    """
+    with _active_lock:
+        if _active["cassette"] is None:
+            if os.environ.get("DCA_REPLAY"):
+                _active["cassette"] = Player(os.environ["DCA_REPLAY"], float(os.environ.get("DCA_REPLAY_SPEED", 0)),
+                                             os.environ.get("DCA_REPLAY_LOOP", "") not in ("", "0", "false"),
+                                             os.environ.get("DCA_REPLAY_LATENCY", "1") not in ("", "0", "false"))
+            elif os.environ.get("DCA_RECORD"):
+                _active["cassette"] = Recorder(os.environ["DCA_RECORD"])
+        return _active["cassette"]
+
+
+def attach(venue, factory):
+    """
+    Το exchange του `venue` μέσα από την ενεργή κασέτα: καταγραφή των κλήσεων του exchange που δημιουργεί
+    το `factory`, αναπαραγωγή τους χωρίς να κληθεί καθόλου το `factory`, ή το ίδιο το exchange αν δεν υπάρχει κασέτα.
+    """
+    cassette = active()
+    if cassette is None:
+        return factory()
+    if cassette.mode == "replay":
+        return cassette.attach(venue)
+    return cassette.attach(venue, factory())
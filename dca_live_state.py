@@ -0,0 +1,129 @@
+"""
+Live state snapshot shared between the DCA bot and the dashboard.
+
+The bot publishes its latest state into a small memory-mapped file with a fixed binary layout,
+and the dashboard reads it back without any exchange call or JSON parsing.
+Consistency is guaranteed with a seqlock: the writer makes the sequence number odd while it writes
+and even when it is done, and the reader retries until it sees the same even number before and after reading.
+"""
+import mmap
+import os
+import struct
+import time
+
+
+DATA_DIR = os.environ.get("DCA_DATA_DIR", "/opt/python/dca-bot-bitcoin")
+LIVE_STATE_FILE = os.path.join(DATA_DIR, "live_state.bin")
+
+# Μέγιστος αριθμός θέσεων που χωράνε στο snapshot
+MAX_LOTS = 64
+
+HEALTH_UNKNOWN = 0
+HEALTH_OK = 1
+HEALTH_ERROR = 2
+HEALTH_NAMES = {HEALTH_UNKNOWN: "unknown", HEALTH_OK: "ok", HEALTH_ERROR: "error"}
+
+# seq, updated_at, current_price, next_buy_price, iteration_seconds, health, lot_count
+_SEQ = struct.Struct("<Q")
+_HEADER = struct.Struct("<QddddII")
+# buy price, amount, sell threshold
+_LOT = struct.Struct("<ddd")
+SNAPSHOT_SIZE = _HEADER.size + MAX_LOTS * _LOT.size
+
+_maps = {}
+
+
+def _open_map(path, writable):
+    """Return a cached memory map of the snapshot file (created and sized by the writer)."""
+    key = (path, writable)
+    mm = _maps.get(key)
+    if mm is not None and not mm.closed:
+        return mm
+
+    if writable:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if os.fstat(fd).st_size != SNAPSHOT_SIZE:
+                os.ftruncate(fd, SNAPSHOT_SIZE)
+            mm = mmap.mmap(fd, SNAPSHOT_SIZE, access=mmap.ACCESS_WRITE)
+        finally:
+            os.close(fd)
+    else:
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            if os.fstat(fd).st_size < SNAPSHOT_SIZE:
+                return None
+            mm = mmap.mmap(fd, SNAPSHOT_SIZE, access=mmap.ACCESS_READ)
+        finally:
+            os.close(fd)
+
+    _maps[key] = mm
+    return mm
+
+
+def publish_live_state(current_price, next_buy_price, lots, iteration_seconds, health, path=LIVE_STATE_FILE):
+    """
+    Δημοσίευση της τρέχουσας κατάστασης του bot στο κοινόχρηστο snapshot.
+    :param current_price: Τρέχουσα τιμή (ή None)
+    :param next_buy_price: Επόμενο επίπεδο αγοράς (ή None αν δεν υπάρχουν θέσεις)
+    :param lots: Λίστα από tuples (buy_price, amount, sell_threshold)
+    :param iteration_seconds: Διάρκεια του τελευταίου iteration
+    :param health: HEALTH_OK / HEALTH_ERROR
+    :param path: Διαδρομή του αρχείου snapshot
+    """
+    mm = _open_map(path, writable=True)
+    lots = lots[:MAX_LOTS]
+
+    seq = _SEQ.unpack_from(mm, 0)[0]
+    seq = (seq + 1) | 1  # Μονός αριθμός: εγγραφή σε εξέλιξη
+    _SEQ.pack_into(mm, 0, seq)
+
+    _HEADER.pack_into(
+        mm, 0, seq, time.time(),
+        float("nan") if current_price is None else float(current_price),
+        float("nan") if next_buy_price is None else float(next_buy_price),
+        float(iteration_seconds), int(health), len(lots),
+    )
+    for index, lot in enumerate(lots):
+        _LOT.pack_into(mm, _HEADER.size + index * _LOT.size, *map(float, lot))
+
+    _SEQ.pack_into(mm, 0, seq + 1)  # Ζυγός αριθμός: το snapshot είναι συνεπές
+
+
+def read_live_state(path=LIVE_STATE_FILE, retries=1000):
+    """
+    Ανάγνωση του τελευταίου συνεπούς snapshot.
+    :param path: Διαδρομή του αρχείου snapshot
+    :param retries: Μέγιστες προσπάθειες όσο ο writer γράφει
+    :return: Dictionary με την κατάσταση ή None αν δεν έχει δημοσιευτεί ακόμα
+    """
+    try:
+        mm = _open_map(path, writable=False)
+    except FileNotFoundError:
+        return None
+    if mm is None:
+        return None
+
+    for _ in range(retries):
+        seq_before = _SEQ.unpack_from(mm, 0)[0]
+        if seq_before & 1:
+            time.sleep(0)
+            continue
+
+        _, updated_at, current_price, next_buy_price, iteration_seconds, health, lot_count = _HEADER.unpack_from(mm, 0)
+        lot_count = min(lot_count, MAX_LOTS)
+        lots = [_LOT.unpack_from(mm, _HEADER.size + index * _LOT.size) for index in range(lot_count)]
+
+        if _SEQ.unpack_from(mm, 0)[0] == seq_before:
+            if seq_before == 0:
+                return None
+            return {
+                "updated_at": updated_at,
+                "current_price": None if current_price != current_price else current_price,
+                "next_buy_price": None if next_buy_price != next_buy_price else next_buy_price,
+                "iteration_seconds": iteration_seconds,
+                "health": HEALTH_NAMES.get(health, "unknown"),
+                "lots": lots,
+            }
+
+    return None
@@ -0,0 +1,160 @@
+"""
+On-demand profiling for the DCA bot iterations and the dashboard requests.
+
+Profiling is armed for the next N iterations/requests through an environment variable, the PROFILING
+section of config.json or SIGUSR1. Each profiled call writes a cProfile dump (.prof, readable with pstats
+or snakeviz) and a tracemalloc snapshot summary (.mem.txt) to the profile directory, and logs the
+top functions by cumulative time.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import signal
+import threading
+import tracemalloc
+from datetime import datetime
+
+
+DATA_DIR = os.environ.get("DCA_DATA_DIR", "/opt/python/dca-bot-bitcoin")
+PROFILE_DIR = os.path.join(DATA_DIR, "profiles")
+
+_state = {"remaining": 0, "arm_count": 1, "directory": PROFILE_DIR, "top": 20}
+_lock = threading.Lock()
+# Ένα profiling session τη φορά: το tracemalloc και ο profiler είναι καθολικά για τη διεργασία
+_session_lock = threading.Lock()
+
+
+def configure(iterations=0, directory=None, top=None, arm_count=None):
+    """
+    Ρύθμιση του profiling.
+    :param iterations: Πόσα από τα επόμενα iterations/requests θα γίνουν profile
+    :param directory: Φάκελος εξόδου για τα αρχεία profile
+    :param top: Πόσες συναρτήσεις θα καταγραφούν στο log
+    :param arm_count: Πόσα iterations/requests οπλίζει κάθε SIGUSR1
+    """
+    with _lock:
+        _state["remaining"] = max(int(iterations or 0), 0)
+        if directory:
+            _state["directory"] = directory
+        if top:
+            _state["top"] = int(top)
+        if arm_count:
+            _state["arm_count"] = int(arm_count)
+
+
+def configure_from(settings, env_var):
+    """
+    Ρύθμιση από το PROFILING section του config.json, με προτεραιότητα στις μεταβλητές περιβάλλοντος
+    `env_var` (πλήθος) και DCA_PROFILE_DIR (φάκελος).
+    """
+    iterations = os.environ.get(env_var, settings.get("ITERATIONS", 0))
+    configure(
+        iterations=iterations,
+        directory=os.environ.get("DCA_PROFILE_DIR", settings.get("DIR")),
+        top=settings.get("TOP"),
+        arm_count=settings.get("SIGNAL_ITERATIONS"),
+    )
+
+
+def arm(count=None):
+    """Προσθήκη `count` profiled iterations/requests."""
+    with _lock:
+        _state["remaining"] += _state["arm_count"] if count is None else int(count)
+        remaining = _state["remaining"]
+    logging.info(f"[PROFILE] Profiling armed for the next {remaining} call(s).")
+
+
+def install_signal_handler(sig=getattr(signal, "SIGUSR1", None)):
+    """Το σήμα (default SIGUSR1) οπλίζει profiling για τα επόμενα iterations/requests."""
+    if sig is None or threading.current_thread() is not threading.main_thread():
+        return
+    signal.signal(sig, lambda signum, frame: arm())
+
+
+def _take():
+    with _lock:
+        if _state["remaining"] <= 0:
+            return False
+        # Αν τρέχει ήδη session (π.χ. ταυτόχρονο request), η κλήση δεν γίνεται profile και το πλήθος μένει
+        if not _session_lock.acquire(blocking=False):
+            return False
+        _state["remaining"] -= 1
+        return True
+
+
+def start():
+    """
+    Έναρξη profiling αν είναι οπλισμένο.
+    :return: Session για το stop() ή None αν δεν γίνεται profiling
+    """
+    if not _take():
+        return None
+
+    started_tracemalloc = not tracemalloc.is_tracing()
+    try:
+        if started_tracemalloc:
+            tracemalloc.start()
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+    except Exception as e:
+        logging.error(f"[PROFILE] Failed to start profiling: {e}")
+        if started_tracemalloc:
+            tracemalloc.stop()
+        _session_lock.release()
+        return None
+    return {"profiler": profiler, "started_tracemalloc": started_tracemalloc}
+
+
+def stop(session, label):
+    """
+    Τερματισμός profiling, αποθήκευση των αρχείων και καταγραφή σύνοψης στο log.
+    :param session: Η επιστροφή του start() (None = τίποτα)
+    :param label: Όνομα για τα αρχεία εξόδου (π.χ. "iteration" ή το endpoint)
+    """
+    if session is None:
+        return
+
+    profiler = session["profiler"]
+    try:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot() if tracemalloc.is_tracing() else None
+        if session["started_tracemalloc"]:
+            tracemalloc.stop()
+    finally:
+        _session_lock.release()
+
+    try:
+        directory = _state["directory"]
+        os.makedirs(directory, exist_ok=True)
+        safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label).strip("_") or "profile"
+        base = os.path.join(directory, f"{safe_label}-{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}")
+
+        profiler.dump_stats(base + ".prof")
+
+        memory_stats = snapshot.statistics("lineno") if snapshot is not None else []
+        with open(base + ".mem.txt", "w") as f:
+            total = sum(stat.size for stat in memory_stats)
+            f.write(f"Total traced memory: {total / 1024:.1f} KiB\n")
+            for stat in memory_stats[:50]:
+                f.write(f"{stat}\n")
+
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(_state["top"])
+        logging.info(f"[PROFILE] {label}: wrote {base}.prof and {base}.mem.txt")
+        for line in summary.getvalue().splitlines():
+            if line.strip():
+                logging.info(f"[PROFILE] {line}")
+    except Exception as e:
+        logging.error(f"[PROFILE] Failed to write profile for {label}: {e}")
+
+
+def profile_call(label, func, *args, **kwargs):
+    """Εκτέλεση της `func`, με profiling αν είναι οπλισμένο."""
+    session = start()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        stop(session, label)
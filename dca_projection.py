@@ -0,0 +1,288 @@
+"""
+Capital projection for the buy ladder.
+
+The remaining ladder is fully determined by the lowest open lot, PERCENTAGE_DROP, TRADE_AMOUNT and
+MAX_ORDERS, so its prices, costs, cumulative capital and break-even prices are computed as whole numpy
+arrays. The free quote balance funds the rungs first; after that, the rebalance of balance_currencies()
+sells base to cover each deficit, which drains the base held beyond the open lots. The first rung that
+neither can fund is where the capital runs out.
+
+The Monte Carlo estimate simulates log-normal price paths in blocks of steps (vectorized across paths) and
+splits the paths over a process pool. The ladder stays anchored at the current lowest lot, so the number of
+rungs filled on a path is set by its running minimum: sells on rebounds are not assumed to free capital,
+which makes the estimate conservative.
+"""
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import dca_timeseries
+
+
+# Ρυθμίσεις (PROJECTION section του config.json)
+DEFAULTS = {
+    "HORIZON_DAYS": 30,
+    "STEP_MINUTES": 60,
+    "PATHS": 10000,
+    "WORKERS": 0,              # Διεργασίες του Monte Carlo (0 = όσοι πυρήνες)
+    "VOLATILITY": None,        # Ημερήσια μεταβλητότητα log τιμής (None = εκτίμηση από το timeseries.bin)
+    "DEFAULT_VOLATILITY": 0.03,
+    "DRIFT": 0.0,              # Ημερήσια μέση log απόδοση
+    "FEE": 0.001,
+    "FEE_BUFFER": 0.001,       # Περιθώριο του rebalance (όπως στο balance_currencies)
+    "REBALANCE": True,
+    "SEED": None,
+}
+
+BLOCK_STEPS = 128          # Βήματα που παράγονται μαζί (μνήμη: BLOCK_STEPS x paths float32)
+MIN_POOL_PATHS = 2000      # Λιγότερα paths τρέχουν στην ίδια διεργασία
+
+# Process pool ανά διεργασία (δημιουργείται στην πρώτη χρήση και ξανά μετά από fork)
+_pool = {"pid": None, "workers": 0, "executor": None}
+
+
+
+def rebalance_enabled(settings, trade_config):
+    """
+    Αν η προβολή υπολογίζει το rebalance: μόνο όταν είναι ενεργό και στην προβολή (PROJECTION.REBALANCE) και στο
+    bot (TRADE_CONFIG.CHECK_BALANCE), ώστε το dashboard και το CLI να δίνουν το ίδιο αποτέλεσμα.
+    """
+    return bool(settings["REBALANCE"]) and bool(trade_config.get("CHECK_BALANCE", True))
+
+
+
+def ladder_prices(lots, current_price, percentage_drop, max_orders):
+    """
+    Οι τιμές των αγορών που απομένουν μέχρι το MAX_ORDERS.
+    Χωρίς θέσεις, η πρώτη αγορά γίνεται στην τρέχουσα τιμή και οι επόμενες κάτω από αυτήν.
+    :param lots: Το ORDERS του orders.json
+    :return: numpy array με φθίνουσες τιμές
+    """
+    remaining = max(int(max_orders) - len(lots), 0)
+    ratio = 1 - percentage_drop / 100
+    if lots:
+        return min(map(float, lots.keys())) * ratio ** np.arange(1, remaining + 1)
+    return float(current_price) * ratio ** np.arange(remaining)
+
+
+def project_ladder(lots, current_price, free_quote, free_base, percentage_drop, percentage_rise, trade_amount,
+                   max_orders, fee=0.001, fee_buffer=0.001, rebalance=True):
+    """
+    Προβολή του ladder μέχρι το MAX_ORDERS: κόστος και σωρευτικό κεφάλαιο κάθε αγοράς, μέση τιμή και break-even
+    μετά από αυτήν, και η χρηματοδότησή της από το free quote ή από πωλήσεις base του rebalance.
+    :param free_quote: Ελεύθερο υπόλοιπο σε quote (π.χ. USDT)
+    :param free_base: Ελεύθερο υπόλοιπο σε base (π.χ. BTC), μαζί με τις ανοιχτές θέσεις
+    :param rebalance: Αν το rebalance (ENABLE_CHECK_BALANCE) πουλά base για να καλύψει το έλλειμμα
+    :return: Dictionary με τα rungs και τα σύνολα (required_capital, exhaustion_price, base_drained, ...)
+    """
+    prices = ladder_prices(lots, current_price, percentage_drop, max_orders)
+    costs = trade_amount * prices * (1 + fee)
+    cumulative_cost = np.cumsum(costs)
+
+    # Θέσεις μετά από κάθε αγορά: ποσότητα, κόστος και break-even (τιμή πώλησης όλων χωρίς ζημιά μετά το fee)
+    lot_amount = sum(float(lot["amount"]) for lot in lots.values())
+    lot_cost = sum(float(lot["price"]) * float(lot["amount"]) * (1 + fee) for lot in lots.values())
+    total_amount = lot_amount + trade_amount * np.arange(1, len(prices) + 1)
+    total_cost = lot_cost + cumulative_cost
+    average_cost = total_cost / total_amount
+    break_even = total_cost / (total_amount * (1 - fee))
+
+    # Χρηματοδότηση: πρώτα το free quote, μετά πωλήσεις base για κάθε έλλειμμα (όπως το balance_currencies)
+    shortfall = np.maximum(cumulative_cost - free_quote, 0.0)
+    base_sold = np.diff(shortfall, prepend=0.0) * (1 + fee_buffer) / prices
+    base_reserve = max(float(free_base) - lot_amount, 0.0) if rebalance else 0.0
+    cumulative_sold = np.cumsum(base_sold)
+    unfunded = np.flatnonzero(cumulative_sold > base_reserve + 1e-12)
+    exhausted_at = int(unfunded[0]) if len(unfunded) else None
+
+    rungs = [{
+        "rung": len(lots) + i + 1,
+        "price": round(float(prices[i]), 8),
+        "cost": round(float(costs[i]), 8),
+        "cumulative_cost": round(float(cumulative_cost[i]), 8),
+        "average_cost": round(float(average_cost[i]), 8),
+        "break_even": round(float(break_even[i]), 8),
+        "sell_at": round(float(prices[i]) * (1 + percentage_rise / 100), 8),
+        "base_sold": round(float(base_sold[i]), 8),
+        "base_reserve": round(base_reserve - float(cumulative_sold[i]), 8),
+        "funded": exhausted_at is None or i < exhausted_at,
+    } for i in range(len(prices))]
+
+    funded = len(prices) if exhausted_at is None else exhausted_at
+    return {
+        "open_lots": len(lots),
+        "remaining_rungs": len(prices),
+        "next_buy_price": rungs[0]["price"] if rungs else None,
+        "max_orders_price": rungs[-1]["price"] if rungs else None,
+        "required_capital": round(float(cumulative_cost[-1]), 8) if len(prices) else 0.0,
+        "free_quote": float(free_quote),
+        "free_base": float(free_base),
+        "base_reserve": base_reserve,
+        "funded_rungs": funded,
+        "exhaustion_price": rungs[exhausted_at]["price"] if exhausted_at is not None else None,
+        "base_drained": round(float(cumulative_sold[funded - 1]), 8) if funded else 0.0,
+        "break_even": rungs[funded - 1]["break_even"] if funded else (
+            round(lot_cost / (lot_amount * (1 - fee)), 8) if lot_amount else None),
+        "rungs": rungs,
+    }
+
+
+def estimate_volatility(records, min_records=20):
+    """
+    Ημερήσια μεταβλητότητα της log τιμής από τις εγγραφές του timeseries.bin (ανεξάρτητα από το διάστημα
+    μεταξύ των εγγραφών).
+    :return: float ή None αν οι εγγραφές δεν αρκούν
+    """
+    if len(records) < min_records:
+        return None
+    prices = np.asarray(records["price"], dtype=np.float64)
+    days = np.diff(np.asarray(records["timestamp"], dtype=np.float64)) / 86_400_000
+    returns = np.diff(np.log(prices))
+    valid = (days > 0) & np.isfinite(returns)
+    if valid.sum() < min_records - 1:
+        return None
+    return float(math.sqrt(np.sum(returns[valid] ** 2) / np.sum(days[valid])))
+
+
+def recent_volatility(days=30):
+    """Η μεταβλητότητα των τελευταίων `days` ημερών του timeseries.bin (None αν δεν υπάρχει αρκετό ιστορικό)."""
+    records = dca_timeseries.load_records()
+    if len(records) == 0:
+        return None
+    end = int(records["timestamp"][-1])
+    return estimate_volatility(dca_timeseries.select_range(records, end - days * 86_400_000, end))
+
+
+
+def simulate_chunk(seed, paths, steps, drift, volatility, thresholds):
+    """
+    Log-normal διαδρομές τιμής (σε μπλοκ βημάτων, vectorized ως προς τα paths).
+    :param drift: Μέση log απόδοση ανά βήμα
+    :param volatility: Τυπική απόκλιση της log απόδοσης ανά βήμα
+    :param thresholds: log(τιμή / τρέχουσα τιμή) των ορίων για τα οποία ζητείται το πρώτο βήμα που αγγίζονται
+    :return: Tuple (ελάχιστη log τιμή ανά path, array [ορίου, path] με το πλήθος βημάτων μέχρι το όριο ή -1)
+    """
+    rng = np.random.default_rng(seed)
+    level = np.zeros(paths, dtype=np.float32)
+    running_min = np.zeros(paths, dtype=np.float32)
+    first_hit = np.full((len(thresholds), paths), -1, dtype=np.int32)
+    for i, threshold in enumerate(thresholds):
+        if threshold >= 0:
+            first_hit[i] = 0  # Η τιμή είναι ήδη στο όριο
+
+    for start in range(0, steps, BLOCK_STEPS):
+        block = rng.standard_normal((min(BLOCK_STEPS, steps - start), paths), dtype=np.float32)
+        block *= volatility
+        block += drift
+        np.cumsum(block, axis=0, out=block)
+        block += level
+        block_min = block.min(axis=0)
+        for i, threshold in enumerate(thresholds):
+            hit = (first_hit[i] < 0) & (block_min <= threshold)
+            if hit.any():
+                first_hit[i, hit] = start + 1 + np.argmax(block[:, hit] <= threshold, axis=0)
+        np.minimum(running_min, block_min, out=running_min)
+        level = block[-1].copy()
+
+    return running_min, first_hit
+
+
+def get_pool(workers):
+    """Το process pool του Monte Carlo (ένα ανά διεργασία, με forkserver ώστε να είναι ασφαλές από threaded servers)."""
+    if _pool["pid"] != os.getpid() or _pool["workers"] != workers:
+        if _pool["executor"] is not None and _pool["pid"] == os.getpid():
+            _pool["executor"].shutdown(wait=False)
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+        _pool.update(pid=os.getpid(), workers=workers, executor=ProcessPoolExecutor(max_workers=workers, mp_context=context))
+    return _pool["executor"]
+
+
+def warm_pool(workers=0):
+    """Εκκίνηση των διεργασιών του pool χωρίς αναμονή, ώστε το πρώτο Monte Carlo να μην πληρώνει το start-up τους."""
+    workers = workers or os.cpu_count() or 1
+    if workers > 1:
+        pool = get_pool(workers)
+        for _ in range(workers):
+            pool.submit(math.sqrt, 0)
+
+
+def summarize_days(values):
+    if len(values) == 0:
+        return None
+    p10, p50, p90 = np.percentile(values, [10, 50, 90])
+    return {"p10": round(float(p10), 2), "p50": round(float(p50), 2), "p90": round(float(p90), 2)}
+
+
+def monte_carlo(projection, current_price, horizon_days=30, step_minutes=60, paths=10000, volatility=0.03,
+                drift=0.0, workers=0, seed=None):
+    """
+    Πιθανότητα να εξαντληθεί το κεφάλαιο (και να φτάσει το MAX_ORDERS) μέσα στον ορίζοντα.
+    :param projection: Αποτέλεσμα του project_ladder()
+    :param volatility: Ημερήσια μεταβλητότητα της log τιμής
+    :param drift: Ημερήσια μέση log απόδοση
+    :param workers: Διεργασίες (0 = όσοι πυρήνες, 1 = στην ίδια διεργασία)
+    :return: Dictionary με πιθανότητες, χρόνους, κατανομή των rungs και κεφάλαιο που δεσμεύεται
+    """
+    started = time.time()
+    steps = max(int(round(horizon_days * 1440 / step_minutes)), 1)
+    step_days = horizon_days / steps
+    step_drift = drift * step_days
+    step_volatility = volatility * math.sqrt(step_days)
+
+    prices = np.array([rung["price"] for rung in projection["rungs"]])
+    cumulative_cost = np.array([rung["cumulative_cost"] for rung in projection["rungs"]])
+    levels = [(name, price) for name, price in (("exhaustion", projection["exhaustion_price"]),
+                                                 ("max_orders", projection["max_orders_price"])) if price is not None]
+    thresholds = [math.log(price / current_price) for _, price in levels]
+
+    # Διαχωρισμός των paths σε διεργασίες (με ανεξάρτητα seeds)
+    workers = workers or os.cpu_count() or 1
+    chunks = workers if workers > 1 and paths >= MIN_POOL_PATHS else 1
+    seeds = np.random.SeedSequence(seed).spawn(chunks)
+    sizes = [paths // chunks + (i < paths % chunks) for i in range(chunks)]
+    tasks = [(seeds[i], sizes[i], steps, step_drift, step_volatility, thresholds) for i in range(chunks)]
+    if chunks == 1:
+        results = [simulate_chunk(*tasks[0])]
+    else:
+        pool = get_pool(workers)
+        results = [future.result() for future in [pool.submit(simulate_chunk, *task) for task in tasks]]
+
+    min_prices = current_price * np.exp(np.concatenate([result[0] for result in results]).astype(np.float64))
+    first_hit = np.concatenate([result[1] for result in results], axis=1)
+
+    # Rungs που γεμίζουν σε κάθε path (όσα βρίσκονται πάνω από το ελάχιστο της διαδρομής)
+    filled = np.searchsorted(-prices, -min_prices, side="right")
+    funded = projection["funded_rungs"]
+    deployed = np.concatenate([[0.0], cumulative_cost])[np.minimum(filled, funded)]
+    counts = np.bincount(filled, minlength=len(prices) + 1)
+
+    report = {
+        "paths": paths,
+        "horizon_days": horizon_days,
+        "step_minutes": step_minutes,
+        "volatility": volatility,
+        "drift": drift,
+        "workers": chunks,
+        "probability_exhaustion": 0.0,
+        "probability_max_orders": 0.0,
+        "days_to_exhaustion": None,
+        "days_to_max_orders": None,
+        "rungs_filled": {str(projection["open_lots"] + k): round(float(count) / paths, 4) for k, count in enumerate(counts)},
+        "capital_deployed": {
+            "mean": round(float(deployed.mean()), 2),
+            "p50": round(float(np.percentile(deployed, 50)), 2),
+            "p95": round(float(np.percentile(deployed, 95)), 2),
+            "p99": round(float(np.percentile(deployed, 99)), 2),
+        },
+    }
+    for i, (name, _) in enumerate(levels):
+        hit = first_hit[i] >= 0
+        report[f"probability_{name}"] = round(float(hit.mean()), 4)
+        report[f"days_to_{name}"] = summarize_days(first_hit[i][hit] * step_days)
+    report["elapsed_ms"] = round((time.time() - started) * 1000, 1)
+    return report
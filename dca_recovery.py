@@ -0,0 +1,219 @@
+"""
+Crash recovery for the orders.json ledger.
+
+Before every market order the bot writes an intent record (side, amount, lot, venue and a clientOrderId) to
+a small journal and removes it once the ledger has been saved, so an order that reached the exchange but
+not the ledger is never forgotten. On start-up the fills of each venue since a persisted cursor are fetched
+with fetch_my_trades and compared with the open lots and the pending intents: fills of intents that never
+reached the ledger become lots (or close them), lots without a fill are dropped, and recorded prices are
+replaced by the actual average fill price and fee. Only the trades after the cursor are examined, so the
+cost is proportional to the activity since the last run and not to the account history.
+"""
+import json
+import math
+import os
+import tempfile
+import threading
+import uuid
+
+
+DATA_DIR = os.environ.get("DCA_DATA_DIR", "/opt/python/dca-bot-bitcoin")
+INTENTS_FILE = os.path.join(DATA_DIR, "intents.json")
+
+# Οι προθέσεις γράφονται και από το main thread και από το I/O thread (split runtime)
+_intents_lock = threading.Lock()
+
+
+def write_json_atomic(path, data):
+    """
+    Ατομική (και durable) εγγραφή JSON: ένα crash αφήνει είτε το παλιό είτε το νέο αρχείο, ποτέ μισό.
+    Το προσωρινό αρχείο είναι μοναδικό, ώστε ταυτόχρονες εγγραφές να μη μοιράζονται το ίδιο.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def new_client_order_id(side):
+    """Μοναδικό clientOrderId για μια παραγγελία του bot (π.χ. 'dcab3f0c1d2e4a5b6c7d8')."""
+    return f"dca{side[0]}{uuid.uuid4().hex[:20]}"
+
+
+def load_intents(path=INTENTS_FILE):
+    """
+    Οι εκκρεμείς προθέσεις (παραγγελίες που στάλθηκαν ή πρόκειται να σταλούν χωρίς να έχει αποθηκευτεί το ledger).
+    :return: Dictionary clientOrderId -> intent
+    """
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def write_intent(intent, path=INTENTS_FILE):
+    """
+    Καταγραφή μιας πρόθεσης πριν σταλεί η παραγγελία (write-ahead).
+    :param intent: Dictionary με CLIENT_ID, SIDE, AMOUNT, VENUE, TIMESTAMP και LOT (το κλειδί της θέσης, για πωλήσεις)
+    """
+    with _intents_lock:
+        intents = load_intents(path)
+        intents[intent["CLIENT_ID"]] = intent
+        write_json_atomic(path, intents)
+
+
+def clear_intent(client_id, path=INTENTS_FILE):
+    """Αφαίρεση μιας πρόθεσης αφού το αποτέλεσμά της αποθηκεύτηκε στο ledger."""
+    with _intents_lock:
+        intents = load_intents(path)
+        if intents.pop(client_id, None) is not None:
+            write_json_atomic(path, intents)
+
+
+def lot_key(lots, price):
+    """
+    Κλειδί για μια θέση στο ORDERS: η τιμή της ή, αν υπάρχει ήδη θέση σε αυτήν, η αμέσως επόμενη αναπαραστάσιμη
+    τιμή (τα κλειδιά διαβάζονται ως float), ώστε μια θέση να μην αντικαθιστά ποτέ άλλη.
+    """
+    key = str(price)
+    while key in lots:
+        price = math.nextafter(float(price), math.inf)
+        key = str(price)
+    return key
+
+
+def aggregate_fills(trades):
+    """
+    Ομαδοποίηση των trades ανά παραγγελία.
+    :param trades: Λίστα trades όπως επιστρέφεται από fetch_my_trades()
+    :return: Dictionary order id -> {id, client_id, side, amount, cost, fee, price, timestamp, datetime}
+    """
+    fills = {}
+    for trade in sorted(trades, key=lambda t: t.get("timestamp") or 0):
+        order_id = str(trade.get("order") or trade["id"])
+        fill = fills.setdefault(order_id, {
+            "id": order_id, "client_id": trade.get("clientOrderId"), "side": trade["side"],
+            "amount": 0.0, "cost": 0.0, "fee": 0.0, "fee_currency": None,
+            "timestamp": trade.get("timestamp"), "datetime": trade.get("datetime"),
+        })
+        amount = float(trade["amount"])
+        fill["amount"] += amount
+        fill["cost"] += float(trade.get("cost") or amount * float(trade["price"]))
+        fee = trade.get("fee") or {}
+        fill["fee"] += float(fee.get("cost") or 0)
+        fill["fee_currency"] = fee.get("currency") or fill["fee_currency"]
+        fill["client_id"] = fill["client_id"] or trade.get("clientOrderId")
+
+    for fill in fills.values():
+        fill["price"] = fill["cost"] / fill["amount"] if fill["amount"] else None
+    return fills
+
+
+def match_intent(fill, intents, claimed, timeout_ms):
+    """
+    Η πρόθεση στην οποία αντιστοιχεί ένα fill: με βάση το clientOrderId ή, για exchanges που δεν το επιστρέφουν
+    στα trades, με την ίδια πλευρά και ποσότητα μέσα σε `timeout_ms` από την καταγραφή της πρόθεσης.
+    :param claimed: Σύνολο από clientOrderIds που έχουν ήδη αντιστοιχιστεί
+    :return: Η πρόθεση ή None
+    """
+    if fill["client_id"]:
+        intent = intents.get(fill["client_id"])
+        return intent if intent is not None and fill["client_id"] not in claimed else None
+
+    for client_id, intent in sorted(intents.items(), key=lambda item: item[1]["TIMESTAMP"]):
+        if client_id in claimed or intent["SIDE"] != fill["side"]:
+            continue
+        if not intent["TIMESTAMP"] - 5000 <= (fill["timestamp"] or 0) <= intent["TIMESTAMP"] + timeout_ms:
+            continue
+        if abs(fill["amount"] - float(intent["AMOUNT"])) <= float(intent["AMOUNT"]) * 1e-6:
+            return intent
+    return None
+
+
+def plan_repairs(lots, intents, fills, venue, since, now, grace_ms=60_000, timeout_ms=300_000, default_venue=None):
+    """
+    Σύγκριση των θέσεων ενός venue και των εκκρεμών προθέσεων με τα fills από το `since` και μετά.
+    :param lots: Το ORDERS του orders.json (κλειδί θέσης -> θέση)
+    :param intents: Οι εκκρεμείς προθέσεις (clientOrderId -> intent)
+    :param fills: Τα fills του venue από aggregate_fills()
+    :param venue: Το όνομα του venue
+    :param since: Το αποθηκευμένο cursor (ms). Με None (πρώτο run) δεν αφαιρούνται phantom θέσεις
+    :param now: Τρέχων χρόνος (ms)
+    :param grace_ms: Θέσεις νεότερες από αυτό δεν θεωρούνται phantom (το trade μπορεί να μην εμφανίζεται ακόμα)
+    :param timeout_ms: Προθέσεις παλαιότερες από αυτό χωρίς fill θεωρούνται ότι δεν εκτελέστηκαν ποτέ
+    :param default_venue: Το venue των θέσεων χωρίς πεδίο "venue" (default: `venue`)
+    :return: Λίστα επιδιορθώσεων, κάθε μία dictionary με ACTION:
+        "add_lot" (FILL, INTENT), "close_lot" (LOT, FILL, INTENT), "remove_lot" (LOT),
+        "reprice_lot" (LOT, FILL), "drop_intent" (INTENT)
+    """
+    repairs = []
+    venue_lots = {key: lot for key, lot in lots.items() if (lot.get("venue") or default_venue or venue) == venue}
+    lots_by_order = {str(lot["id"]): key for key, lot in venue_lots.items()}
+    lots_by_client = {lot["client_id"]: key for key, lot in venue_lots.items() if lot.get("client_id")}
+    venue_intents = {cid: intent for cid, intent in intents.items() if intent.get("VENUE") == venue}
+    claimed = set()
+    bought = set()
+
+    for fill in fills.values():
+        key = lots_by_order.get(fill["id"])
+        intent = None if key is not None else match_intent(fill, venue_intents, claimed, timeout_ms)
+        if intent is not None:
+            claimed.add(intent["CLIENT_ID"])
+
+        if fill["side"] == "buy":
+            if key is None and intent is not None:
+                key = lots_by_client.get(intent["CLIENT_ID"])
+                if key is None:
+                    repairs.append({"ACTION": "add_lot", "FILL": fill, "INTENT": intent})
+                    continue
+                repairs.append({"ACTION": "drop_intent", "INTENT": intent})
+            if key is None:
+                continue  # Trade που δεν ανήκει στο ladder (π.χ. rebalance ή χειροκίνητο)
+
+            bought.add(key)
+            lot = venue_lots[key]
+            if str(lot["id"]) != fill["id"] or abs(float(lot["price"]) - fill["price"]) > 1e-9 or "fee" not in lot:
+                repairs.append({"ACTION": "reprice_lot", "LOT": key, "FILL": fill})
+
+        elif intent is not None and intent.get("LOT") in venue_lots:
+            # Η πώληση εκτελέστηκε αλλά η θέση δεν αφαιρέθηκε από το ledger
+            repairs.append({"ACTION": "close_lot", "LOT": intent["LOT"], "FILL": fill, "INTENT": intent})
+        elif intent is not None:
+            repairs.append({"ACTION": "drop_intent", "INTENT": intent})  # Η πώληση έχει ήδη καταγραφεί
+
+    # Θέσεις μέσα στο παράθυρο του cursor χωρίς κανένα fill αγοράς
+    closed = {repair["LOT"] for repair in repairs if repair["ACTION"] == "close_lot"}
+    for key, lot in venue_lots.items():
+        timestamp = lot.get("timestamp") or 0
+        if key in bought or key in closed or since is None or timestamp < since or timestamp > now - grace_ms:
+            continue
+        repairs.append({"ACTION": "remove_lot", "LOT": key})
+
+    # Προθέσεις που ολοκληρώθηκαν ή δεν εκτελέστηκαν ποτέ
+    for client_id, intent in venue_intents.items():
+        if client_id in claimed:
+            continue
+        if client_id in lots_by_client or intent["TIMESTAMP"] < now - timeout_ms:
+            repairs.append({"ACTION": "drop_intent", "INTENT": intent})
+
+    return repairs
+
+
+def next_cursor(fills, intents, venue, since, now, grace_ms=60_000):
+    """
+    Το νέο cursor: το τελευταίο fill που εξετάστηκε, αλλά όχι μετά από εκκρεμή πρόθεση του venue ή μέσα στο
+    `grace_ms`, ώστε τα fills τους (και οι νέες θέσεις) να εξεταστούν ξανά στο επόμενο run.
+    """
+    cursor = max([fill["timestamp"] or 0 for fill in fills.values()] + [since or 0]) or now
+    pending = [intent["TIMESTAMP"] - 5000 for intent in intents.values() if intent.get("VENUE") == venue]
+    return min([cursor, now - grace_ms] + pending)
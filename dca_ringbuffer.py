@@ -0,0 +1,107 @@
+"""
+Lock-free single-writer ring buffer in shared memory.
+
+The market-data process writes fixed-width records (ticks or candles) and any number of readers in other
+processes read the latest record, or every record after a cursor, without locks. Each slot carries its own
+sequence number (odd while the slot is being written, even when it is complete), so a reader that races
+the writer or is lapped by it simply retries or skips the overwritten records.
+"""
+import struct
+import time
+from multiprocessing import shared_memory
+
+
+# Πεδία των εγγραφών
+TICK = struct.Struct("<qddd")     # timestamp (ms), last, bid, ask
+CANDLE = struct.Struct("<qddddd")  # timestamp (ms), open, high, low, close, volume
+
+_COUNT = struct.Struct("<Q")      # Header: πλήθος εγγραφών που έχουν γραφτεί συνολικά
+_SEQ = struct.Struct("<Q")
+
+
+class RingBuffer:
+    """Ring buffer of fixed-width records in a named shared-memory block (one writer, many readers)."""
+
+    def __init__(self, record, capacity=4096, name=None, create=False):
+        """
+        :param record: struct.Struct με τη μορφή της εγγραφής (π.χ. TICK, CANDLE)
+        :param capacity: Πλήθος slots
+        :param name: Όνομα του shared memory block (για attach από άλλη διεργασία)
+        :param create: True για τη διεργασία που δημιουργεί (και γράφει) το buffer
+        """
+        self.record = record
+        self.capacity = capacity
+        self.slot_size = _SEQ.size + record.size
+        size = _COUNT.size + capacity * self.slot_size
+        self.shm = shared_memory.SharedMemory(name=name, create=create, size=size if create else 0)
+        self.buf = self.shm.buf
+        self.owner = create
+        if create:
+            self.buf[:size] = bytes(size)
+
+    @property
+    def name(self):
+        return self.shm.name
+
+    def count(self):
+        """Πλήθος εγγραφών που έχουν γραφτεί από την αρχή."""
+        return _COUNT.unpack_from(self.buf, 0)[0]
+
+    def _offset(self, index):
+        return _COUNT.size + (index % self.capacity) * self.slot_size
+
+    def append(self, *values):
+        """Εγγραφή μιας νέας εγγραφής (μόνο από τη διεργασία-writer)."""
+        index = self.count()
+        offset = self._offset(index)
+        _SEQ.pack_into(self.buf, offset, 2 * index + 1)  # Μονός: εγγραφή σε εξέλιξη
+        self.record.pack_into(self.buf, offset + _SEQ.size, *values)
+        _SEQ.pack_into(self.buf, offset, 2 * index + 2)  # Ζυγός: ολοκληρώθηκε
+        _COUNT.pack_into(self.buf, 0, index + 1)
+
+    def _read(self, index):
+        """Ανάγνωση της εγγραφής `index` ή None αν έχει ήδη αντικατασταθεί (ή γράφεται)."""
+        offset = self._offset(index)
+        expected = 2 * index + 2
+        if _SEQ.unpack_from(self.buf, offset)[0] != expected:
+            return None
+        values = self.record.unpack_from(self.buf, offset + _SEQ.size)
+        if _SEQ.unpack_from(self.buf, offset)[0] != expected:
+            return None
+        return values
+
+    def latest(self, retries=100):
+        """
+        Η πιο πρόσφατη εγγραφή.
+        :return: Tuple (index, values) ή None αν δεν έχει γραφτεί τίποτα ακόμα
+        """
+        for _ in range(retries):
+            count = self.count()
+            if count == 0:
+                return None
+            values = self._read(count - 1)
+            if values is not None:
+                return count - 1, values
+            time.sleep(0)
+        return None
+
+    def read_since(self, cursor):
+        """
+        Όλες οι εγγραφές από το `cursor` (index) και μετά που είναι ακόμα διαθέσιμες.
+        :return: Tuple (λίστα από (index, values), νέο cursor)
+        """
+        count = self.count()
+        start = max(cursor, count - self.capacity)
+        records = []
+        for index in range(start, count):
+            values = self._read(index)
+            if values is not None:
+                records.append((index, values))
+        return records, count
+
+    def close(self):
+        """Αποσύνδεση (και διαγραφή, για τη διεργασία που το δημιούργησε)."""
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
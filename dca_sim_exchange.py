@@ -0,0 +1,299 @@
+"""
+Local simulated exchange with the subset of the ccxt API that the DCA bot and the dashboard use.
+
+The price follows a seeded random walk on a 1-minute grid, so runs are reproducible, and the clock can be
+injected to drive the simulation faster than real time. Market orders fill against a synthetic order book,
+limit orders reserve funds and fill when the price crosses them, and balances, orders and trades are kept
+in memory. Select it with EXCHANGE_NAME "sim" (settings in the SIMULATOR section of config.json) or use it
+as a fake venue for the venue-selection layer.
+"""
+import math
+import random
+import time
+from datetime import datetime
+
+try:
+    from ccxt import InsufficientFunds, InvalidOrder, OrderNotFound
+except ImportError:  # Ο simulator δεν απαιτεί το ccxt
+    class InsufficientFunds(Exception):
+        pass
+
+    class InvalidOrder(Exception):
+        pass
+
+    class OrderNotFound(Exception):
+        pass
+
+
+MINUTE_MS = 60_000
+
+
+def iso8601(timestamp_ms):
+    return datetime.utcfromtimestamp(timestamp_ms / 1000).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3] + "Z"
+
+
+class SimExchange:
+    """Simulated exchange (ccxt-compatible subset) for a single symbol."""
+
+    def __init__(self, config=None, clock=None):
+        config = config or {}
+        self.id = config.get("ID", "sim")
+        self.symbol = config.get("SYMBOL", "BTC/USDT")
+        self.base, self.quote = self.symbol.split("/")
+        self.fee = float(config.get("FEE", 0.001))
+        self.spread = float(config.get("SPREAD", 0.0002))
+        self.volatility = float(config.get("VOLATILITY", 0.0008))  # ανά λεπτό
+        self.depth = float(config.get("DEPTH", 0.5))  # ποσότητα ανά επίπεδο του order book
+        self.latency = float(config.get("LATENCY", 0.0))
+        self.clock = clock or time.time
+
+        self.has = {"fetchOrders": True, "fetchOpenOrders": True, "fetchMyTrades": True, "fetchOHLCV": True, "fetchOrderBook": True}
+        self.markets = {self.symbol: {"symbol": self.symbol, "base": self.base, "quote": self.quote,
+                                      "precision": {"price": 2, "amount": 6}}}
+        self.balances = {self.base: {"free": float(config.get("BASE_BALANCE", 1.0)), "used": 0.0},
+                         self.quote: {"free": float(config.get("QUOTE_BALANCE", 10000.0)), "used": 0.0}}
+        self.orders = {}
+        self.trades = []
+        self._next_id = 1
+
+        # Ιστορικό τιμών ανά λεπτό που τελειώνει στην αρχική τιμή
+        self._random = random.Random(config.get("SEED", 0))
+        history = int(config.get("HISTORY_DAYS", 30)) * 1440
+        now_minute = int(self.clock() * 1000) // MINUTE_MS * MINUTE_MS
+        self._start = now_minute - history * MINUTE_MS
+        closes = [float(config.get("PRICE", 30000.0))]
+        for _ in range(history):
+            closes.append(closes[-1] / math.exp(self._random.gauss(0, self.volatility)))
+        self._closes = closes[::-1]
+
+    # -- Εσωτερικά ---------------------------------------------------------
+
+    def _now(self):
+        return int(self.clock() * 1000)
+
+    def _advance(self):
+        """Επέκταση του random walk μέχρι το τρέχον λεπτό και εκτέλεση των limit orders που διασταυρώθηκαν."""
+        if self.latency:
+            time.sleep(self.latency)
+        target = (self._now() - self._start) // MINUTE_MS
+        while len(self._closes) <= target:
+            self._closes.append(self._closes[-1] * math.exp(self._random.gauss(0, self.volatility)))
+            self._match_limit_orders(self._closes[-1])
+
+    def _price(self):
+        return self._closes[-1]
+
+    def _book_side(self, side, levels=20):
+        mid = self._price()
+        if side == "asks":
+            return [[mid * (1 + self.spread / 2) * (1 + 0.0001 * i), self.depth] for i in range(levels)]
+        return [[mid * (1 - self.spread / 2) * (1 - 0.0001 * i), self.depth] for i in range(levels)]
+
+    def _sweep(self, side, amount):
+        """Μέση τιμή εκτέλεσης market order πάνω στο συνθετικό order book."""
+        remaining, cost = amount, 0.0
+        for price, size in self._book_side("asks" if side == "buy" else "bids", levels=1000):
+            fill = min(remaining, size)
+            cost += fill * price
+            remaining -= fill
+            if remaining <= 1e-12:
+                return cost / amount
+        raise InvalidOrder(f"{self.id}: not enough depth for {amount} {self.base}")
+
+    def _new_order(self, side, order_type, amount, price, params):
+        timestamp = self._now()
+        order = {
+            "id": str(self._next_id),
+            "clientOrderId": (params or {}).get("clientOrderId"),
+            "timestamp": timestamp,
+            "datetime": iso8601(timestamp),
+            "symbol": self.symbol,
+            "type": order_type,
+            "side": side,
+            "price": price,
+            "average": None,
+            "amount": amount,
+            "filled": 0.0,
+            "remaining": amount,
+            "cost": 0.0,
+            "status": "open",
+            "fee": None,
+        }
+        self._next_id += 1
+        self.orders[order["id"]] = order
+        return order
+
+    def _fill(self, order, price, reserved):
+        """Εκτέλεση ολόκληρης της παραγγελίας στην τιμή `price` (`reserved` = κεφάλαια ήδη δεσμευμένα)."""
+        amount = order["amount"]
+        cost = amount * price
+        fee = cost * self.fee
+        base, quote = self.balances[self.base], self.balances[self.quote]
+
+        if order["side"] == "buy":
+            if reserved:
+                quote["used"] -= order["price"] * amount * (1 + self.fee)
+                quote["free"] += order["price"] * amount * (1 + self.fee) - cost - fee
+            else:
+                if quote["free"] < cost + fee:
+                    del self.orders[order["id"]]
+                    raise InsufficientFunds(f"{self.id}: insufficient {self.quote} balance")
+                quote["free"] -= cost + fee
+            base["free"] += amount
+        else:
+            if reserved:
+                base["used"] -= amount
+            else:
+                if base["free"] < amount - 1e-12:
+                    del self.orders[order["id"]]
+                    raise InsufficientFunds(f"{self.id}: insufficient {self.base} balance")
+                base["free"] -= amount
+            quote["free"] += cost - fee
+
+        timestamp = self._now()
+        order.update({"average": price, "filled": amount, "remaining": 0.0, "cost": cost, "status": "closed",
+                      "fee": {"cost": fee, "currency": self.quote}, "lastTradeTimestamp": timestamp})
+        self.trades.append({
+            "id": str(len(self.trades) + 1), "order": order["id"], "clientOrderId": order["clientOrderId"],
+            "timestamp": timestamp, "datetime": iso8601(timestamp), "symbol": self.symbol,
+            "side": order["side"], "price": price, "amount": amount, "cost": cost,
+            "fee": {"cost": fee, "currency": self.quote},
+        })
+
+    def _match_limit_orders(self, price):
+        for order in list(self.orders.values()):
+            if order["status"] != "open" or order["type"] != "limit":
+                continue
+            if (order["side"] == "buy" and price <= order["price"]) or (order["side"] == "sell" and price >= order["price"]):
+                self._fill(order, order["price"], reserved=True)
+
+    # -- ccxt API ----------------------------------------------------------
+
+    def load_markets(self, reload=False):
+        return self.markets
+
+    def set_sandbox_mode(self, enabled):
+        pass
+
+    def price_to_precision(self, symbol, price):
+        return f"{price:.{self.markets[symbol]['precision']['price']}f}"
+
+    def amount_to_precision(self, symbol, amount):
+        return f"{amount:.{self.markets[symbol]['precision']['amount']}f}"
+
+    def fetch_ticker(self, symbol):
+        self._advance()
+        timestamp = self._now()
+        bids, asks = self._book_side("bids", 1), self._book_side("asks", 1)
+        return {"symbol": symbol, "timestamp": timestamp, "datetime": iso8601(timestamp), "last": self._price(),
+                "bid": bids[0][0], "ask": asks[0][0], "close": self._price()}
+
+    def fetch_order_book(self, symbol, limit=20):
+        self._advance()
+        timestamp = self._now()
+        return {"symbol": symbol, "timestamp": timestamp, "datetime": iso8601(timestamp),
+                "bids": self._book_side("bids", limit), "asks": self._book_side("asks", limit)}
+
+    def fetch_balance(self, params=None):
+        self._advance()
+        balance = {"free": {}, "used": {}, "total": {}}
+        for currency, amounts in self.balances.items():
+            total = amounts["free"] + amounts["used"]
+            balance[currency] = {"free": amounts["free"], "used": amounts["used"], "total": total}
+            balance["free"][currency], balance["used"][currency], balance["total"][currency] = amounts["free"], amounts["used"], total
+        return balance
+
+    def fetch_ohlcv(self, symbol, timeframe="1m", since=None, limit=100):
+        self._advance()
+        units = {"m": 1, "h": 60, "d": 1440}
+        step = int(timeframe[:-1]) * units[timeframe[-1]]
+        first_bucket = self._start // (step * MINUTE_MS) * (step * MINUTE_MS)
+        if since is None:
+            last_bucket = (self._start + (len(self._closes) - 1) * MINUTE_MS) // (step * MINUTE_MS) * (step * MINUTE_MS)
+            since = max(last_bucket - (limit - 1) * step * MINUTE_MS, first_bucket)
+
+        candles = []
+        bucket = max(since // (step * MINUTE_MS) * (step * MINUTE_MS), first_bucket)
+        if bucket < since:
+            bucket += step * MINUTE_MS
+        while len(candles) < limit:
+            lo = max((bucket - self._start) // MINUTE_MS, 0)
+            hi = min((bucket - self._start) // MINUTE_MS + step, len(self._closes))
+            if lo >= hi:
+                break
+            closes = self._closes[lo:hi]
+            opening = self._closes[lo - 1] if lo > 0 else closes[0]
+            candles.append([bucket, opening, max(closes + [opening]), min(closes + [opening]), closes[-1],
+                            self.depth * len(closes)])
+            bucket += step * MINUTE_MS
+        return candles
+
+    def create_market_buy_order(self, symbol, amount, params=None):
+        self._advance()
+        order = self._new_order("buy", "market", amount, None, params)
+        price = self._sweep("buy", amount)
+        order["price"] = price
+        self._fill(order, price, reserved=False)
+        return dict(order)
+
+    def create_market_sell_order(self, symbol, amount, params=None):
+        self._advance()
+        order = self._new_order("sell", "market", amount, None, params)
+        price = self._sweep("sell", amount)
+        order["price"] = price
+        self._fill(order, price, reserved=False)
+        return dict(order)
+
+    def create_limit_buy_order(self, symbol, amount, price, params=None):
+        self._advance()
+        quote = self.balances[self.quote]
+        required = price * amount * (1 + self.fee)
+        if quote["free"] < required:
+            raise InsufficientFunds(f"{self.id}: insufficient {self.quote} balance")
+        quote["free"] -= required
+        quote["used"] += required
+        return dict(self._new_order("buy", "limit", amount, price, params))
+
+    def create_limit_sell_order(self, symbol, amount, price, params=None):
+        self._advance()
+        base = self.balances[self.base]
+        if base["free"] < amount - 1e-12:
+            raise InsufficientFunds(f"{self.id}: insufficient {self.base} balance")
+        base["free"] -= amount
+        base["used"] += amount
+        return dict(self._new_order("sell", "limit", amount, price, params))
+
+    def cancel_order(self, order_id, symbol=None, params=None):
+        self._advance()
+        order = self.orders.get(order_id)
+        if order is None or order["status"] != "open":
+            raise OrderNotFound(f"{self.id}: order {order_id} not found")
+        if order["side"] == "buy":
+            reserved = order["price"] * order["amount"] * (1 + self.fee)
+            self.balances[self.quote]["used"] -= reserved
+            self.balances[self.quote]["free"] += reserved
+        else:
+            self.balances[self.base]["used"] -= order["amount"]
+            self.balances[self.base]["free"] += order["amount"]
+        order["status"] = "canceled"
+        return dict(order)
+
+    def fetch_order(self, order_id, symbol=None, params=None):
+        self._advance()
+        if order_id not in self.orders:
+            raise OrderNotFound(f"{self.id}: order {order_id} not found")
+        return dict(self.orders[order_id])
+
+    def fetch_orders(self, symbol=None, since=None, limit=None, params=None):
+        self._advance()
+        orders = [dict(o) for o in self.orders.values() if since is None or o["timestamp"] >= since]
+        return orders[-limit:] if limit else orders
+
+    def fetch_open_orders(self, symbol=None, since=None, limit=None, params=None):
+        self._advance()
+        return [dict(o) for o in self.orders.values() if o["status"] == "open"]
+
+    def fetch_my_trades(self, symbol=None, since=None, limit=None, params=None):
+        self._advance()
+        trades = [dict(t) for t in self.trades if since is None or t["timestamp"] >= since]
+        return trades[:limit] if limit else trades
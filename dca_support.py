@@ -0,0 +1,178 @@
+"""
+Incremental support/resistance detection.
+
+Pivot lows (supports) and pivot highs (resistances) are detected as candles arrive, clustered into
+price levels with touch counts and kept in sorted lists that are queried with bisect. With the defaults
+(1-neighbour pivots, rolling minimum over the last 5 pivot lows, no clustering) the supports are the same
+levels as the original `data[(data.shift(1) > data) & (data.shift(-1) > data)].rolling(5).min()` rule. Only the candles
+newer than the last processed one are examined, so the state can cover years of history without being
+recomputed on every run. The state is a plain dict that is persisted as JSON by the caller.
+"""
+import bisect
+
+
+def new_state(window=5, atr_period=14, pivot_width=1, cluster_pct=0.0):
+    """
+    Κενή κατάσταση για ένα timeframe.
+    :param window: Πλήθος διαδοχικών pivots για το κυλιόμενο ελάχιστο (supports) / μέγιστο (resistances), 1 = κάθε pivot
+    :param atr_period: Περίοδος του ATR (Wilder)
+    :param pivot_width: Πλήθος κεριών αριστερά και δεξιά που πρέπει να είναι υψηλότερα/χαμηλότερα για pivot
+    :param cluster_pct: Απόσταση (%) μέσα στην οποία δύο pivots θεωρούνται το ίδιο επίπεδο
+    """
+    return {
+        "WINDOW": window,
+        "ATR_PERIOD": atr_period,
+        "PIVOT_WIDTH": pivot_width,
+        "CLUSTER_PCT": cluster_pct,
+        "LAST_TS": None,       # Τελευταίο κερί που μπήκε στο buffer
+        "EVALUATED_TS": None,  # Τελευταίο κερί που ελέγχθηκε ως κέντρο pivot
+        "BUFFER": [],          # [ts, high, low] των τελευταίων 2 * PIVOT_WIDTH + 1 κεριών
+        "PIVOT_LOWS": [],      # Τα τελευταία WINDOW pivot lows
+        "PIVOT_HIGHS": [],     # Τα τελευταία WINDOW pivot highs
+        "LAST_SUPPORT": None,  # Τελευταίο κυλιόμενο ελάχιστο που καταγράφηκε ως touch
+        "LAST_RESISTANCE": None,
+        "ATR": None,
+        "ATR_COUNT": 0,
+        "PREV_CLOSE": None,
+        "SUPPORTS": [],        # Ταξινομημένα [price, touches, last_ts]
+        "RESISTANCES": [],
+    }
+
+
+def add_touch(levels, price, timestamp, cluster_pct):
+    """
+    Προσθήκη ενός pivot σε ταξινομημένη λίστα επιπέδων.
+    Αν υπάρχει επίπεδο σε απόσταση cluster_pct% συγχωνεύεται (σταθμισμένος μέσος όρος, +1 touch), αλλιώς εισάγεται νέο.
+    """
+    index = bisect.bisect_left(levels, [price])
+    nearest = None
+    for candidate in (index - 1, index):
+        if 0 <= candidate < len(levels):
+            distance = abs(levels[candidate][0] - price)
+            if distance <= price * cluster_pct / 100 and (nearest is None or distance < abs(levels[nearest][0] - price)):
+                nearest = candidate
+
+    if nearest is None:
+        levels.insert(index, [price, 1, timestamp])
+        return
+
+    level_price, touches, _ = levels.pop(nearest)
+    merged = [(level_price * touches + price) / (touches + 1), touches + 1, timestamp]
+    bisect.insort(levels, merged)
+
+
+def is_current(state, window, atr_period, pivot_width, cluster_pct):
+    """True αν η αποθηκευμένη κατάσταση φτιάχτηκε με τις ίδιες παραμέτρους (αλλιώς πρέπει να ξαναχτιστεί)."""
+    stored = (state.get("WINDOW"), state.get("ATR_PERIOD"), state.get("PIVOT_WIDTH"), state.get("CLUSTER_PCT"))
+    return stored == (window, atr_period, pivot_width, cluster_pct)
+
+
+def add_pivot(state, pivots_key, last_key, levels_key, price, timestamp, pick):
+    """
+    Προσθήκη pivot στο κυλιόμενο παράθυρο των τελευταίων WINDOW pivots. Όταν το παράθυρο γεμίσει, το ελάχιστο
+    (ή μέγιστο) του καταγράφεται ως touch, μόνο όταν αλλάζει, ώστε το ίδιο pivot να μη μετρά πολλές φορές.
+    """
+    pivots = state[pivots_key]
+    pivots.append(price)
+    del pivots[:-state["WINDOW"]]
+    if len(pivots) < state["WINDOW"]:
+        return
+    level = pick(pivots)
+    if level != state[last_key]:
+        state[last_key] = level
+        add_touch(state[levels_key], level, timestamp, state["CLUSTER_PCT"])
+
+
+def prune(levels, max_levels):
+    """Κρατά τα `max_levels` επίπεδα με τα περισσότερα touches (και πιο πρόσφατα σε ισοπαλία)."""
+    if len(levels) <= max_levels:
+        return levels
+    keep = sorted(levels, key=lambda level: (level[1], level[2]), reverse=True)[:max_levels]
+    return sorted(keep)
+
+
+def update(state, candles, max_levels=200):
+    """
+    Ενημέρωση της κατάστασης με νέα κλειστά κεριά.
+    :param state: Η κατάσταση από new_state() (περιέχει και το CLUSTER_PCT με το οποίο χτίστηκαν τα επίπεδα)
+    :param candles: Iterable από (timestamp_ms, high, low, close) σε αύξουσα χρονική σειρά
+    :param max_levels: Μέγιστο πλήθος επιπέδων ανά λίστα
+    :return: Πλήθος νέων κεριών που επεξεργάστηκαν
+    """
+    width = state["PIVOT_WIDTH"]
+    buffer = state["BUFFER"]
+    processed = 0
+
+    for timestamp, high, low, close in candles:
+        if state["LAST_TS"] is not None and timestamp <= state["LAST_TS"]:
+            continue
+        state["LAST_TS"] = timestamp
+        processed += 1
+
+        # ATR (Wilder) ενημερώνεται σε O(1) ανά κερί
+        prev_close = state["PREV_CLOSE"]
+        true_range = high - low if prev_close is None else max(high - low, abs(high - prev_close), abs(low - prev_close))
+        period = state["ATR_PERIOD"]
+        if state["ATR_COUNT"] < period:
+            state["ATR"] = ((state["ATR"] or 0.0) * state["ATR_COUNT"] + true_range) / (state["ATR_COUNT"] + 1)
+            state["ATR_COUNT"] += 1
+        else:
+            state["ATR"] = (state["ATR"] * (period - 1) + true_range) / period
+        state["PREV_CLOSE"] = close
+
+        buffer.append([timestamp, high, low])
+        if len(buffer) < 2 * width + 1:
+            continue
+        del buffer[:-(2 * width + 1)]
+
+        # Το μεσαίο κερί έχει πλέον `width` κεριά από κάθε πλευρά
+        center_ts, center_high, center_low = buffer[width]
+        if state["EVALUATED_TS"] is not None and center_ts <= state["EVALUATED_TS"]:
+            continue
+        state["EVALUATED_TS"] = center_ts
+
+        neighbours = buffer[:width] + buffer[width + 1:]
+        if all(center_low < candle[2] for candle in neighbours):
+            add_pivot(state, "PIVOT_LOWS", "LAST_SUPPORT", "SUPPORTS", center_low, center_ts, min)
+        if all(center_high > candle[1] for candle in neighbours):
+            add_pivot(state, "PIVOT_HIGHS", "LAST_RESISTANCE", "RESISTANCES", center_high, center_ts, max)
+
+    state["SUPPORTS"] = prune(state["SUPPORTS"], max_levels)
+    state["RESISTANCES"] = prune(state["RESISTANCES"], max_levels)
+    return processed
+
+
+def level_prices(levels, min_touches=1):
+    """Ταξινομημένη λίστα τιμών των επιπέδων με τουλάχιστον `min_touches` touches."""
+    return [level[0] for level in levels if level[1] >= min_touches]
+
+
+def nearest_level(prices, price):
+    """
+    Το πλησιέστερο επίπεδο σε ταξινομημένη λίστα τιμών (bisect, O(log n)).
+    :return: Η τιμή του επιπέδου ή None αν η λίστα είναι κενή
+    """
+    index = bisect.bisect_left(prices, price)
+    candidates = [prices[i] for i in (index - 1, index) if 0 <= i < len(prices)]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda level: abs(level - price))
+
+
+def tolerance(mode, value, price, atr=None):
+    """
+    Ανοχή απόστασης από επίπεδο.
+    :param mode: "absolute" (σε μονάδες τιμής), "percent" (% της τιμής) ή "atr" (πολλαπλάσιο του ATR)
+    :param value: Η τιμή της ανοχής για το αντίστοιχο mode
+    :param price: Η τρέχουσα τιμή
+    :param atr: Ο τρέχων ATR (απαιτείται για mode "atr")
+    """
+    if mode == "absolute":
+        return value
+    if mode == "percent":
+        return price * value / 100
+    if mode == "atr":
+        if not atr:
+            raise ValueError("ATR is not available yet for an ATR-relative tolerance.")
+        return atr * value
+    raise ValueError(f"Unknown tolerance mode '{mode}'. Use 'absolute', 'percent' or 'atr'.")
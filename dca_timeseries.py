@@ -0,0 +1,126 @@
+"""
+Append-only time-series store for the DCA bot.
+
+Every run of the bot appends one fixed-width binary record (price, open quantity, average cost,
+realized and unrealized PnL). Reads memory-map the file, locate the requested time range with a
+binary search on the timestamp column and downsample it to the requested number of points.
+"""
+import os
+import struct
+
+import numpy as np
+
+
+DATA_DIR = os.environ.get("DCA_DATA_DIR", "/opt/python/dca-bot-bitcoin")
+TIMESERIES_FILE = os.path.join(DATA_DIR, "timeseries.bin")
+
+# timestamp (ms), price, open quantity, average cost, realized PnL, unrealized PnL
+RECORD = struct.Struct("<qddddd")
+FIELDS = ["timestamp", "price", "open_qty", "avg_cost", "realized_pnl", "unrealized_pnl"]
+DTYPE = np.dtype([("timestamp", "<i8"), ("price", "<f8"), ("open_qty", "<f8"),
+                  ("avg_cost", "<f8"), ("realized_pnl", "<f8"), ("unrealized_pnl", "<f8")])
+
+
+def append_record(timestamp_ms, price, open_qty, avg_cost, realized_pnl, unrealized_pnl, path=TIMESERIES_FILE):
+    """
+    Προσθήκη μιας εγγραφής στο τέλος του αρχείου.
+    Οι εγγραφές πρέπει να προστίθενται με αύξουσα σειρά χρόνου (η αναζήτηση εύρους βασίζεται σε αυτό).
+    """
+    with open(path, "ab") as f:
+        # Αποκοπή μισογραμμένης εγγραφής από προηγούμενο crash
+        size = f.tell()
+        if size % RECORD.size:
+            f.truncate(size - size % RECORD.size)
+        f.write(RECORD.pack(int(timestamp_ms), float(price), float(open_qty), float(avg_cost),
+                            float(realized_pnl), float(unrealized_pnl)))
+
+
+def load_records(path=TIMESERIES_FILE):
+    """
+    Memory-mapped προβολή όλων των πλήρων εγγραφών (structured numpy array, μόνο για ανάγνωση).
+    :return: np.memmap ή κενό array αν το αρχείο δεν υπάρχει
+    """
+    try:
+        count = os.path.getsize(path) // RECORD.size
+    except FileNotFoundError:
+        count = 0
+    if count == 0:
+        return np.empty(0, dtype=DTYPE)
+    return np.memmap(path, dtype=DTYPE, mode="r", shape=(count,))
+
+
+def select_range(records, start_ms=None, end_ms=None):
+    """Επιστρέφει τις εγγραφές με start_ms <= timestamp <= end_ms (binary search)."""
+    timestamps = records["timestamp"]
+    lo = 0 if start_ms is None else int(np.searchsorted(timestamps, start_ms, side="left"))
+    hi = len(records) if end_ms is None else int(np.searchsorted(timestamps, end_ms, side="right"))
+    return records[lo:hi]
+
+
+def lttb_indices(x, y, points):
+    """
+    Largest-Triangle-Three-Buckets: επιλογή `points` δεικτών που διατηρούν το σχήμα της καμπύλης.
+    :return: np.array με τους επιλεγμένους δείκτες σε αύξουσα σειρά
+    """
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n)
+
+    every = (n - 2) / (points - 2)
+    indices = np.empty(points, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+
+    a = 0
+    for i in range(points - 2):
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, n)
+
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+
+        areas = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(areas.argmax())
+        indices[i + 1] = a
+
+    return indices
+
+
+def minmax_indices(y, points):
+    """
+    Min/max buckets: σε κάθε bucket κρατάμε το ελάχιστο και το μέγιστο σημείο.
+    :return: np.array με τους επιλεγμένους δείκτες σε αύξουσα σειρά
+    """
+    n = len(y)
+    buckets = max(points // 2, 1)
+    if points >= n:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, buckets + 1).astype(np.int64)
+    selected = []
+    for start, end in zip(edges[:-1], edges[1:]):
+        if end <= start:
+            continue
+        bucket = y[start:end]
+        selected.append(start + int(bucket.argmin()))
+        selected.append(start + int(bucket.argmax()))
+    return np.unique(np.array(selected, dtype=np.int64))
+
+
+def downsample(records, points, method="lttb", field="price"):
+    """
+    Μείωση των εγγραφών σε περίπου `points` σημεία, βάσει του πεδίου `field`.
+    :param method: "lttb" ή "minmax"
+    :return: Structured numpy array (αντίγραφο, ανεξάρτητο από το memory map)
+    """
+    if len(records) <= points:
+        return np.array(records)
+
+    y = np.asarray(records[field], dtype=np.float64)
+    if method == "minmax":
+        indices = minmax_indices(y, points)
+    elif method == "lttb":
+        indices = lttb_indices(np.asarray(records["timestamp"], dtype=np.float64), y, points)
+    else:
+        raise ValueError(f"Unknown downsampling method '{method}'. Use 'lttb' or 'minmax'.")
+    return np.array(records[indices])
@@ -0,0 +1,150 @@
+"""
+Closed-trade history and incrementally maintained profit rollups.
+
+Each sale is appended as one JSON line to the trade history file, and the rollups (daily, weekly and
+monthly profit, holding time, win distribution) are updated in place at the same time. The dashboard
+reads only the rollups, so its answers do not depend on how many trades have closed.
+"""
+import json
+import os
+from datetime import datetime
+
+
+DATA_DIR = os.environ.get("DCA_DATA_DIR", "/opt/python/dca-bot-bitcoin")
+TRADES_FILE = os.path.join(DATA_DIR, "trades.jsonl")
+TRADE_STATS_FILE = os.path.join(DATA_DIR, "trade_stats.json")
+
+# Όρια (σε %) για την κατανομή κέρδους ανά συναλλαγή
+DISTRIBUTION_BUCKETS = [(None, 0, "<0%"), (0, 1, "0-1%"), (1, 2, "1-2%"), (2, 3, "2-3%"), (3, 5, "3-5%"), (5, None, ">=5%")]
+
+PERIODS = {"daily": "DAILY", "weekly": "WEEKLY", "monthly": "MONTHLY"}
+
+
+def empty_stats():
+    """Αρχική (κενή) μορφή των rollups."""
+    return {
+        "COUNT": 0,
+        "PROFIT": 0.0,
+        "WINS": 0,
+        "LOSSES": 0,
+        "HOLDING_SECONDS": 0.0,
+        "BEST": None,
+        "WORST": None,
+        "DISTRIBUTION": {label: 0 for _, _, label in DISTRIBUTION_BUCKETS},
+        "DAILY": {},
+        "WEEKLY": {},
+        "MONTHLY": {},
+    }
+
+
+def load_stats(path=TRADE_STATS_FILE):
+    """Φόρτωση των rollups (κενά αν δεν υπάρχει ακόμα το αρχείο)."""
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return empty_stats()
+
+
+def distribution_label(profit_pct):
+    """Επιστρέφει το bucket της κατανομής για το ποσοστό κέρδους."""
+    for low, high, label in DISTRIBUTION_BUCKETS:
+        if (low is None or profit_pct >= low) and (high is None or profit_pct < high):
+            return label
+    return DISTRIBUTION_BUCKETS[-1][2]
+
+
+def period_keys(sell_time):
+    """Κλειδιά ημέρας, εβδομάδας (ISO) και μήνα για τη χρονική στιγμή της πώλησης."""
+    year, week, _ = sell_time.isocalendar()
+    return {
+        "DAILY": sell_time.strftime("%Y-%m-%d"),
+        "WEEKLY": f"{year}-W{week:02d}",
+        "MONTHLY": sell_time.strftime("%Y-%m"),
+    }
+
+
+def apply_trade(stats, trade):
+    """
+    Ενημέρωση των rollups με μία κλειστή συναλλαγή (O(1), χωρίς επανυπολογισμό).
+    :param stats: Τα rollups όπως επιστρέφονται από load_stats()
+    :param trade: Η συναλλαγή όπως καταγράφεται από record_closed_trade()
+    """
+    profit = trade["profit"]
+
+    stats["COUNT"] += 1
+    stats["PROFIT"] += profit
+    stats["HOLDING_SECONDS"] += trade["holding_seconds"]
+    if profit > 0:
+        stats["WINS"] += 1
+    else:
+        stats["LOSSES"] += 1
+
+    if stats["BEST"] is None or profit > stats["BEST"]["profit"]:
+        stats["BEST"] = trade
+    if stats["WORST"] is None or profit < stats["WORST"]["profit"]:
+        stats["WORST"] = trade
+
+    label = distribution_label(trade["profit_pct"])
+    stats["DISTRIBUTION"][label] = stats["DISTRIBUTION"].get(label, 0) + 1
+
+    sell_time = datetime.utcfromtimestamp(trade["sell_timestamp"] / 1000)
+    for period, key in period_keys(sell_time).items():
+        bucket = stats[period].setdefault(key, {"PROFIT": 0.0, "COUNT": 0})
+        bucket["PROFIT"] += profit
+        bucket["COUNT"] += 1
+
+    return stats
+
+
+def record_closed_trade(order_id, buy_price, sell_price, amount, buy_timestamp, sell_timestamp,
+                        trades_path=TRADES_FILE, stats_path=TRADE_STATS_FILE):
+    """
+    Καταγραφή μιας κλειστής συναλλαγής στο ιστορικό και ενημέρωση των rollups.
+    :param order_id: Το id της θέσης που έκλεισε
+    :param buy_timestamp: Χρόνος αγοράς (ms)
+    :param sell_timestamp: Χρόνος πώλησης (ms)
+    :return: Η εγγραφή της συναλλαγής
+    """
+    profit = (sell_price - buy_price) * amount
+    trade = {
+        "id": order_id,
+        "buy_price": buy_price,
+        "sell_price": sell_price,
+        "amount": amount,
+        "profit": profit,
+        "profit_pct": (sell_price / buy_price - 1) * 100 if buy_price else 0.0,
+        "buy_timestamp": buy_timestamp,
+        "sell_timestamp": sell_timestamp,
+        "holding_seconds": max(sell_timestamp - buy_timestamp, 0) / 1000,
+    }
+
+    with open(trades_path, "a") as f:
+        f.write(json.dumps(trade) + "\n")
+
+    stats = apply_trade(load_stats(stats_path), trade)
+
+    # Ατομική εγγραφή ώστε ο αναγνώστης να μη δει ποτέ μισό αρχείο
+    tmp_path = stats_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(stats, f, indent=4)
+    os.replace(tmp_path, stats_path)
+
+    return trade
+
+
+def summarize(stats):
+    """Σύνοψη των rollups για το dashboard."""
+    count = stats["COUNT"]
+    return {
+        "trades": count,
+        "profit": round(stats["PROFIT"], 2),
+        "wins": stats["WINS"],
+        "losses": stats["LOSSES"],
+        "win_rate": round(stats["WINS"] / count * 100, 2) if count else 0.0,
+        "average_profit": round(stats["PROFIT"] / count, 4) if count else 0.0,
+        "average_holding_hours": round(stats["HOLDING_SECONDS"] / count / 3600, 2) if count else 0.0,
+        "best_trade": stats["BEST"],
+        "worst_trade": stats["WORST"],
+        "distribution": stats["DISTRIBUTION"],
+    }
@@ -0,0 +1,95 @@
+"""
+Venue selection for market orders across several exchanges.
+
+Top-of-book depth and balances are fetched from every configured venue concurrently within a latency
+budget. Each venue's effective price for the order size is computed by walking its order book and
+applying its taker fee, and the order is routed to the best venue that has enough balance. Venues are
+plain ccxt-like objects, so fake or simulated exchanges can be passed in for testing.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+
+def effective_price(order_book, side, amount, fee):
+    """
+    Μέση τιμή εκτέλεσης για `amount` πάνω στο order book, συμπεριλαμβανομένου του fee.
+    :param order_book: Το order book όπως επιστρέφεται από fetch_order_book()
+    :param side: "buy" (σάρωση των asks) ή "sell" (σάρωση των bids)
+    :param amount: Ποσότητα σε base currency
+    :param fee: Taker fee ως κλάσμα (π.χ. 0.001)
+    :return: Η τιμή ή None αν το βάθος δεν επαρκεί
+    """
+    remaining, cost = amount, 0.0
+    for price, size, *_ in order_book["asks" if side == "buy" else "bids"]:
+        fill = min(remaining, size)
+        cost += fill * price
+        remaining -= fill
+        if remaining <= 1e-12:
+            average = cost / amount
+            return average * (1 + fee) if side == "buy" else average * (1 - fee)
+    return None
+
+
+def _quote_venue(name, exchange, symbol, side, amount, fee, depth):
+    started = time.time()
+    order_book = exchange.fetch_order_book(symbol, limit=depth)
+    balance = exchange.fetch_balance()
+    base, quote = symbol.split("/")
+    price = effective_price(order_book, side, amount, fee)
+    return {
+        "venue": name,
+        "price": price,
+        "free_base": float(balance.get(base, {}).get("free") or 0),
+        "free_quote": float(balance.get(quote, {}).get("free") or 0),
+        "latency": time.time() - started,
+    }
+
+
+def fetch_quotes(venues, symbol, side, amount, fees, budget=1.0, depth=20):
+    """
+    Ταυτόχρονη λήψη order book και balance από όλα τα venues.
+    Τα venues που δεν απαντούν μέσα στο `budget` (δευτερόλεπτα) ή αποτυγχάνουν παραλείπονται.
+    :param venues: Dictionary όνομα -> exchange instance
+    :param fees: Dictionary όνομα -> taker fee
+    :return: Λίστα από quotes (dictionaries)
+    """
+    executor = ThreadPoolExecutor(max_workers=max(len(venues), 1))
+    futures = {
+        executor.submit(_quote_venue, name, exchange, symbol, side, amount, fees.get(name, 0.001), depth): name
+        for name, exchange in venues.items()
+    }
+    done, not_done = wait(futures, timeout=budget)
+    executor.shutdown(wait=False)
+
+    quotes = []
+    for future in done:
+        try:
+            quotes.append(future.result())
+        except Exception as e:
+            logging.warning(f"[VENUES] Quote from {futures[future]} failed: {e}")
+    for future in not_done:
+        logging.warning(f"[VENUES] Quote from {futures[future]} exceeded the latency budget of {budget}s.")
+    return quotes
+
+
+def select_venue(quotes, side, amount):
+    """
+    Επιλογή του venue με την καλύτερη effective τιμή που έχει επαρκές υπόλοιπο.
+    :return: Το quote του venue ή None αν κανένα δεν είναι κατάλληλο
+    """
+    eligible = []
+    for quote in quotes:
+        if quote["price"] is None:
+            continue
+        if side == "buy" and quote["free_quote"] < quote["price"] * amount:
+            continue
+        if side == "sell" and quote["free_base"] < amount:
+            continue
+        eligible.append(quote)
+
+    if not eligible:
+        return None
+    if side == "buy":
+        return min(eligible, key=lambda quote: quote["price"])
+    return max(eligible, key=lambda quote: quote["price"])
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Τα modules του repo βρίσκονται στη ρίζα (χωρίς package)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
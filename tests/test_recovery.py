@@ -0,0 +1,157 @@
+import os
+import threading
+
+import dca_recovery
+
+
+NOW = 10_000_000
+GRACE = 60_000
+TIMEOUT = 300_000
+
+
+def fill(order_id, side, amount, price, timestamp, client_id=None, fee=0.1):
+    return {"id": order_id, "client_id": client_id, "side": side, "amount": amount, "cost": amount * price,
+            "fee": fee, "fee_currency": "USDT", "price": price, "timestamp": timestamp, "datetime": None}
+
+
+def lot(order_id, price, amount=0.01, timestamp=NOW - 600_000, client_id=None, venue="sim", **extra):
+    return {"id": order_id, "price": price, "amount": amount, "timestamp": timestamp, "client_id": client_id,
+            "venue": venue, **extra}
+
+
+def intent(client_id, side, amount, timestamp, lot_key=None, venue="sim"):
+    return {"CLIENT_ID": client_id, "SIDE": side, "AMOUNT": amount, "VENUE": venue, "TIMESTAMP": timestamp, "LOT": lot_key}
+
+
+def plan(lots, intents, fills, since=NOW - 3_600_000):
+    return dca_recovery.plan_repairs(lots, intents, {f["id"]: f for f in fills}, "sim", since, NOW,
+                                     grace_ms=GRACE, timeout_ms=TIMEOUT)
+
+
+def actions(repairs):
+    return sorted((r["ACTION"], r.get("LOT") or (r.get("FILL") or {}).get("id") or r["INTENT"]["CLIENT_ID"]) for r in repairs)
+
+
+
+def test_missing_lot_is_restored_from_its_intent():
+    intents = {"dcab1": intent("dcab1", "buy", 0.01, NOW - 120_000)}
+    repairs = plan({}, intents, [fill("101", "buy", 0.01, 30000.0, NOW - 119_000, client_id="dcab1")])
+    assert actions(repairs) == [("add_lot", "101")]
+    assert repairs[0]["INTENT"]["CLIENT_ID"] == "dcab1"
+
+
+def test_missing_lot_matched_by_side_and_amount_without_client_id():
+    intents = {"dcab1": intent("dcab1", "buy", 0.01, NOW - 120_000)}
+    repairs = plan({}, intents, [fill("101", "buy", 0.01, 30000.0, NOW - 119_000)])
+    assert actions(repairs) == [("add_lot", "101")]
+
+
+def test_phantom_lot_inside_the_cursor_window_is_removed():
+    lots = {"30000.0": lot("101", 30000.0)}
+    assert actions(plan(lots, {}, [])) == [("remove_lot", "30000.0")]
+
+
+def test_recent_or_unwindowed_lots_are_not_phantoms():
+    recent = {"30000.0": lot("101", 30000.0, timestamp=NOW - GRACE // 2)}
+    assert plan(recent, {}, []) == []
+    older = {"30000.0": lot("101", 30000.0, timestamp=NOW - 7_200_000)}
+    assert plan(older, {}, []) == []
+    assert plan({"30000.0": lot("101", 30000.0)}, {}, [], since=None) == []
+
+
+def test_lots_of_other_venues_are_ignored():
+    lots = {"30000.0": lot("101", 30000.0, venue="other")}
+    assert plan(lots, {}, []) == []
+
+
+def test_unsaved_sale_closes_the_lot():
+    lots = {"30000.0": lot("101", 30000.0, fee={"cost": 0.3})}
+    intents = {"dcas1": intent("dcas1", "sell", 0.01, NOW - 120_000, lot_key="30000.0")}
+    fills = [fill("101", "buy", 0.01, 30000.0, NOW - 600_000, fee=0.3),
+             fill("102", "sell", 0.01, 30600.0, NOW - 119_000, client_id="dcas1")]
+    assert actions(plan(lots, intents, fills)) == [("close_lot", "30000.0")]
+
+
+def test_sale_already_in_the_ledger_only_drops_the_intent():
+    intents = {"dcas1": intent("dcas1", "sell", 0.01, NOW - 120_000, lot_key="30000.0")}
+    repairs = plan({}, intents, [fill("102", "sell", 0.01, 30600.0, NOW - 119_000, client_id="dcas1")])
+    assert actions(repairs) == [("drop_intent", "dcas1")]
+
+
+def test_lot_is_repriced_to_the_actual_fill():
+    lots = {"30000.0": lot("101", 30000.0)}
+    repairs = plan(lots, {}, [fill("101", "buy", 0.01, 30012.5, NOW - 600_000)])
+    assert actions(repairs) == [("reprice_lot", "30000.0")]
+    assert repairs[0]["FILL"]["price"] == 30012.5
+
+
+def test_lot_matching_its_fill_needs_no_repair():
+    lots = {"30000.0": lot("101", 30000.0, fee={"cost": 0.3})}
+    assert plan(lots, {}, [fill("101", "buy", 0.01, 30000.0, NOW - 600_000, fee=0.3)]) == []
+
+
+def test_foreign_trades_are_ignored():
+    assert plan({}, {}, [fill("900", "buy", 0.5, 30000.0, NOW - 600_000)]) == []
+
+
+def test_stale_intents_are_dropped_and_fresh_ones_kept():
+    intents = {"dcab1": intent("dcab1", "buy", 0.01, NOW - TIMEOUT - 1), "dcab2": intent("dcab2", "buy", 0.01, NOW - 10_000)}
+    assert actions(plan({}, intents, [])) == [("drop_intent", "dcab1")]
+
+
+def test_match_intent_skips_claimed_and_out_of_window_intents():
+    intents = {"dcab1": intent("dcab1", "buy", 0.01, NOW - 120_000), "dcab2": intent("dcab2", "buy", 0.01, NOW - 60_000)}
+    untagged = fill("101", "buy", 0.01, 30000.0, NOW - 59_000)
+    assert dca_recovery.match_intent(untagged, intents, set(), TIMEOUT)["CLIENT_ID"] == "dcab1"
+    assert dca_recovery.match_intent(untagged, intents, {"dcab1"}, TIMEOUT)["CLIENT_ID"] == "dcab2"
+    assert dca_recovery.match_intent(fill("102", "sell", 0.01, 30000.0, NOW), intents, set(), TIMEOUT) is None
+    assert dca_recovery.match_intent(fill("103", "buy", 0.02, 30000.0, NOW), intents, set(), TIMEOUT) is None
+    tagged = fill("104", "buy", 0.01, 30000.0, NOW, client_id="dcab2")
+    assert dca_recovery.match_intent(tagged, intents, set(), TIMEOUT)["CLIENT_ID"] == "dcab2"
+    assert dca_recovery.match_intent(tagged, intents, {"dcab2"}, TIMEOUT) is None
+
+
+def test_next_cursor_advances_to_the_last_fill_within_the_grace_period():
+    fills = {"101": fill("101", "buy", 0.01, 30000.0, NOW - 600_000)}
+    assert dca_recovery.next_cursor(fills, {}, "sim", NOW - 3_600_000, NOW, GRACE) == NOW - 600_000
+    recent = {"101": fill("101", "buy", 0.01, 30000.0, NOW - 1_000)}
+    assert dca_recovery.next_cursor(recent, {}, "sim", NOW - 3_600_000, NOW, GRACE) == NOW - GRACE
+    assert dca_recovery.next_cursor({}, {}, "sim", NOW - 3_600_000, NOW, GRACE) == NOW - 3_600_000
+
+
+def test_next_cursor_stays_before_pending_intents_of_the_venue():
+    fills = {"101": fill("101", "buy", 0.01, 30000.0, NOW - 600_000)}
+    intents = {"dcab1": intent("dcab1", "buy", 0.01, NOW - 900_000), "dcab2": intent("dcab2", "buy", 0.01, NOW - 2_000_000, venue="other")}
+    assert dca_recovery.next_cursor(fills, intents, "sim", NOW - 3_600_000, NOW, GRACE) == NOW - 900_000 - 5000
+
+
+def test_lot_key_never_overwrites_an_existing_lot():
+    lots = {"30000.0": lot("101", 30000.0)}
+    key = dca_recovery.lot_key(lots, 30000.0)
+    assert key != "30000.0" and abs(float(key) - 30000.0) < 1e-6
+    assert dca_recovery.lot_key(lots, 30100.0) == "30100.0"
+
+
+def test_concurrent_intent_writes_lose_nothing(tmp_path):
+    path = str(tmp_path / "intents.json")
+    errors = []
+
+    def worker(offset):
+        try:
+            for index in range(50):
+                client_id = f"dcab{offset}-{index}"
+                dca_recovery.write_intent(intent(client_id, "buy", 0.01, NOW), path=path)
+                if index % 2:
+                    dca_recovery.clear_intent(client_id, path=path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(offset,)) for offset in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert sorted(dca_recovery.load_intents(path)) == sorted(f"dcab{o}-{i}" for o in range(4) for i in range(0, 50, 2))
+    assert os.listdir(tmp_path) == ["intents.json"]
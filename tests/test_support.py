@@ -0,0 +1,55 @@
+import pandas as pd
+
+import dca_support
+
+
+def old_support_levels(lows, window=5):
+    data = pd.Series(lows)
+    return sorted(set(data[(data.shift(1) > data) & (data.shift(-1) > data)].rolling(window).min().dropna().tolist()))
+
+
+def candles(lows):
+    return [(index * 60000, low + 10, low, low + 5) for index, low in enumerate(lows)]
+
+
+LOWS = [100, 98, 99, 97, 101, 95, 96, 94, 99, 93, 97, 92, 98, 96, 100, 90, 95, 91, 99, 94, 96, 93, 97]
+
+
+def test_defaults_reproduce_old_rule():
+    state = dca_support.new_state()
+    dca_support.update(state, candles(LOWS))
+    assert dca_support.level_prices(state["SUPPORTS"]) == old_support_levels(LOWS)
+
+
+def test_incremental_update_matches_single_pass():
+    single = dca_support.new_state()
+    dca_support.update(single, candles(LOWS))
+    incremental = dca_support.new_state()
+    for index in range(0, len(LOWS), 4):
+        dca_support.update(incremental, candles(LOWS)[:index + 4])
+    assert incremental["SUPPORTS"] == single["SUPPORTS"]
+
+
+def test_window_one_keeps_every_pivot():
+    state = dca_support.new_state(window=1)
+    dca_support.update(state, candles(LOWS))
+    assert dca_support.level_prices(state["SUPPORTS"]) == old_support_levels(LOWS, window=1)
+
+
+def test_is_current_checks_every_parameter():
+    state = dca_support.new_state(5, 14, 1, 0.0)
+    assert dca_support.is_current(state, 5, 14, 1, 0.0)
+    assert not dca_support.is_current(state, 3, 14, 1, 0.0)
+    assert not dca_support.is_current(state, 5, 20, 1, 0.0)
+    assert not dca_support.is_current(state, 5, 14, 2, 0.0)
+    assert not dca_support.is_current(state, 5, 14, 1, 0.5)
+    assert not dca_support.is_current({"WINDOW": 5, "ATR_PERIOD": 14, "PIVOT_WIDTH": 1}, 5, 14, 1, 0.0)
+
+
+def test_clusters_use_the_stored_merge_width():
+    state = dca_support.new_state(window=1, cluster_pct=5)
+    dca_support.update(state, candles(LOWS))
+    exact = dca_support.new_state(window=1)
+    dca_support.update(exact, candles(LOWS))
+    assert len(state["SUPPORTS"]) < len(exact["SUPPORTS"])
+    assert sum(level[1] for level in state["SUPPORTS"]) == sum(level[1] for level in exact["SUPPORTS"])
@@ -0,0 +1,54 @@
+import dca_sim_exchange
+import dca_venues
+
+
+NOW = 1_700_000_000
+SYMBOL = "BTC/USDT"
+
+
+def venue(name, price, fee, quote_balance=10000.0, base_balance=1.0):
+    config = {"ID": name, "SYMBOL": SYMBOL, "PRICE": price, "FEE": fee, "VOLATILITY": 0, "HISTORY_DAYS": 1,
+              "QUOTE_BALANCE": quote_balance, "BASE_BALANCE": base_balance}
+    return dca_sim_exchange.SimExchange(config, clock=lambda: NOW)
+
+
+def route(venues, side, amount=0.01):
+    fees = {name: exchange.fee for name, exchange in venues.items()}
+    quotes = dca_venues.fetch_quotes(venues, SYMBOL, side, amount, fees, budget=5)
+    assert len(quotes) == len(venues)
+    return dca_venues.select_venue(quotes, side, amount)
+
+
+def test_buy_routes_to_the_cheaper_venue():
+    assert route({"a": venue("a", 30000, 0.001), "b": venue("b", 30300, 0.001)}, "buy")["venue"] == "a"
+
+
+def test_sell_routes_to_the_higher_bid():
+    assert route({"a": venue("a", 30000, 0.001), "b": venue("b", 30300, 0.001)}, "sell")["venue"] == "b"
+
+
+def test_fees_decide_between_close_prices():
+    venues = {"cheap": venue("cheap", 30000, 0.01), "low_fee": venue("low_fee", 30100, 0.0)}
+    chosen = route(venues, "buy")
+    assert chosen["venue"] == "low_fee"
+
+    book = venues["cheap"].fetch_order_book(SYMBOL)
+    assert chosen["price"] < dca_venues.effective_price(book, "buy", 0.01, 0.01)
+
+    venues = {"rich": venue("rich", 30100, 0.01), "low_fee": venue("low_fee", 30000, 0.0)}
+    assert route(venues, "sell")["venue"] == "low_fee"
+
+
+def test_venue_without_enough_balance_is_skipped():
+    venues = {"a": venue("a", 30000, 0.001, quote_balance=10), "b": venue("b", 30300, 0.001)}
+    assert route(venues, "buy")["venue"] == "b"
+    venues = {"a": venue("a", 30000, 0.001), "b": venue("b", 30300, 0.001, base_balance=0)}
+    assert route(venues, "sell")["venue"] == "a"
+    assert route({"a": venue("a", 30000, 0.001, quote_balance=10)}, "buy") is None
+
+
+def test_effective_price_walks_the_book():
+    book = {"asks": [[100.0, 1.0], [110.0, 1.0]], "bids": [[99.0, 1.0], [90.0, 1.0]]}
+    assert dca_venues.effective_price(book, "buy", 2.0, 0.0) == 105.0
+    assert dca_venues.effective_price(book, "sell", 2.0, 0.01) == 94.5 * 0.99
+    assert dca_venues.effective_price(book, "buy", 3.0, 0.0) is None